@@ -1,42 +1,108 @@
 import os
 import threading
-import speech_recognition as sr
-import pyttsx3
+# First, so the startup profile starts before the heavy imports
+from startup import StartupProfiler
 from datetime import datetime
-from deep_translator import GoogleTranslator
-from PyQt6.QtWidgets import (QApplication, QWidget, QTextBrowser, QVBoxLayout, 
+from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, 
                           QLineEdit, QPushButton, QHBoxLayout, QLabel, 
-                          QFrame, QGraphicsDropShadowEffect, QSizePolicy,
-                          QScrollArea, QTextEdit)
+                          QFrame, QTextEdit, QListWidget)
 from PyQt6.QtCore import (QThread, pyqtSignal, Qt, QPropertyAnimation, 
-                       QEasingCurve, QSize, QTimer, QPointF, QRectF)
-from PyQt6.QtGui import (QColor, QPalette, QFont, QIcon, QLinearGradient, 
-                      QGradient, QPainter, QBrush, QPen, QPainterPath,
-                      QTransform)
+                       QTimer, QObject)
+from PyQt6.QtGui import (QFont, QPainter, QShortcut, QKeySequence)
 import time
 from dotenv import load_dotenv
-from functools import lru_cache
 import queue
-import re
-import random
-from mistralai.client import MistralClient
-from mistralai.models.chat_completion import ChatMessage
-import math
 import webbrowser
-import requests
+from urllib.parse import quote
+from request_scheduler import RequestScheduler, SchedulerBusy
+from tts_worker import TTSWorker, NORMAL
+from audio_cache import AudioCache
+from audio_player import WavPlayer, MusicPlayer
+from answer_pipeline import create_pipeline
+from particles import ParticleField, ParticleSprites
+from robot_sprite import RobotFrames, paint_robot
+from animation_clock import AnimationClock
+from transcript import TranscriptView, TranscriptArchive, USER, JARVIS, STATUS
+from intent_router import format_duration
+from timer_service import TimerService
+from tracing import Tracer
+from music_library import MusicLibrary
+from collections import deque
 
 load_dotenv()
 
-# Set Mistral API key
-MISTRAL_API_KEY = os.getenv('MISTRAL_API_KEY')
-client = MistralClient(api_key=MISTRAL_API_KEY)
+# The window is shown first; speech, voice, translation and the AI client load behind it
+startup = StartupProfiler()
+startup.mark("imports")
+
+# Number of particles drifting behind the UI
+PARTICLE_COUNT = int(os.getenv('JARVIS_PARTICLES', '50'))
+ROBOT_FRAME_CACHE = os.getenv('JARVIS_ROBOT_FRAME_CACHE', '1') == '1'
+
+# Animation frame rates, and seconds without activity before slowing down and pausing
+ANIMATION_FPS = float(os.getenv('JARVIS_ANIMATION_FPS', '20'))
+ANIMATION_IDLE_FPS = float(os.getenv('JARVIS_ANIMATION_IDLE_FPS', '4'))
+ANIMATION_IDLE_AFTER = float(os.getenv('JARVIS_ANIMATION_IDLE_AFTER', '120'))
+ANIMATION_SLEEP_AFTER = float(os.getenv('JARVIS_ANIMATION_SLEEP_AFTER', '3600'))
+
+# Messages kept in the chat view; older ones are paged in from disk when scrolling back
+TRANSCRIPT_ROWS = int(os.getenv('JARVIS_TRANSCRIPT_ROWS', '200'))
+
+# Local storage for caches and history
+DATA_DIR = os.getenv('JARVIS_DATA_DIR', os.path.join(os.path.expanduser('~'), '.jarvis'))
+
+# Recordings of the wake word for local detection; without them every phrase goes to Google
+WAKE_WORD_DIR = os.getenv('JARVIS_WAKE_WORD_DIR', os.path.join(DATA_DIR, 'wake_word'))
+WAKE_WORD_THRESHOLD = float(os.getenv('JARVIS_WAKE_WORD_THRESHOLD', '0')) or None
+
+# Speech recognition backends, tried in order (google, sphinx, fixture)
+STT_BACKENDS = os.getenv('JARVIS_STT_BACKENDS', 'google,sphinx')
+STT_FIXTURE_DIR = os.getenv('JARVIS_STT_FIXTURE_DIR')
+GOOGLE_STT_ENDPOINT = os.getenv('JARVIS_GOOGLE_STT_ENDPOINT')
+
+# The microphone stays open; this many seconds of audio are kept for wake-word and question capture
+CAPTURE_SECONDS = float(os.getenv('JARVIS_CAPTURE_SECONDS', '30'))
+# A frame is speech when this many times louder than the tracked noise floor
+VAD_RATIO = float(os.getenv('JARVIS_VAD_RATIO', '3'))
+# Longest the listener waits for Jarvis to finish speaking before it listens again
+SPEECH_WAIT = float(os.getenv('JARVIS_SPEECH_WAIT', '60'))
+
+# Translation, the AI client, caches, history and conversation context, shared with jarvis_service.py
+pipeline = create_pipeline(DATA_DIR, startup)
+history = pipeline.history
+conversation = pipeline.conversation
+world_facts = pipeline.world_facts
+HISTORY_ON_START = int(os.getenv('JARVIS_HISTORY_ON_START', '5'))
+
+# One router for the typed and voice paths: commands and question categories
+router = pipeline.router
+COMMANDS = ("set_timer", "cancel_timer", "list_timers", "play_music", "stop_music", "weather")
+
+# Timers and reminders share one scheduler thread and are kept on disk across restarts
+timers = TimerService(os.path.join(DATA_DIR, 'timers.db'))
+
+# Music under these folders (separated by os.pathsep) is indexed in the background for "play <song or artist>"
+MUSIC_DIRS = os.getenv('JARVIS_MUSIC_DIRS', os.path.join(os.path.expanduser('~'), 'Music')).split(os.pathsep)
+music_library = MusicLibrary(os.path.join(DATA_DIR, 'music.db'), roots=MUSIC_DIRS)
+music_player = MusicPlayer()
+
+# OpenWeatherMap key for the weather command; without one weather questions go to Mistral
+WEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY')
+WEATHER_CITY = os.getenv('JARVIS_WEATHER_CITY', 'London')
+
+# Per-stage timings of every question, shown with F12 and optionally appended to a JSON-lines file
+tracer = Tracer(
+    capacity=int(os.getenv('JARVIS_TRACE_BUFFER', '500')),
+    path=os.getenv('JARVIS_TRACE_FILE') or None,
+    enabled=os.getenv('JARVIS_TRACING', '1') == '1'
+)
 
 # Response queue for threading
 response_queue = queue.Queue()
 
-# Initialize text-to-speech engine with caching
-@lru_cache(maxsize=1)
+# Initialize text-to-speech engine
 def init_text_to_speech():
+    import pyttsx3
     engine = pyttsx3.init()
     voices = engine.getProperty('voices')
     engine.setProperty('rate', 180)
@@ -47,37 +113,36 @@ def init_text_to_speech():
             break
     return engine
 
-# Global TTS engine
-tts_engine = init_text_to_speech()
+# Fixed phrases are rendered to the audio cache once and played from disk afterwards
+CANNED_PHRASES = [
+    "Yes, boss? Take your time with your question.",
+    "I'm listening...",
+    "Goodbye! Call me if you need anything.",
+    "Time's up!",
+    "I couldn't understand the timer duration.",
+    "No music files found. Opening music in the browser.",
+]
 
-class ResponseThread(QThread):
-    response_ready = pyqtSignal(str)
+# The TTS worker thread owns the engine, so speaking never blocks the GUI or the listener
+tts_worker = TTSWorker(
+    startup.timed("voice", init_text_to_speech),
+    audio_cache=AudioCache(
+        os.path.join(DATA_DIR, 'audio'),
+        max_bytes=int(os.getenv('JARVIS_AUDIO_CACHE_MB', '200')) * 1024 * 1024
+    ) if os.getenv('JARVIS_AUDIO_CACHE', '1') == '1' else None,
+    player=WavPlayer(),
+    prerender=CANNED_PHRASES
+)
 
-    def __init__(self, question):
-        super().__init__()
-        self.question = question
+class RequestBridge(QObject):
+    # (kind, request id, payload) delivered on the GUI thread
+    event = pyqtSignal(str, int, str)
 
-    def run(self):
-        translated_question = translate_to_english(self.question)
-        answer = get_answer(translated_question)
-        self.response_ready.emit(answer)
-
-class Particle:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.size = random.randint(2, 5)
-        self.speed = random.uniform(0.5, 2)
-        self.angle = random.uniform(0, 360)
-        self.opacity = random.uniform(0.3, 0.7)
-
-    def move(self):
-        self.x += self.speed * math.cos(math.radians(self.angle))
-        self.y += self.speed * math.sin(math.radians(self.angle))
-        self.opacity = max(0.1, self.opacity - 0.001)
+    def dispatch(self, kind, request_id, payload):
+        self.event.emit(kind, request_id, payload)
 
 class RobotAnimation(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, clock=None, parent=None):
         super().__init__(parent)
         self.hover_offset = 0
         self.hover_direction = 1
@@ -87,148 +152,253 @@ class RobotAnimation(QWidget):
         self.leg_angle = 0
         self.arm_direction = 1
         self.leg_direction = 1
+        self.pending_steps = 0.0
+
+        # Pre-rendered poses, blitted instead of repainting the vector robot every tick
+        self.frames = RobotFrames() if ROBOT_FRAME_CACHE else None
+        self.frame_times = deque(maxlen=500)
 
-        # Timer for animations
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.animate)
-        self.timer.start(50)
+        # Driven by the shared animation clock, or a timer of its own
+        if clock:
+            clock.subscribe(self.animate)
+        else:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.animate)
+            self.timer.start(50)
         self.setFixedSize(150, 150)  # Increased size for the full robot
 
-    def animate(self):
+    def animate(self, steps=1.0):
+        # Whole steps keep the limbs on the poses RobotFrames has rendered; above 20 fps the
+        # fractions add up until a step is due, so the robot moves at the same speed
+        self.pending_steps += steps
+        steps = int(self.pending_steps)
+        if not steps:
+            return
+        self.pending_steps -= steps
+
         # Hover animation
-        self.hover_offset += 0.2 * self.hover_direction
+        self.hover_offset += 0.2 * self.hover_direction * steps
         if abs(self.hover_offset) >= 5:
+            self.hover_offset = 5 * self.hover_direction
             self.hover_direction *= -1
             
         # Limb animation
-        self.arm_angle += 1 * self.arm_direction
+        self.arm_angle += 1 * self.arm_direction * steps
         if abs(self.arm_angle) >= 15:
+            self.arm_angle = 15 * self.arm_direction
             self.arm_direction *= -1
             
-        self.leg_angle += 0.5 * self.leg_direction
+        self.leg_angle += 0.5 * self.leg_direction * steps
         if abs(self.leg_angle) >= 10:
+            self.leg_angle = 10 * self.leg_direction
             self.leg_direction *= -1
             
         self.update()
 
     def paintEvent(self, event):
+        started = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Save the current state
-        painter.save()
-        
         # Translate to center and apply hover effect
-        painter.translate(self.width() / 2, self.height() / 2 + self.hover_offset)
-
-        # Draw robot body (torso)
-        painter.setPen(QPen(QColor("#3498db"), 2))
-        painter.setBrush(QBrush(QColor("#2c3e50")))
-        painter.drawRoundedRect(-20, -15, 40, 50, 10, 10)  # Torso
+        cx, cy = self.width() / 2, self.height() / 2 + self.hover_offset
+        if self.frames:
+            self.frames.draw(painter, cx, cy, self.arm_angle, self.leg_angle, self.devicePixelRatioF())
+        else:
+            painter.translate(cx, cy)
+            paint_robot(painter, self.arm_angle, self.leg_angle)
+        painter.end()
+        self.frame_times.append(time.perf_counter() - started)
 
-        # Draw head with glowing elements
-        painter.drawEllipse(-25, -45, 50, 40)  # Head
-        
-        # Draw glowing eyes
-        painter.setBrush(QBrush(QColor("#3498db")))
-        painter.drawEllipse(-15, -35, 10, 10)  # Left eye
-        painter.drawEllipse(5, -35, 10, 10)    # Right eye
-        
-        # Draw antenna with glowing tip
-        painter.drawLine(0, -45, 0, -55)
-        gradient = QLinearGradient(0, -60, 0, -55)
-        gradient.setColorAt(0, QColor("#3498db"))
-        gradient.setColorAt(1, QColor("#2980b9"))
-        painter.setBrush(QBrush(gradient))
-        painter.drawEllipse(-5, -60, 10, 10)
-
-        # Draw arms with joints
-        painter.save()
-        painter.rotate(self.arm_angle)  # Animate arms
-        # Left arm
-        painter.drawRoundedRect(-45, -10, 25, 10, 5, 5)  # Upper arm
-        painter.drawEllipse(-48, -12, 14, 14)  # Shoulder joint
-        # Right arm
-        painter.drawRoundedRect(20, -10, 25, 10, 5, 5)   # Upper arm
-        painter.drawEllipse(34, -12, 14, 14)   # Shoulder joint
-        painter.restore()
-
-        # Draw legs with joints
-        painter.save()
-        painter.rotate(self.leg_angle)  # Animate legs
-        # Left leg
-        painter.drawRoundedRect(-30, 35, 15, 30, 5, 5)   # Upper leg
-        painter.drawEllipse(-28, 32, 12, 12)   # Hip joint
-        # Right leg
-        painter.drawRoundedRect(15, 35, 15, 30, 5, 5)    # Upper leg
-        painter.drawEllipse(16, 32, 12, 12)    # Hip joint
-        painter.restore()
-
-        # Draw chest light
-        gradient = QLinearGradient(0, -5, 0, 5)
-        gradient.setColorAt(0, QColor("#3498db"))
-        gradient.setColorAt(1, QColor("#2980b9"))
-        painter.setBrush(QBrush(gradient))
-        painter.drawEllipse(-10, 0, 20, 20)
-
-        # Restore the state
-        painter.restore()
+    def frame_stats(self):
+        """Paint time of the last frames, in milliseconds"""
+        times = sorted(self.frame_times)
+        if not times:
+            return {"frames": 0, "mean_ms": 0.0, "p95_ms": 0.0}
+        return {
+            "frames": len(times),
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p95_ms": times[int(0.95 * (len(times) - 1))] * 1000,
+        }
 
 class ParticleBackground(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, clock=None, count=PARTICLE_COUNT):
         super().__init__(parent)
-        self.particles = []
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.updateParticles)
-        self.timer.start(50)
-        self.generate_particles()
-
-    def generate_particles(self):
-        for _ in range(50):
-            x = random.randint(0, self.width())
-            y = random.randint(0, self.height())
-            self.particles.append(Particle(x, y))
-
-    def updateParticles(self):
-        for particle in self.particles:
-            particle.move()
-            if (particle.x < 0 or particle.x > self.width() or
-                particle.y < 0 or particle.y > self.height() or
-                particle.opacity < 0.1):
-                self.particles.remove(particle)
-                x = random.randint(0, self.width())
-                y = random.randint(0, self.height())
-                self.particles.append(Particle(x, y))
+        self.field = ParticleField(count, self.width(), self.height())
+        self.sprites = ParticleSprites("#3498db")
+        if clock:
+            clock.subscribe(self.updateParticles)
+        else:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.updateParticles)
+            self.timer.start(50)
+
+    def resizeEvent(self, event):
+        self.field.resize(self.width(), self.height())
+        super().resizeEvent(event)
+
+    def updateParticles(self, steps=1.0):
+        self.field.step(steps)
         self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        for particle in self.particles:
-            color = QColor("#3498db")
-            color.setAlphaF(particle.opacity)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(QBrush(color))
-            painter.drawEllipse(
-                int(particle.x - particle.size/2),
-                int(particle.y - particle.size/2),
-                particle.size,
-                particle.size
-            )
+        self.sprites.paint(painter, self.field)
+
+class HistorySearchPanel(QFrame):
+    """Search box over the saved conversation history, opened with Ctrl+F"""
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 5)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search conversation history...")
+        self.result_label = QLabel("")
+        self.result_label.setStyleSheet("color: #888888; background: none;")
+        self.results = QListWidget()
+        self.results.setMaximumHeight(220)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.result_label)
+        layout.addWidget(self.results)
+
+        # Search once typing pauses, not on every key
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(150)
+        self.debounce.timeout.connect(self.run_search)
+        self.search_input.textChanged.connect(lambda _: self.debounce.start())
+        self.hide()
+
+    def open(self):
+        self.show()
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.hide()
+        elif event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.run_search()
+        else:
+            super().keyPressEvent(event)
+
+    def run_search(self):
+        self.debounce.stop()
+        started = time.perf_counter()
+        entries = self.store.search(self.search_input.text(), limit=50)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.results.clear()
+        for entry in entries:
+            when = datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M")
+            self.results.addItem(f"{when}  👤 {entry['question']}\n        {entry['snippet']}")
+        self.result_label.setText(f"{len(entries)} results in {elapsed:.1f} ms" if self.search_input.text().strip() else "")
+
+class TracePanel(QFrame):
+    """Latency percentiles per pipeline stage and the latest traces, toggled with F12"""
+
+    def __init__(self, tracer, export_dir, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.export_dir = export_dir
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 5)
+        self.table = QLabel("")
+        self.table.setFont(QFont("Consolas", 9))
+        self.table.setTextFormat(Qt.TextFormat.PlainText)
+        self.table.setStyleSheet("color: #cccccc; background: none;")
+        self.traces = QListWidget()
+        self.traces.setMaximumHeight(160)
+        buttons = QHBoxLayout()
+        self.export_button = QPushButton("Export traces")
+        self.export_button.clicked.connect(self.export)
+        self.result_label = QLabel("")
+        self.result_label.setStyleSheet("color: #888888; background: none;")
+        buttons.addWidget(self.export_button)
+        buttons.addWidget(self.result_label)
+        buttons.addStretch()
+        layout.addWidget(self.table)
+        layout.addWidget(self.traces)
+        layout.addLayout(buttons)
+
+        # Refreshed once a second while open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.refresh_timer.start()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Escape:
+            self.toggle()
+        else:
+            super().keyPressEvent(event)
+
+    def refresh(self):
+        summary = self.tracer.summary()
+        lines = [f"{'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for stage, stats in summary.items():
+            lines.append(f"{stage:<16}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+                         f"{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+        self.table.setText("\n".join(lines) if summary else "No traces yet. Ask Jarvis something.")
+        self.traces.clear()
+        for trace in self.tracer.recent(20):
+            when = datetime.fromtimestamp(trace.created).strftime("%H:%M:%S")
+            stages = ", ".join(f"{stage} {duration:.0f}" for stage, _, duration, _ in trace.spans)
+            heard = f"  \"{trace.attrs['heard']}\" ({trace.attrs.get('intent')})" if "heard" in trace.attrs else ""
+            self.traces.addItem(f"{when}  {trace.id}  {trace.name}  {trace.duration:.0f} ms  [{stages}]{heard}")
+
+    def export(self):
+        path = os.path.join(self.export_dir, datetime.now().strftime("traces-%Y%m%d-%H%M%S.jsonl"))
+        try:
+            count = self.tracer.export(path)
+        except OSError as e:
+            self.result_label.setText(f"Export failed: {e}")
+            return
+        self.result_label.setText(f"{count} traces written to {path}")
 
 class JarvisUI(QWidget):
+    # (subsystem, state) from the startup profiler, delivered on the GUI thread
+    startup_event = pyqtSignal(str, str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Jarvis AI Assistant")
         self.setGeometry(0, 0, 1366, 768)  # Set to a resolution suitable for Lenovo Yoga 460
         
+        # One clock for all animations, slowed down or paused when nobody is looking
+        self.animation_clock = AnimationClock(
+            self,
+            full_fps=ANIMATION_FPS,
+            reduced_fps=ANIMATION_IDLE_FPS,
+            idle_after=ANIMATION_IDLE_AFTER,
+            sleep_after=ANIMATION_SLEEP_AFTER,
+            state_probe=self.assistant_state
+        )
+
         # Create particle background
-        self.particle_bg = ParticleBackground(self)
+        self.particle_bg = ParticleBackground(self, self.animation_clock)
         self.particle_bg.setGeometry(0, 0, 1366, 768)  # Adjust background size
         
+        self.stream_message = None
+        self.stream_request = 0
+        self.typed_request = None  # Id of the typed question being answered; a new one supersedes it
+        self.traces = {}  # Request id -> trace of typed questions, finished when the request is done
+        self.request_bridge = RequestBridge()
+        self.request_bridge.event.connect(self.handle_request_event)
+        self.painted = False
+        self.startup_event.connect(self.show_startup_state)
+        startup.listeners.append(self.startup_event.emit)
         self.setup_ui()
-        self.response_threads = []
         self.setup_styles()
         self.setup_animations()
         
@@ -239,7 +409,7 @@ class JarvisUI(QWidget):
                 background: transparent;
                 color: #ffffff;
             }
-            QTextBrowser {
+            QListView {
                 background-color: rgba(28, 31, 44, 0.8);
                 border: 1px solid rgba(255, 255, 255, 0.1);
                 border-radius: 15px;
@@ -321,7 +491,7 @@ class JarvisUI(QWidget):
         header_layout.setContentsMargins(15, 5, 15, 5)
         
         # Add rotating robot
-        self.robot_animation = RobotAnimation()
+        self.robot_animation = RobotAnimation(self.animation_clock)
         
         title_label = QLabel("JARVIS")
         title_label.setFont(QFont("Segoe UI", 32, QFont.Weight.Bold))
@@ -331,7 +501,7 @@ class JarvisUI(QWidget):
         """)
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        self.status_label = QLabel("🎤 Voice Recognition Active")
+        self.status_label = QLabel("⏳ Starting...")
         self.status_label.setFont(QFont("Segoe UI", 11))
         self.status_label.setStyleSheet("""
             color: #3498db;
@@ -358,12 +528,25 @@ class JarvisUI(QWidget):
         chat_layout = QVBoxLayout(chat_frame)
         chat_layout.setContentsMargins(10, 10, 10, 10)
         
-        self.text_browser = QTextBrowser()
-        self.text_browser.setFont(QFont("Segoe UI", 11))
-        self.text_browser.setMinimumHeight(280)
-        self.text_browser.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        # Only the newest messages are kept in the view, older ones are paged back in from disk
+        self.transcript = TranscriptView(
+            archive=TranscriptArchive(os.path.join(DATA_DIR, 'transcript')),
+            max_rows=TRANSCRIPT_ROWS
+        )
+        self.transcript.setFont(QFont("Segoe UI", 11))
+        self.transcript.setMinimumHeight(280)
+        self.transcript.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.show_recent_history()
+
+        self.search_panel = HistorySearchPanel(history)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Find), self, activated=self.search_panel.open)
         
-        chat_layout.addWidget(self.text_browser)
+        self.trace_panel = TracePanel(tracer, DATA_DIR)
+        QShortcut(QKeySequence(Qt.Key.Key_F12), self, activated=self.trace_panel.toggle)
+
+        chat_layout.addWidget(self.search_panel)
+        chat_layout.addWidget(self.trace_panel)
+        chat_layout.addWidget(self.transcript)
         container_layout.addWidget(chat_frame)
         
         # Modern input area with fixed width for send button
@@ -423,9 +606,40 @@ class JarvisUI(QWidget):
         self.send_button.clicked.connect(self.handle_text_input)
         
         # Start listener thread
-        self.listener_thread = ListenerThread()
+        self.listener_thread = ListenerThread(self.request_bridge)
         self.listener_thread.text_signal.connect(self.handle_thread_signal)
-        self.listener_thread.start()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            startup.mark("first_paint")
+            # Start the rest once this frame is on screen
+            QTimer.singleShot(0, self.start_subsystems)
+
+    def start_subsystems(self):
+        self.show_startup_state("window", "ready")
+        self.listener_thread.start()  # Loads speech recognition and opens the microphone
+        tts_worker.ensure_started()  # Loads the speech engine and its voices
+        threading.Thread(target=pipeline.load, name="jarvis-startup", daemon=True).start()
+        timers.start(self.listener_thread.timer_finished)
+        music_library.start()
+
+    def show_startup_state(self, name, state):
+        subsystems = startup.report()["subsystems"]
+        pending = [name for name, stage in subsystems.items() if stage["state"] == "loading"]
+        failed = [name for name, stage in subsystems.items() if stage["state"] == "failed"]
+        if pending or "speech" not in subsystems:
+            pending = pending or ["speech"]
+            self.status_label.setText("⏳ Loading " + ", ".join(pending) + "...")
+            self.status_label.setStyleSheet("color: #f39c12;")
+        elif failed:
+            self.status_label.setText("⚠️ Unavailable: " + ", ".join(failed))
+            self.status_label.setStyleSheet("color: #ff6b6b;")
+        else:
+            startup.mark("all_ready")
+            self.status_label.setText("🎤 Voice Recognition Active")
+            self.status_label.setStyleSheet("color: #3498db;")
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
@@ -433,7 +647,19 @@ class JarvisUI(QWidget):
         elif event.key() == Qt.Key.Key_Shift and event.key() == Qt.Key.Key_Return:
             self.text_input.insertPlainText("\n")  # Allow new line
 
+    def assistant_state(self):
+        if tts_worker.outstanding:
+            return "speaking"
+        if self.typed_request is not None:
+            return "thinking"
+        listener = self.listener_thread
+        # A conversation stays open until "goodbye"; it only keeps the animations busy while a question is heard
+        if listener.state == "conversation" and listener.audio is not None and listener.audio.hearing:
+            return "listening"
+        return listener.state
+
     def handle_thread_signal(self, text):
+        self.animation_clock.note_activity()
         # Animate the status indicator when receiving signals
         if "listening" in text.lower():
             self.status_label.setText("🎤 Actively Listening...")
@@ -448,68 +674,83 @@ class JarvisUI(QWidget):
         elif "Jarvis:" in text:
             self.add_message(text, is_user=False)
         else:
-            self.text_browser.append(f"<span style='color: #888888;'>{text}</span>")
+            self.transcript.add(text, STATUS)
+
+    def show_recent_history(self):
+        entries = history.recent(HISTORY_ON_START)
+        if not entries:
+            return
+        self.transcript.add("Earlier conversation:", STATUS)
+        for entry in entries:
+            stamp = datetime.fromtimestamp(entry["created"]).strftime("%H:%M")
+            self.transcript.add(f"👤 You: {entry['question']}", USER, stamp)
+            self.transcript.add(f"🤖 Jarvis: {entry['answer']}", JARVIS, stamp)
 
     def add_message(self, text, is_user=True):
-        timestamp = datetime.now().strftime("%H:%M")
-        if is_user:
-            message_html = f"""
-                <div style='margin: 15px 0;'>
-                    <div style='text-align: right;'>
-                        <span style='background: linear-gradient(135deg, #3498db, #2980b9);
-                               padding: 12px 20px;
-                               border-radius: 20px 20px 5px 20px;
-                               display: inline-block;
-                               max-width: 85%;
-                               box-shadow: 0 4px 15px rgba(52, 152, 219, 0.2);'>
-                            {text}
-                        </span>
-                        <br>
-                        <span style='color: #888888; font-size: 0.8em; margin-top: 5px; display: inline-block;'>{timestamp}</span>
-                    </div>
-                </div>
-            """
+        return self.transcript.add(text, USER if is_user else JARVIS)
+
+    def handle_request_event(self, kind, request_id, payload):
+        self.animation_clock.note_activity()
+        if kind == "partial":
+            self.show_partial_answer(payload, request_id)
+        elif kind == "sentence":
+            speak(payload, trace=self.traces.get(request_id))
+        elif kind == "answer":
+            self.handle_response(payload, request_id)
+        elif kind == "done":
+            trace = self.traces.pop(request_id, None)
+            if trace is not None:
+                trace.finish()
+            # A superseded question is done as soon as the next one is submitted; only the current one counts
+            if request_id == self.typed_request:
+                self.typed_request = None
+                self.reset_send_button()
+
+    def show_partial_answer(self, answer, request_id):
+        if request_id < self.stream_request:
+            return  # Superseded by a newer question
+        if request_id != self.stream_request:
+            self.stream_request = request_id
+            self.stream_message = None
+
+        # Replace the Jarvis bubble that is currently streaming, or start a new one
+        if self.stream_message is None:
+            self.stream_message = self.add_message(f"🤖 Jarvis: {answer}", is_user=False)
         else:
-            message_html = f"""
-                <div style='margin: 15px 0;'>
-                    <div style='text-align: left;'>
-                        <span style='background: linear-gradient(135deg, #2c3e50, #2c3e50);
-                               padding: 12px 20px;
-                               border-radius: 20px 20px 20px 5px;
-                               display: inline-block;
-                               max-width: 85%;
-                               box-shadow: 0 4px 15px rgba(44, 62, 80, 0.2);'>
-                            {text}
-                        </span>
-                        <br>
-                        <span style='color: #888888; font-size: 0.8em; margin-top: 5px; display: inline-block;'>{timestamp}</span>
-                    </div>
-                </div>
-            """
-        self.text_browser.append(message_html)
-        self.text_browser.verticalScrollBar().setValue(
-            self.text_browser.verticalScrollBar().maximum()
-        )
+            self.transcript.update_message(self.stream_message, f"🤖 Jarvis: {answer}")
 
-    def handle_response(self, answer):
-        self.add_message(f"🤖 Jarvis: {answer}", is_user=False)
-        speak(answer)
+    def handle_response(self, answer, request_id):
+        # Sentences were already spoken as they streamed in
+        self.show_partial_answer(answer, request_id)
+        self.stream_message = None
 
     def handle_text_input(self):
         question = self.text_input.toPlainText().strip()
         if question:
+            self.animation_clock.note_activity()
             self.text_input.clear()
+            tts_worker.barge_in()
             self.add_message(f"👤 You: {question}", is_user=True)
+
+            route = router.route(question)
+            if route.intent in COMMANDS and (route.intent != "weather" or WEATHER_API_KEY):
+                # Commands speak and wait for the speech to finish, so keep them off the GUI thread
+                threading.Thread(target=self.listener_thread.run_command, args=(route,), daemon=True).start()
+                return
             
             # Animate the send button
             self.send_button.setEnabled(False)
             self.send_button.setText("Thinking...")
             
-            response_thread = ResponseThread(question)
-            response_thread.response_ready.connect(self.handle_response)
-            response_thread.finished.connect(lambda: self.reset_send_button())
-            response_thread.start()
-            self.response_threads.append(response_thread)
+            try:
+                trace = tracer.start("typed")
+                self.typed_request = None  # submit() finishes the question it supersedes right here
+                request = request_scheduler.submit(question, "typed", self.request_bridge.dispatch, trace=trace)
+                self.traces[request.id] = trace
+                self.typed_request = request.id
+            except SchedulerBusy:
+                self.add_message("🤖 Jarvis: I'm still working on your earlier questions. Please try again in a moment.", is_user=False)
+                self.reset_send_button()
 
     def reset_send_button(self):
         self.send_button.setEnabled(True)
@@ -522,234 +763,346 @@ class JarvisUI(QWidget):
 class ListenerThread(QThread):
     text_signal = pyqtSignal(str)
 
+    def __init__(self, request_bridge):
+        super().__init__()
+        self.request_bridge = request_bridge
+        self.stt = None
+        self.capture = None  # audio_capture.AudioCapture, once speech recognition has loaded
+        self.audio = None  # Its reader, shared by wake-word detection and question capture
+        # "conversation" between questions, "listening" while one is recognized, "thinking" while answering
+        self.state = "waiting"
+
     def run(self):
-        while True:  # Main loop to keep the thread running
+        startup.begin("speech")
+        try:
+            import speech_recognition as sr
+            from audio_capture import AudioCapture, VoiceActivityDetector
+            from stt_backends import create_chain as create_stt_chain
+            from wake_word import create_detector as create_wake_word_detector
+            self.stt = create_stt_chain(STT_BACKENDS, STT_FIXTURE_DIR, google_endpoint=GOOGLE_STT_ENDPOINT)
+        except Exception as e:
+            print(f"Speech recognition unavailable: {e}")
+            startup.end("speech", e)
+            return
+
+        # One always-open microphone; the capture thread reopens it after errors
+        self.capture = AudioCapture(sr.Microphone, seconds=CAPTURE_SECONDS, vad=VoiceActivityDetector(VAD_RATIO),
+                                    on_open=self.microphone_opened, on_error=self.microphone_failed)
+        self.audio = self.capture.reader()
+        self.capture.start()
+        detector = None
+        detector_rate = None
+
+        while not self.capture.stopped:
             try:
-                # Initialize recognizer for each attempt
-                recognizer = sr.Recognizer()
-                recognizer.energy_threshold = 2500  # Even lower threshold for better sensitivity
-                recognizer.dynamic_energy_threshold = True
-                recognizer.pause_threshold = 1.0  # Longer pause to allow for natural speech
-                recognizer.phrase_threshold = 0.5  # More lenient phrase detection
-                
-                # Initialize microphone
-                with sr.Microphone() as source:
-                    print("\nListening for 'Jarvis'... (Microphone is active)")
-                    self.text_signal.emit("\n🎤 Microphone is active and listening for 'Jarvis'...")
-                    
-                    # Initial adjustment
-                    recognizer.adjust_for_ambient_noise(source, duration=1)
-                    
-                    while True:
-                        try:
-                            print("Waiting for command...")
-                            audio = recognizer.listen(source, timeout=None, phrase_time_limit=8)
-                            
-                            try:
-                                command = recognizer.recognize_google(audio).lower()
-                                print(f"Heard: {command}")
-                                
-                                if "jarvis" in command:
-                                    self.text_signal.emit("\n👤 You: Jarvis")
-                                    self.text_signal.emit("🤖 Jarvis: Yes, boss? Take your time with your question.")
-                                    speak("Yes, boss? Take your time with your question.")
-                                    self.conversation_mode()
-                                    
-                            except sr.UnknownValueError:
-                                continue
-                            except sr.RequestError as e:
-                                print(f"Could not request results; {e}")
-                                self.text_signal.emit("⚠️ Network error. Retrying...")
-                                time.sleep(1)
-                                continue
-                                
-                        except Exception as e:
-                            print(f"Error in listening loop: {e}")
-                            time.sleep(0.1)
-                            continue
-                            
+                if self.capture.sample_rate != detector_rate:
+                    detector_rate = self.capture.sample_rate
+                    detector = create_wake_word_detector(WAKE_WORD_DIR, detector_rate, WAKE_WORD_THRESHOLD)
+                    if detector:
+                        print(f"Using local wake-word detection ({len(detector.templates)} templates)")
+
+                question = self.heard_wake_word(detector)
+                if question is None:
+                    continue
+                tts_worker.barge_in()
+                self.text_signal.emit("\n👤 You: Jarvis")
+                if question or self.audio.speech_follows(0.4):
+                    # Already asking ("Jarvis, what time is it"): don't talk over the question
+                    self.conversation_mode(question or None, prompt=False)
+                else:
+                    self.text_signal.emit("🤖 Jarvis: Yes, boss? Take your time with your question.")
+                    speak("Yes, boss? Take your time with your question.", wait=True)
+                    self.conversation_mode()
+                if detector:
+                    detector.reset()
+                self.audio.skip_to_now()
+
+            except sr.UnknownValueError:
+                continue
+            except sr.RequestError as e:
+                print(f"Could not request results; {e}")
+                self.text_signal.emit("⚠️ Network error. Retrying...")
+                time.sleep(1)
+                continue
             except Exception as e:
-                print(f"Microphone error: {e}")
-                self.text_signal.emit("⚠️ Microphone error. Reinitializing...")
-                time.sleep(2)
+                print(f"Error in listening loop: {e}")
+                time.sleep(0.1)
                 continue
 
-    def conversation_mode(self):
+    def microphone_opened(self, capture):
+        print(f"\nListening for 'Jarvis'... (Microphone is active, {capture.sample_rate} Hz)")
+        self.text_signal.emit("\n🎤 Microphone is active and listening for 'Jarvis'...")
+        startup.end("speech")
+
+    def microphone_failed(self, error):
+        print(f"Microphone error: {error}")
+        startup.end("speech", error)
+        self.text_signal.emit("⚠️ Microphone error. Reinitializing...")
+
+    def heard_wake_word(self, detector):
+        """None until the wake word is heard, then whatever was said after it in the same phrase"""
+        if detector:
+            # Local keyword spotting on raw frames, nothing is sent over the network
+            frames = self.audio.read(timeout=0.5)
+            return "" if frames and detector.process(frames) else None
+
+        segment = self.audio.next_segment(timeout=0.5, hangover=1.0, max_length=8)
+        if segment is None:
+            return None
+        command = self.stt.recognize(segment.audio()).lower()
+        if "jarvis" not in command:
+            return None
+        return command.split("jarvis", 1)[1].strip(" ,.!?")
+
+    def conversation_mode(self, question=None, prompt=True):
+        import speech_recognition as sr
+        self.state = "conversation"
         try:
-            recognizer = sr.Recognizer()
-            recognizer.energy_threshold = 3000
-            recognizer.dynamic_energy_threshold = True
-            recognizer.pause_threshold = 0.8
-            
-            with sr.Microphone() as source:
+            if prompt:
                 self.text_signal.emit("\n🤖 Jarvis: I'm listening...")
-                speak("I'm listening...")
-                
-                # Initial adjustment
-                recognizer.adjust_for_ambient_noise(source, duration=1)
-                
-                while True:
-                    try:
+                speak("I'm listening...", wait=True)
+                self.audio.skip_to_now()  # Don't hear ourselves
+
+            while not self.capture.stopped:
+                try:
+                    if question is None:
                         print("Listening for question...")
-                        audio = recognizer.listen(source, timeout=None, phrase_time_limit=5)
-                        
-                        try:
-                            question = recognizer.recognize_google(audio).lower()
-                            print(f"Heard: {question}")  # Debugging line
-                            
-                            if "goodbye" in question or "bye" in question:
-                                self.text_signal.emit("\n👤 You: " + question)
-                                self.text_signal.emit("🤖 Jarvis: Goodbye! Call me if you need anything.")
-                                speak("Goodbye! Call me if you need anything.")
-                                return
-                            
-                            # Check for commands
-                            if "set timer" in question:
-                                print("Detected command: set timer")  # Debugging line
-                                self.set_timer(question)
-                            elif "play music" in question:
-                                print("Detected command: play music")  # Debugging line
-                                self.play_music()
-                            else:
-                                print("Processing as a regular question")  # Debugging line
-                                self.text_signal.emit(f"\n👤 You: {question}")
-                                translated_question = translate_to_english(question)
-                                answer = get_answer(translated_question)
-                                self.text_signal.emit(f"🤖 Jarvis: {answer}")
-                                speak(answer)
-                            
-                        except sr.UnknownValueError:
-                            continue
-                        except sr.RequestError as e:
-                            print(f"Could not request results; {e}")
+                        segment = self.audio.next_segment(max_length=5)
+                        if segment is None:
                             continue
-                            
-                    except Exception as e:
-                        print(f"Error in conversation: {e}")
-                        continue
-                        
-        except Exception as e:
-            print(f"Microphone error in conversation: {e}")
-            self.text_signal.emit("⚠️ Microphone error. Please try again.")
+                        # Timed from the start of speech: the silence before the question isn't latency
+                        heard_at = self.audio.heard_at
+                        trace = tracer.start("voice", started=heard_at)
+                        trace.add("listen", (time.perf_counter() - heard_at) * 1000, start_ms=0)
+                        self.state = "listening"
+                        try:
+                            with trace.span("recognize"):
+                                question = self.stt.recognize(segment.audio()).lower()
+                        finally:
+                            self.state = "conversation"
+                    else:
+                        trace = tracer.start("voice")
+                    route = router.route(question)
+                    trace.attrs.update(heard=question, intent=route.intent)  # Shown in the F12 panel
+                    if route.intent == "goodbye":
+                        trace.finish()
+                        self.text_signal.emit("\n👤 You: " + question)
+                        self.text_signal.emit("🤖 Jarvis: Goodbye! Call me if you need anything.")
+                        speak("Goodbye! Call me if you need anything.", wait=True)
+                        return
+
+                    # Check for commands
+                    if self.run_command(route):
+                        trace.finish(command=True)
+                    else:
+                        self.text_signal.emit(f"\n👤 You: {question}")
+                        self.ask(question, trace)
+                    self.audio.skip_to_now()  # The answer was spoken; listen from here
+
+                except sr.UnknownValueError:
+                    trace.finish(error=True)
+                    continue
+                except sr.RequestError as e:
+                    print(f"Could not request results; {e}")
+                    trace.finish(error=True)
+                    continue
+                except Exception as e:
+                    print(f"Error in conversation: {e}")
+                    continue
+                finally:
+                    question = None
+
+        finally:
+            self.state = "waiting"
+
+    def ask(self, question, trace=None):
+        # The answer is shown by the GUI, but spoken here so we don't listen to ourselves
+        sentences = queue.Queue()
+
+        def listener(kind, request_id, payload):
+            if kind == "sentence":
+                sentences.put(payload)
+            elif kind == "done":
+                sentences.put(None)
+            else:
+                self.request_bridge.dispatch(kind, request_id, payload)
+
+        try:
+            request_scheduler.submit(question, "voice", listener, timeout=5, trace=trace)
+        except SchedulerBusy:
+            self.text_signal.emit("⚠️ Jarvis is busy. Please ask again in a moment.")
+            if trace is not None:
+                trace.finish(error=True)
             return
+        self.state = "thinking"
+        for sentence in iter(sentences.get, None):
+            speak(sentence, trace=trace)
+        if trace is not None:
+            trace.finish()
+        tts_worker.wait_until_idle(SPEECH_WAIT)
+        self.state = "conversation"
 
-    def set_timer(self, question):
-        match = re.search(r'(\d+)\s*seconds?', question)
-        if match:
-            seconds = int(match.group(1))
-            threading.Timer(seconds, self.timer_finished).start()
-            self.text_signal.emit(f"⏰ Timer set for {seconds} seconds.")
-            speak(f"Timer set for {seconds} seconds.")
+    def run_command(self, route):
+        """Carry out a routed command; False when the route is a question for Mistral"""
+        if route.intent == "set_timer":
+            self.set_timer(route.slots.get("duration"), route.slots.get("at"), route.slots.get("label", ""))
+        elif route.intent == "cancel_timer":
+            self.cancel_timers(route.slots.get("all", False))
+        elif route.intent == "list_timers":
+            self.list_timers()
+        elif route.intent == "play_music":
+            self.play_music(route.slots.get("query"))
+        elif route.intent == "stop_music":
+            music_player.stop()
+            self.text_signal.emit("🎶 Music stopped.")
+        elif route.intent == "weather" and WEATHER_API_KEY:
+            self.tell_weather(route.slots.get("city"))
         else:
+            return False
+        return True
+
+    def set_timer(self, seconds=None, at=None, label=""):
+        if not seconds and at is None:
             self.text_signal.emit("⚠️ I couldn't understand the timer duration.")
-            speak("I couldn't understand the timer duration.")
-
-    def timer_finished(self):
-        self.text_signal.emit("⏰ Time's up!")
-        speak("Time's up!")
-
-    def play_music(self):
-        music_directory = "/This PC/music"  # Change this to your actual music directory
-        music_files = [f for f in os.listdir(music_directory) if f.endswith(('.mp3', '.wav'))]
-        if music_files:
-            os.startfile(os.path.join(music_directory, music_files[0]))
-            self.text_signal.emit("🎶 Playing music.")
-            speak("Playing music.")
+            speak("I couldn't understand the timer duration.", wait=True)
+            return
+        timer = timers.add(seconds, at, label)
+        when = f"for {describe_time(timer.due)}" if at is not None else f"for {format_duration(seconds)}"
+        reply = f"{'Reminder' if label else 'Alarm' if at is not None else 'Timer'} set {when}."
+        self.text_signal.emit(f"⏰ {reply}")
+        speak(reply, wait=True)
+
+    def cancel_timers(self, everything=False):
+        # "Cancel the timer" means the next one to go off; "cancel all timers" means all of them
+        pending = timers.list()
+        if everything or len(pending) <= 1:
+            cancelled = timers.cancel()
+        else:
+            cancelled = timers.cancel(pending[0].id)
+        if not cancelled:
+            reply = "There are no timers to cancel."
+        elif len(cancelled) == 1:
+            reply = f"Cancelled the {describe_timer(cancelled[0])}."
+        else:
+            reply = f"Cancelled {len(cancelled)} timers."
+        self.text_signal.emit(f"⏰ {reply}")
+        speak(reply, wait=True)
+
+    def list_timers(self):
+        pending = timers.list()
+        if not pending:
+            reply = "You have no timers set."
+        else:
+            items = [f"{describe_timer(timer)}, {format_duration(round(timer.remaining))} left" for timer in pending[:5]]
+            more = f" and {len(pending) - 5} more" if len(pending) > 5 else ""
+            reply = f"You have {len(pending)} timer{'s' if len(pending) != 1 else ''}: " + "; ".join(items) + more + "."
+        self.text_signal.emit(f"⏰ {reply}")
+        speak(reply, wait=True)
+
+    def timer_finished(self, timer=None):
+        # Called on the timer service thread, so don't wait for the speech
+        if timer is not None and timer.label:
+            reply = f"Reminder: {timer.label}."
+        else:
+            reply = "Time's up!"
+        if timer is not None and timer.late:
+            reply += f" It was due at {describe_time(timer.due)}."
+        self.text_signal.emit(f"⏰ {reply}")
+        speak(reply)
+
+    def play_music(self, query=None):
+        if query:
+            found = music_library.search(query, limit=1)
+            track = found[0] if found else None
+        else:
+            track = music_library.shuffle()
+        if track:
+            # Say it before playing so the announcement isn't drowned out by the music
+            self.text_signal.emit(f"🎶 Playing {track.describe()}.")
+            speak(f"Playing {track.describe()}.", wait=True)
+            music_player.play(track.path)
+        elif query:
+            webbrowser.open(f"https://www.youtube.com/results?search_query={quote(query)}")
+            self.text_signal.emit(f"🎶 I couldn't find {query} in your music. Searching for it in the browser.")
+            speak(f"I couldn't find {query} in your music. Searching for it in the browser.", wait=True)
         else:
             webbrowser.open("https://www.youtube.com/results?search_query=music")
             self.text_signal.emit("🎶 No music files found. Opening music in the browser.")
-            speak("No music files found. Opening music in the browser.")
+            speak("No music files found. Opening music in the browser.", wait=True)
 
-    def tell_weather(self):
-        # Replace with your weather API key and endpoint
-        api_key = "YOUR_WEATHER_API_KEY"
-        city = "YOUR_CITY"  # You can modify this to get the city from the user
+    def tell_weather(self, city=None):
+        api_key = WEATHER_API_KEY
+        city = city or WEATHER_CITY
         url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
         
-        response = requests.get(url)
+        import requests
+        response = requests.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             temperature = data['main']['temp']
             weather_description = data['weather'][0]['description']
             self.text_signal.emit(f"The current temperature in {city} is {temperature}°C with {weather_description}.")
-            speak(f"The current temperature in {city} is {temperature} degrees Celsius with {weather_description}.")
+            speak(f"The current temperature in {city} is {temperature} degrees Celsius with {weather_description}.", wait=True)
         else:
             self.text_signal.emit("⚠️ Unable to fetch weather data.")
-            speak("Unable to fetch weather data.")
-
-@lru_cache(maxsize=100)
-def translate_to_english(text):
-    try:
-        translated_text = GoogleTranslator(source='auto', target='en').translate(text)
-        return translated_text
-    except Exception:
-        return text
-
-def get_answer(question):
-    """Get answer using Mistral AI"""
-    try:
-        # Prepare the prompt based on question type
-        question_lower = question.lower()
-        
-        if "capital" in question_lower:
-            system_prompt = "You are a helpful AI assistant that gives very concise answers about capital cities. Answer in one short sentence without any additional context."
-            user_prompt = f"What is the official capital city of the country mentioned in this question: {question}"
-        elif "area" in question_lower or "size" in question_lower:
-            system_prompt = "You are a helpful AI assistant that gives precise numerical answers about geographical areas. Answer with just the number and unit without any additional text."
-            user_prompt = f"What is the total area in square kilometers of the country/region mentioned in: {question}"
-        elif "population" in question_lower:
-            system_prompt = "You are a helpful AI assistant that gives precise numerical answers about population. Answer with just the number without any additional text."
-            user_prompt = f"What is the current population of the location mentioned in: {question}"
-        elif "list" in question_lower or "what are" in question_lower:
-            system_prompt = "You are a helpful AI assistant that creates concise numbered lists. Format the response as a simple numbered list without any introduction or conclusion."
-            user_prompt = f"List only the top 5 most important items for: {question}"
-        else:
-            system_prompt = "You are a helpful AI assistant that gives very concise, direct answers. Answer in one sentence without any additional context or explanation."
-            user_prompt = question
-
-        # Make the request to Mistral
-        messages = [
-            ChatMessage(role="system", content=system_prompt),
-            ChatMessage(role="user", content=user_prompt)
-        ]
-        
-        chat_response = client.chat(
-            model="mistral-tiny",  # Using the tiny model for faster responses
-            messages=messages,
-            temperature=0.1,
-            max_tokens=100,
-            top_p=0.9,
-            random_seed=42  # For consistent responses
-        )
-        
-        if chat_response and chat_response.choices:
-            answer = chat_response.choices[0].message.content.strip()
-            # Clean up the response
-            answer = answer.replace("Answer:", "").replace("Response:", "").strip()
-            # Add period if missing and not a list
-            if not any(char.isdigit() for char in answer) and not answer.endswith(('.', '!', '?')):
-                answer += '.'
-            return answer
-
-    except Exception as e:
-        print(f"Error getting answer: {e}")
-        return f"I apologize, but I encountered an error: {str(e)}"
-    
-    return "I'm sorry, I couldn't find accurate information for your question. Could you please rephrase it?"
-
-def speak(text):
-    global tts_engine
-    try:
-        # Remove URLs and technical symbols for better speech
-        clean_text = re.sub(r'http\S+|www.\S+|\n|Source:', '', text)
-        tts_engine.say(clean_text)
-        tts_engine.runAndWait()
-    except Exception as e:
-        print(f"Speech synthesis error: {e}")
-        tts_engine = init_text_to_speech()
+            speak("Unable to fetch weather data.", wait=True)
+
+def describe_time(timestamp):
+    due = datetime.fromtimestamp(timestamp)
+    day = "" if due.date() == datetime.now().date() else due.strftime(" on %A")
+    return due.strftime("%I:%M %p").lstrip("0") + day
+
+def describe_timer(timer):
+    if timer.label:
+        return f"reminder to {timer.label}"
+    if timer.alarm:
+        return f"alarm for {describe_time(timer.due)}"
+    return f"timer for {format_duration(round(timer.due - timer.created))}"
+
+# One bounded worker pool serves both the typed and the voice paths
+request_scheduler = RequestScheduler(
+    pipeline.answer_request,
+    workers=int(os.getenv('JARVIS_WORKERS', '2')),
+    max_pending=int(os.getenv('JARVIS_MAX_PENDING', '8'))
+)
+
+def speak(text, wait=False, priority=NORMAL, trace=None):
+    tts_worker.say(text, priority=priority, trace=trace)
+    if wait:
+        # Used by the listener so it doesn't pick up Jarvis's own voice
+        tts_worker.wait_until_idle(SPEECH_WAIT)
 
 if __name__ == "__main__":
     app = QApplication([])
     jarvis_ui = JarvisUI()
     jarvis_ui.show()
     app.exec()
+    print(f"Startup: {startup.summary()}")
+    if pipeline.translator.loaded:
+        print(f"Translation round trips saved this session: {pipeline.translator.stats()['round_trips_saved']}")
+    speculation = pipeline.speculation_stats
+    print(f"Speculative answers used: {speculation['used']}, discarded: {speculation['discarded']}")
+    robot_frames = jarvis_ui.robot_animation.frame_stats()
+    print(f"Robot frame time: {robot_frames['mean_ms']:.3f} ms mean, {robot_frames['p95_ms']:.3f} ms p95")
+    clock_seconds = jarvis_ui.animation_clock.stats()['seconds']
+    print("Animation time by mode: " + ", ".join(f"{mode} {seconds:.0f}s" for mode, seconds in clock_seconds.items()))
+    if world_facts:
+        facts = world_facts.stats()
+        print(f"Fact questions answered locally: {facts['hits']} of {facts['lookups']} ({facts['hit_rate']:.0%})")
+    speech = tts_worker.metrics()
+    print(f"Speech: {speech['spoken']} spoken, {speech['dropped']} dropped, {speech['mean_latency_ms']:.0f} ms mean "
+          f"until speaking starts, queue depth up to {speech['max_queue_depth']}")
+    stt = jarvis_ui.listener_thread.stt
+    if stt is not None:
+        print("Speech recognition: " + ", ".join(
+            f"{name} {stats['calls']} calls ({stats['failures']} failed, {stats['unrecognized']} unrecognized), "
+            f"{stats['mean_ms']:.0f} ms mean" for name, stats in stt.metrics().items()))
+    context = conversation.stats()
+    print(f"Prompt tokens per request: {context['mean_tokens']:.0f} mean, {context['max_tokens']} max over {context['requests']} requests")
+    stages = tracer.summary()
+    if stages:
+        print("Stage latency (p50/p95 ms): " + ", ".join(
+            f"{stage} {stats['p50_ms']:.0f}/{stats['p95_ms']:.0f}" for stage, stats in stages.items()))
+    tracer.close()
+    timers.stop()
+    history.close()
@@ -0,0 +1,148 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, QEvent
+
+FULL = "full"
+REDUCED = "reduced"
+PAUSED = "paused"
+
+# Assistant states in which the animations run at full rate (listening: a question is being heard or recognized)
+BUSY_STATES = ("listening", "thinking", "speaking")
+
+def on_battery():
+    """True when running from battery; False when unknown (psutil is optional)"""
+    try:
+        import psutil
+        battery = psutil.sensors_battery()
+    except Exception:
+        return False
+    return battery is not None and not battery.power_plugged
+
+class AnimationClock(QObject):
+    """Single timer driving every animated widget.
+
+    Subscribers are called with the elapsed time in 50 ms steps, the rate the animations
+    were designed for, so they move at the same speed whatever the frame rate. The mode
+    follows the window and the assistant: paused while the window is hidden or minimized
+    or after `sleep_after` seconds without activity, reduced after `idle_after` seconds or
+    on battery, full while Jarvis is listening, thinking or speaking.
+    """
+
+    STEP = 0.05
+
+    def __init__(self, window, full_fps=20, reduced_fps=4, idle_after=120, sleep_after=3600,
+                 state_probe=None, poll_interval=2.0):
+        super().__init__(window)
+        self.window = window
+        self.budget = {FULL: full_fps, REDUCED: reduced_fps, PAUSED: 0}
+        self.idle_after = idle_after
+        self.sleep_after = sleep_after
+        self.state_probe = state_probe
+        self.subscribers = []
+        self.forced = None
+        self.mode = None
+        self.battery = on_battery()
+        self.last_activity = time.monotonic()
+        self.last_tick = None
+
+        self.ticks = 0
+        self.mode_since = time.monotonic()
+        self.mode_seconds = {FULL: 0.0, REDUCED: 0.0, PAUSED: 0.0}
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        # Cheap watchdog for idle time, assistant state and power source; it keeps running while paused
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.poll_timer.start(int(poll_interval * 1000))
+        window.installEventFilter(self)
+        self.update_mode()
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def set_budget(self, full_fps=None, reduced_fps=None):
+        """Change the frame rate of the full and reduced modes"""
+        if full_fps is not None:
+            self.budget[FULL] = full_fps
+        if reduced_fps is not None:
+            self.budget[REDUCED] = reduced_fps
+        self.apply(self.mode)
+
+    def set_mode(self, mode):
+        """Pin the clock to a mode, or pass None to choose automatically again"""
+        self.forced = mode
+        self.update_mode()
+
+    def note_activity(self):
+        self.last_activity = time.monotonic()
+        self.update_mode()
+
+    def window_visible(self):
+        if not self.window.isVisible() or self.window.isMinimized():
+            return False
+        handle = self.window.windowHandle()
+        return handle is None or handle.isExposed()
+
+    def choose_mode(self):
+        if self.forced:
+            return self.forced
+        if not self.window_visible():
+            return PAUSED
+        state = self.state_probe() if self.state_probe else None
+        if state in BUSY_STATES:
+            self.last_activity = time.monotonic()
+            return FULL
+        idle = time.monotonic() - self.last_activity
+        if idle >= self.sleep_after:
+            return PAUSED
+        if idle >= self.idle_after or self.battery:
+            return REDUCED
+        return FULL
+
+    def update_mode(self):
+        mode = self.choose_mode()
+        if mode != self.mode:
+            self.apply(mode)
+
+    def apply(self, mode):
+        now = time.monotonic()
+        if self.mode is not None:
+            self.mode_seconds[self.mode] += now - self.mode_since
+        self.mode_since = now
+        self.mode = mode
+        fps = self.budget[mode]
+        if fps > 0:
+            self.last_tick = None
+            self.timer.start(max(1, round(1000 / fps)))
+        else:
+            self.timer.stop()
+
+    def poll(self):
+        self.battery = on_battery()
+        self.update_mode()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange,
+                            QEvent.Type.Expose, QEvent.Type.WindowActivate):
+            # Let Qt apply the change before looking at the window again
+            QTimer.singleShot(0, self.update_mode)
+        return False
+
+    def tick(self):
+        now = time.monotonic()
+        # Don't make up for long stalls, the animation would jump
+        steps = 1.0 if self.last_tick is None else min(now - self.last_tick, 0.5) / self.STEP
+        self.last_tick = now
+        self.ticks += 1
+        for callback in list(self.subscribers):
+            callback(steps)
+
+    def stats(self):
+        seconds = dict(self.mode_seconds)
+        if self.mode is not None:
+            seconds[self.mode] += time.monotonic() - self.mode_since
+        return {"mode": self.mode, "fps": self.budget[self.mode], "ticks": self.ticks, "seconds": seconds}
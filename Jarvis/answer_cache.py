@@ -0,0 +1,178 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import hashlib
+import difflib
+
+DAY = 24 * 60 * 60
+
+# How long an answer stays fresh, per question category (seconds)
+DEFAULT_TTLS = {
+    "capital": 180 * DAY,
+    "area": 365 * DAY,
+    "population": 7 * DAY,
+    "list": 30 * DAY,
+    "general": 1 * DAY,
+}
+
+# Filler that only addresses Jarvis or asks politely, dropped from the start of a question
+LEADING_FILLER = {
+    "jarvis", "hey", "hi", "ok", "okay", "so", "please", "tell", "me", "can", "could", "would",
+    "will", "you",
+}
+
+def question_key(question):
+    return " ".join(re.findall(r"[a-z0-9]+", question.lower()))
+
+def phrase_key(question):
+    # Word order and every word after the filler stay, so "100 dollars to euros" and
+    # "100 euros to dollars" (or "what is water" and "what is in water") never share a key
+    words = " ".join("what is" if word == "whats" else word
+                     for word in question_key(question.replace("'", "")).split()).split()
+    start = 0
+    while start < len(words) - 1 and words[start] in LEADING_FILLER:
+        start += 1
+    if words and words[-1] == "please" and len(words) - start > 1:
+        words.pop()
+    return " ".join(words[start:])
+
+class AnswerCache:
+    """SQLite-backed answer cache with per-category TTLs and LRU eviction"""
+
+    # match: "exact" (normalized text), "phrase" (also ignores leading filler such as "hey Jarvis")
+    # or "fuzzy" (also near-duplicate spellings; can confuse names like Austria/Australia)
+    def __init__(self, path, max_entries=5000, ttls=None, match="exact",
+                 fuzzy_threshold=0.95, fuzzy_candidates=200):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.match = match
+        self.fuzzy_threshold = fuzzy_threshold
+        self.fuzzy_candidates = fuzzy_candidates
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(answers)")]
+        if columns and "phrase_key" not in columns:
+            self.db.execute("DROP TABLE answers")  # Keyed by unordered content words, which mixed up questions
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS answers (
+                prompt_hash TEXT NOT NULL,
+                question_key TEXT NOT NULL,
+                phrase_key TEXT NOT NULL,
+                category TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                expires REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (prompt_hash, question_key)
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS answers_phrases ON answers (prompt_hash, phrase_key)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS answers_lru ON answers (last_used)")
+        self.db.commit()
+        self.count = self.db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def prompt_hash(self, system_prompt):
+        return hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()
+
+    def get(self, question, system_prompt, allow_stale=False):
+        """Cached answer or None; allow_stale also returns expired answers (used while the API is down)"""
+        now = time.time()
+        fresh_after = 0 if allow_stale else now
+        prompt = self.prompt_hash(system_prompt)
+        with self.lock:
+            row = self.db.execute(
+                "SELECT rowid, answer FROM answers WHERE prompt_hash = ? AND question_key = ? AND expires > ?",
+                (prompt, question_key(question), fresh_after)
+            ).fetchone()
+            if row is None and self.match != "exact":
+                row = self.find_similar(prompt, question, fresh_after)
+                if row is not None:
+                    self.fuzzy_hits += 1
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute("UPDATE answers SET last_used = ? WHERE rowid = ?", (now, row[0]))
+            self.db.commit()
+            return row[1]
+
+    def find_similar(self, prompt, question, fresh_after):
+        phrase = phrase_key(question)
+        row = self.db.execute(
+            "SELECT rowid, answer FROM answers WHERE prompt_hash = ? AND phrase_key = ? AND expires > ?",
+            (prompt, phrase, fresh_after)
+        ).fetchone()
+        if row is not None or self.match != "fuzzy":
+            return row
+
+        # Near-duplicate match against the most recently used entries for this prompt
+        candidates = self.db.execute(
+            "SELECT rowid, answer, phrase_key FROM answers WHERE prompt_hash = ? AND expires > ? "
+            "ORDER BY last_used DESC LIMIT ?",
+            (prompt, fresh_after, self.fuzzy_candidates)
+        ).fetchall()
+        best, best_ratio = None, self.fuzzy_threshold
+        matcher = difflib.SequenceMatcher(b=phrase, autojunk=False)
+        for rowid, answer, candidate_phrase in candidates:
+            matcher.set_seq1(candidate_phrase)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = (rowid, answer), ratio
+        return best
+
+    def put(self, question, system_prompt, category, answer):
+        now = time.time()
+        ttl = self.ttls.get(category, self.ttls["general"])
+        prompt = self.prompt_hash(system_prompt)
+        key = question_key(question)
+        with self.lock:
+            exists = self.db.execute(
+                "SELECT 1 FROM answers WHERE prompt_hash = ? AND question_key = ?", (prompt, key)
+            ).fetchone()
+            self.db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (prompt, key, phrase_key(question), category, answer, now + ttl, now)
+            )
+            if not exists:
+                self.count += 1
+            if self.count > self.max_entries:
+                self.evict(now)
+            self.db.commit()
+
+    def evict(self, now):
+        # Drop expired entries first, then the least recently used down to 90% of capacity
+        removed = self.db.execute("DELETE FROM answers WHERE expires <= ?", (now,)).rowcount
+        self.count -= removed
+        excess = self.count - int(self.max_entries * 0.9)
+        if excess > 0:
+            lru = self.db.execute(
+                "DELETE FROM answers WHERE rowid IN "
+                "(SELECT rowid FROM answers ORDER BY last_used LIMIT ?)", (excess,)
+            ).rowcount
+            self.count -= lru
+            removed += lru
+        self.evictions += removed
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.count,
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
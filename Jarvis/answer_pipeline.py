@@ -0,0 +1,369 @@
+import os
+import re
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from startup import Lazy
+from translation import Translator, TranslationStore, looks_english
+from answer_cache import AnswerCache, question_key
+from llm_client import ResilientMistralClient, CircuitOpenError
+from history_store import HistoryStore
+from conversation_context import ConversationContext, estimate_tokens
+from intent_router import IntentRouter
+from world_facts import WorldFacts
+
+def select_prompt(question, route):
+    # Prepare the prompt based on question type
+    category = route.intent
+
+    if category == "capital":
+        system_prompt = "You are a helpful AI assistant that gives very concise answers about capital cities. Answer in one short sentence without any additional context."
+        user_prompt = f"What is the official capital city of the country mentioned in this question: {question}"
+    elif category == "area":
+        system_prompt = "You are a helpful AI assistant that gives precise numerical answers about geographical areas. Answer with just the number and unit without any additional text."
+        user_prompt = f"What is the total area in square kilometers of the country/region mentioned in: {question}"
+    elif category == "population":
+        system_prompt = "You are a helpful AI assistant that gives precise numerical answers about population. Answer with just the number without any additional text."
+        user_prompt = f"What is the current population of the location mentioned in: {question}"
+    elif category == "list":
+        system_prompt = "You are a helpful AI assistant that creates concise numbered lists. Format the response as a simple numbered list without any introduction or conclusion."
+        user_prompt = f"List only the top 5 most important items for: {question}"
+    else:
+        category = "general"
+        system_prompt = "You are a helpful AI assistant that gives very concise, direct answers. Answer in one sentence without any additional context or explanation."
+        user_prompt = question
+
+    return category, system_prompt, user_prompt
+
+def build_messages(conversation, system_prompt, user_prompt):
+    from mistralai.models.chat_completion import ChatMessage
+    return [ChatMessage(role=role, content=content) for role, content in conversation.messages(system_prompt, user_prompt)]
+
+def strip_answer_labels(answer):
+    return answer.replace("Answer:", "").replace("Response:", "").strip()
+
+def clean_answer(answer):
+    # Clean up the response
+    answer = strip_answer_labels(answer)
+    # Add period if missing and not a list
+    if not any(char.isdigit() for char in answer) and not answer.endswith(('.', '!', '?')):
+        answer += '.'
+    return answer
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a line break (list items)
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+LIST_NUMBER = re.compile(r'\d+[.)]')
+
+class AnswerStream:
+    """Accumulates streamed answer chunks and splits off complete sentences for speech"""
+
+    def __init__(self):
+        self.raw = ""
+        self.spoken = 0
+
+    @property
+    def text(self):
+        return strip_answer_labels(self.raw)
+
+    def feed(self, chunk):
+        self.raw += chunk
+        sentences = []
+        for match in SENTENCE_END.finditer(self.raw, self.spoken):
+            sentence = strip_answer_labels(self.raw[self.spoken:match.end()])
+            if LIST_NUMBER.fullmatch(sentence):
+                continue  # Wait for the list item that follows its number
+            self.spoken = match.end()
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def finish(self):
+        rest = strip_answer_labels(self.raw[self.spoken:])
+        self.spoken = len(self.raw)
+        if not self.text:
+            return "I'm sorry, I couldn't find accurate information for your question. Could you please rephrase it?", []
+        return clean_answer(self.raw), [rest] if rest else []
+
+class AnswerPipeline:
+    """Translate, answer and record questions; shared by the window and the headless service.
+
+    Nothing here touches Qt or audio. Each request may bring its own ConversationContext
+    (one per service session); without one the pipeline's own conversation is used.
+    """
+
+    def __init__(self, client, translator, answer_cache, history, conversation, router,
+                 world_facts=None, speculate=True):
+        self.client = client
+        self.translator = translator
+        self.answer_cache = answer_cache
+        self.history = history
+        self.conversation = conversation
+        self.router = router
+        self.world_facts = world_facts
+        self.speculate = speculate
+        self.translation_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jarvis-translate")
+        # How often answering the untranslated question while it was being translated paid off
+        self.speculation_stats = {"used": 0, "discarded": 0, "english": 0}
+
+    def load(self):
+        """Build the translator and the AI client ahead of the first question"""
+        for subsystem in (self.translator, self.client):
+            try:
+                subsystem.load()
+            except Exception as e:
+                print(f"Could not load {subsystem._name}: {e}")
+
+    def new_conversation(self):
+        return ConversationContext(budget=self.conversation.budget, max_turns=self.conversation.max_turns)
+
+    def timed_translation(self, question, details):
+        started = time.perf_counter()
+        translated = self.translator.translate(question)
+        details["translated"] = translated
+        details["translate_ms"] = (time.perf_counter() - started) * 1000
+        return translated
+
+    def stream_answer(self, question, details=None, conversation=None):
+        """Stream answer chunks from Mistral AI as they arrive"""
+        conversation = conversation or self.conversation
+        route = self.router.route(question)
+        category, system_prompt, user_prompt = select_prompt(question, route)
+        local = self.world_facts.answer(category, route.slots.get("place")) if self.world_facts else None
+        if details is not None:
+            details["category"] = category
+            details["local"] = local is not None
+            details.pop("error", None)
+        if local is not None:
+            yield local
+            return
+
+        # The answer to a follow-up depends on the conversation, so it can't be shared through the cache
+        follow_up = conversation.is_follow_up(question)
+        cached = None if follow_up else self.answer_cache.get(question, system_prompt)
+        if details is not None:
+            details["cached"] = cached is not None
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        try:
+            messages = build_messages(conversation, system_prompt, user_prompt)
+            if details is not None:
+                details["prompt_tokens"] = sum(estimate_tokens(message.content) for message in messages)
+            ai_started = time.perf_counter()
+            if details is not None:
+                details["ai_started"] = ai_started
+            chat_stream = self.client.chat_stream(
+                model="mistral-tiny",  # Using the tiny model for faster responses
+                messages=messages,
+                temperature=0.1,
+                max_tokens=100,
+                top_p=0.9,
+                random_seed=42  # For consistent responses
+            )
+
+            for chunk in chat_stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if not chunks and details is not None:
+                        details["ai_first_token_ms"] = (time.perf_counter() - ai_started) * 1000
+                    chunks.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            if details is not None:
+                details["ai_ms"] = (time.perf_counter() - ai_started) * 1000
+
+        except Exception as e:
+            print(f"Error getting answer: {e}")
+            if details is not None:
+                details["error"] = True
+            if not chunks:
+                # Serve an expired cached answer, or at least an honest one, while the API is unhealthy
+                stale = None if follow_up else self.answer_cache.get(question, system_prompt, allow_stale=True)
+                if stale is not None:
+                    yield stale
+                elif isinstance(e, CircuitOpenError):
+                    yield "I'm having trouble reaching my AI service right now. Please try again in a minute."
+                else:
+                    yield f"I apologize, but I encountered an error: {str(e)}"
+            return
+
+        if "".join(chunks).strip() and not follow_up:
+            self.answer_cache.put(question, system_prompt, category, "".join(chunks))
+
+    def speculative_answer(self, question, details, conversation=None):
+        """Stream an answer, starting on the raw question while translation runs in parallel.
+
+        The speculative stream runs on its own thread and its chunks are held back until
+        translation returns, whichever comes first. If translation left the question unchanged
+        they are used as is; otherwise that stream is abandoned and the translated question is
+        answered straight away.
+        """
+        if looks_english(question):
+            self.speculation_stats["english"] += 1
+            yield from self.stream_answer(self.timed_translation(question, details), details, conversation)
+            return
+
+        events = queue.Queue()
+        cancelled = threading.Event()
+        speculative_details = {}
+        speculative = self.stream_answer(question, speculative_details, conversation)
+        threading.Thread(target=self.pump, args=(speculative, events, cancelled),
+                         name="jarvis-speculate", daemon=True).start()
+        translation = self.translation_pool.submit(self.timed_translation, question, details)
+        translation.add_done_callback(lambda _: events.put(("translated", None)))
+        try:
+            buffered = []
+            ended = False
+            while True:
+                kind, chunk = events.get()
+                if kind == "translated":
+                    break
+                if kind == "chunk":
+                    buffered.append(chunk)
+                else:
+                    ended = True  # Answered before translation returned; keep waiting for it
+            translated_question = translation.result()
+            if question_key(translated_question) == question_key(question):
+                self.speculation_stats["used"] += 1
+                details.update(speculative_details)
+                yield from buffered
+                while not ended:
+                    kind, chunk = events.get()
+                    if kind == "chunk":
+                        yield chunk
+                    else:
+                        ended = True
+                details.update(speculative_details)
+                return
+        finally:
+            cancelled.set()
+
+        self.speculation_stats["discarded"] += 1
+        yield from self.stream_answer(translated_question, details, conversation)
+
+    def pump(self, stream, events, cancelled):
+        """Feed a speculative answer's chunks to `events` until it ends or is cancelled"""
+        try:
+            for chunk in stream:
+                if cancelled.is_set():
+                    break
+                events.put(("chunk", chunk))
+        finally:
+            stream.close()  # Closes the HTTP stream of an abandoned answer
+            events.put(("end", None))
+
+    def sequential_answer(self, question, details, conversation=None):
+        yield from self.stream_answer(self.timed_translation(question, details), details, conversation)
+
+    def answer_request(self, request):
+        """Translate, answer and stream one scheduled request back to its listener.
+
+        `request.context`, when set, is the ConversationContext of the session it came from.
+        """
+        conversation = request.context or self.conversation
+        stream = AnswerStream()
+        details = {"queue_ms": (time.time() - request.created) * 1000}
+        started = time.perf_counter()
+        answer_chunks = self.speculative_answer if self.speculate else self.sequential_answer
+        chunks = answer_chunks(request.question, details, conversation)
+        try:
+            for chunk in chunks:
+                if request.cancelled.is_set():
+                    return
+                if "first_chunk_ms" not in details:
+                    details["first_chunk_ms"] = (time.perf_counter() - started) * 1000
+                for sentence in stream.feed(chunk):
+                    request.emit("sentence", sentence)
+                request.emit("partial", stream.text)
+        finally:
+            chunks.close()
+
+        answer, sentences = stream.finish()
+        for sentence in sentences:
+            request.emit("sentence", sentence)
+
+        if not details.get("error"):
+            conversation.add(details.get("translated") or request.question, answer)
+        timings = {key: details[key] for key in ("translate_ms", "first_chunk_ms", "cached", "local", "prompt_tokens") if key in details}
+        timings["total_ms"] = (time.perf_counter() - started) * 1000
+        if request.trace is not None:
+            self.trace_stages(request, details, started, timings["total_ms"])
+        request.details = dict(timings, category=details.get("category"), translated=details.get("translated"),
+                               error=bool(details.get("error")))
+        request.emit("answer", answer)
+        self.history.record(request.question, answer, request.source, translated=details.get("translated"),
+                            category=details.get("category"), timings=timings)
+
+    def trace_stages(self, request, details, started, total_ms):
+        """Add the stages timed while answering to the request's trace"""
+        trace = request.trace
+        answer_start = (started - trace.started) * 1000
+        trace.add("queue", details["queue_ms"], start_ms=answer_start - details["queue_ms"])
+        trace.add("answer", total_ms, start_ms=answer_start)
+        if "translate_ms" in details:
+            trace.add("translate", details["translate_ms"], start_ms=answer_start)
+        if "ai_started" in details:
+            ai_start = (details["ai_started"] - trace.started) * 1000
+            if "ai_first_token_ms" in details:
+                trace.add("ai_first_token", details["ai_first_token_ms"], start_ms=ai_start)
+            if "ai_ms" in details:
+                trace.add("ai", details["ai_ms"], start_ms=ai_start)
+        trace.attrs.update(category=details.get("category"), cached=details.get("cached", False),
+                           local=details.get("local", False), error=bool(details.get("error")))
+
+    def stats(self):
+        return {
+            "speculation": dict(self.speculation_stats),
+            "conversation": self.conversation.stats(),
+            "answer_cache": self.answer_cache.stats(),
+            "translation": self.translator.stats() if self.translator.loaded else None,
+            "ai": self.client.stats() if self.client.loaded else None,
+            "world_facts": self.world_facts.stats() if self.world_facts else None,
+        }
+
+def create_pipeline(data_dir, profiler=None):
+    """The answer pipeline as configured by the environment, with its stores under `data_dir`"""
+    # Set Mistral API key
+    api_key = os.getenv('MISTRAL_API_KEY')
+    # Pooled client with deadlines, retries and a circuit breaker; MISTRAL_ENDPOINT can point at a local stand-in
+    client = Lazy("ai", lambda: ResilientMistralClient(
+        api_key=api_key,
+        endpoint=os.getenv('MISTRAL_ENDPOINT'),
+        timeout=float(os.getenv('MISTRAL_TIMEOUT', '10')),
+        deadline=float(os.getenv('MISTRAL_DEADLINE', '20'))
+    ), profiler)
+
+    # One keep-alive session and an on-disk translation memory; JARVIS_TRANSLATE_ENDPOINT can point at a local stand-in
+    translator = Lazy("translation", lambda: Translator(TranslationStore(
+        os.path.join(data_dir, 'translations.db'),
+        max_entries=int(os.getenv('JARVIS_TRANSLATION_CACHE_SIZE', '10000'))
+    ), endpoint=os.getenv('JARVIS_TRANSLATE_ENDPOINT')), profiler)
+
+    # Answers are close to deterministic (low temperature, fixed seed), so repeated questions are served from disk
+    answer_cache = AnswerCache(
+        os.path.join(data_dir, 'answers.db'),
+        max_entries=int(os.getenv('JARVIS_ANSWER_CACHE_SIZE', '5000')),
+        match=os.getenv('JARVIS_ANSWER_CACHE_MATCH', 'exact')
+    )
+
+    # Every answered question, with timings, searchable with Ctrl+F
+    history = HistoryStore(os.path.join(data_dir, 'history.db'))
+
+    # Recent turns sent with each question so follow-ups work, within a fixed token budget
+    conversation = ConversationContext(
+        budget=int(os.getenv('JARVIS_CONTEXT_TOKENS', '600')),
+        max_turns=int(os.getenv('JARVIS_CONTEXT_TURNS', '6'))
+    )
+    for entry in history.recent(conversation.max_turns):
+        conversation.add(entry['translated'] or entry['question'], entry['answer'], entry['created'])
+
+    # Capital, area and population questions about countries are answered from a bundled table
+    world_facts = WorldFacts.open(bin_path=os.path.join(data_dir, 'world_facts.bin')) \
+        if os.getenv('JARVIS_LOCAL_FACTS', '1') == '1' else None
+
+    return AnswerPipeline(
+        client, translator, answer_cache, history, conversation, IntentRouter(), world_facts,
+        # Translate in the background while the completion starts on the raw question
+        speculate=os.getenv('JARVIS_SPECULATE', '1') == '1'
+    )
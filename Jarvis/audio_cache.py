@@ -0,0 +1,82 @@
+import os
+import hashlib
+import threading
+
+class AudioCache:
+    """Content-addressed store of rendered speech, one WAV per (voice, text), evicted least recently used"""
+
+    def __init__(self, directory, voice_key="", max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.voice_key = voice_key
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(entry.size for entry in self.entries())
+
+    def entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.wav') and not name.endswith('.tmp.wav'):
+                    try:
+                        yield CacheEntry(os.path.join(root, name))
+                    except OSError:
+                        continue  # Removed while we were scanning
+
+    def path_for(self, text):
+        digest = hashlib.sha256(f"{self.voice_key}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + '.wav')
+
+    def get(self, text):
+        path = self.path_for(text)
+        try:
+            # Touch on use so eviction is least-recently-used
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def render(self, engine, text):
+        """Synthesize `text` to the cache with a pyttsx3 engine (must be called on the engine's thread)"""
+        path = self.path_for(text)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp.wav"
+        engine.save_to_file(text, temp_path)
+        engine.runAndWait()
+        if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
+            return None
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, path)
+        with self.lock:
+            self.size += size
+            if self.size > self.max_bytes:
+                self.evict()
+        return path
+
+    def evict(self):
+        # Remove least recently used files until the cache is back under 90% of its limit
+        entries = sorted(self.entries(), key=lambda entry: entry.mtime)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self.size <= target:
+                break
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.size -= entry.size
+            self.evictions += 1
+
+    def stats(self):
+        return {"bytes": self.size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+class CacheEntry:
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
@@ -0,0 +1,290 @@
+import time
+import threading
+
+import numpy as np
+
+class VoiceActivityDetector:
+    """Frame-level speech detector against a continuously tracked noise floor.
+
+    The floor follows quieter frames quickly and louder ones slowly, so it settles within a
+    second of the microphone opening and follows a fan switching on without calibration,
+    while a few seconds of speech barely move it.
+    """
+
+    def __init__(self, ratio=3.0, min_level=150.0, fall=0.2, rise=0.002):
+        self.ratio = ratio
+        self.min_level = min_level
+        self.fall = fall
+        self.rise = rise
+        self.noise_floor = None
+
+    def process(self, level):
+        if self.noise_floor is None:
+            self.noise_floor = level
+        voiced = level > max(self.noise_floor * self.ratio, self.min_level)
+        rate = self.fall if level < self.noise_floor else self.rise
+        self.noise_floor += rate * (level - self.noise_floor)
+        return voiced
+
+class RingBuffer:
+    """Fixed-size frames of 16-bit audio with their VAD decisions.
+
+    One writer, any number of readers, no lock: the writer fills the slot of frame `written`
+    and then publishes it by incrementing `written`. Readers keep their own position and
+    check after copying that the writer has not lapped them meanwhile.
+    """
+
+    def __init__(self, frame_samples, capacity, written=0):
+        self.frame_samples = frame_samples
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, frame_samples), dtype=np.int16)
+        self.voiced = np.zeros(capacity, dtype=bool)
+        self.written = written  # Frames are numbered from the start of the capture
+
+    def append(self, frame, voiced):
+        slot = self.written % self.capacity
+        self.samples[slot] = frame
+        self.voiced[slot] = voiced
+        self.written += 1
+
+    def oldest(self):
+        return max(0, self.written - self.capacity + 1)  # The next append overwrites one more
+
+    def read(self, start, end):
+        """(first frame actually returned, int16 samples of frames start..end); older frames are gone"""
+        start = max(start, self.oldest())
+        if start >= end:
+            return start, np.zeros(0, dtype=np.int16)
+        slots = np.arange(start, end) % self.capacity
+        samples = self.samples[slots].reshape(-1)
+        lapped = self.oldest() - start
+        if lapped > 0:  # Overwritten while copying
+            return start + lapped, samples[lapped * self.frame_samples:]
+        return start, samples
+
+    def voiced_frames(self, start, end):
+        start = max(start, self.oldest())
+        return start, self.voiced[np.arange(start, end) % self.capacity] if start < end else self.voiced[:0]
+
+class Segment:
+    """A stretch of speech cut from the buffer, pre-roll and a little trailing silence included"""
+
+    def __init__(self, samples, sample_rate, start, end):
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.start = start  # Frame numbers in the capture
+        self.end = end
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    def audio(self):
+        import speech_recognition as sr
+        return sr.AudioData(self.samples.tobytes(), self.sample_rate, 2)
+
+class SegmentReader:
+    """One consumer's position in the capture.
+
+    Wake-word detection and question capture share one reader, so the question can start
+    with audio recorded while the wake word was still being recognized.
+    """
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.position = capture.buffer.written if capture.buffer else 0
+        self.floor = self.position  # Pre-roll never reaches back past this frame
+        self.hearing = False  # next_segment has found speech and is waiting for it to end
+        self.heard_at = None  # perf_counter() when the speech of the last segment started
+
+    def skip_to_now(self):
+        """Ignore everything captured so far, such as Jarvis' own voice"""
+        buffer = self.capture.buffer
+        self.position = self.floor = buffer.written if buffer else 0
+
+    def wait(self, frame, timeout):
+        """Wait until frame `frame` has been captured; False on timeout or when capture stopped before it"""
+        return self.capture.wait_for(frame, timeout)
+
+    def read(self, timeout=None):
+        """Raw 16-bit frames captured since the last read, as bytes (b"" on timeout)"""
+        if not self.wait(self.position + 1, timeout):
+            return b""
+        buffer = self.capture.buffer
+        end = buffer.written
+        _, samples = buffer.read(self.position, end)
+        self.position = self.floor = end
+        return samples.tobytes()
+
+    def speech_follows(self, seconds):
+        """Whether speech is captured within `seconds` of audio after the current position"""
+        frames = self.capture.frames(seconds)
+        end = self.position + frames
+        if not self.wait(end, seconds + 0.5):
+            return False
+        _, voiced = self.capture.buffer.voiced_frames(self.position, end)
+        return bool(voiced.any())
+
+    def next_segment(self, timeout=None, pre_roll=0.3, hangover=0.8, max_length=5.0, min_speech=0.25,
+                     trailing=0.2):
+        """Block until a stretch of speech has ended (`hangover` of silence) or reached `max_length`.
+
+        Returns a Segment starting `pre_roll` before the first voiced frame, or None on timeout
+        or when capture stops. Stretches with less than `min_speech` of voiced frames are skipped.
+        """
+        capture = self.capture
+        deadline = None if timeout is None else time.monotonic() + timeout
+        hangover_frames, max_frames = capture.frames(hangover), capture.frames(max_length)
+        onset = last_voiced = None
+        voiced_count = 0
+        try:
+            while True:
+                if onset is None and deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self.wait(self.position + 1, remaining):
+                        return None
+                elif not self.wait(self.position + 1, None):
+                    return None
+                buffer = capture.buffer
+                end = buffer.written
+                start, voiced = buffer.voiced_frames(self.position, end)
+                for offset, is_voiced in enumerate(voiced):
+                    frame = start + offset
+                    if is_voiced:
+                        if onset is None:
+                            onset = frame
+                            self.hearing = True
+                            self.heard_at = time.perf_counter()
+                        last_voiced = frame
+                        voiced_count += 1
+                    if onset is None:
+                        continue
+                    if frame - last_voiced >= hangover_frames or frame + 1 - onset >= max_frames:
+                        self.position = frame + 1
+                        if voiced_count < capture.frames(min_speech):
+                            onset = last_voiced = None  # A click or a cough: keep listening
+                            self.hearing = False
+                            voiced_count = 0
+                            self.floor = self.position
+                            break
+                        return self.cut(onset, last_voiced, pre_roll, trailing)
+                else:
+                    self.position = end
+        finally:
+            self.hearing = False
+
+    def cut(self, onset, last_voiced, pre_roll, trailing):
+        capture = self.capture
+        first = max(onset - capture.frames(pre_roll), self.floor)
+        last = min(last_voiced + 1 + capture.frames(trailing), self.position)
+        first, samples = capture.buffer.read(first, last)
+        self.floor = self.position
+        return Segment(samples, capture.sample_rate, first, last)
+
+class AudioCapture:
+    """Always-on microphone: one thread reads the source into a RingBuffer and runs the VAD on every frame.
+
+    `source_factory` makes a speech_recognition AudioSource (sr.Microphone, or a WAV replay in
+    the benchmarks). When opening or reading it fails, on_error(error) is called and it is
+    reopened after `retry` seconds; on_open(capture) is called every time it opens. A source
+    whose stream runs dry (b"") ends the capture.
+    """
+
+    def __init__(self, source_factory, seconds=30.0, frame_ms=30, vad=None, on_open=None, on_error=None,
+                 retry=2.0):
+        self.source_factory = source_factory
+        self.seconds = seconds
+        self.frame_ms = frame_ms
+        self.vad = vad or VoiceActivityDetector()
+        self.on_open = on_open
+        self.on_error = on_error
+        self.retry = retry
+        self.sample_rate = None
+        self.buffer = None
+        self.condition = threading.Condition()
+        self.running = False
+        self.stopped = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="jarvis-audio-capture", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def reader(self):
+        return SegmentReader(self)
+
+    def frames(self, seconds):
+        return max(1, int(round(seconds * 1000 / self.frame_ms)))
+
+    def wait_for(self, frame, timeout):
+        """Wait until `frame` frames have been captured; False on timeout, or once stopped short of it"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while not self.stopped and (self.buffer is None or self.buffer.written < frame):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return self.buffer is not None and self.buffer.written >= frame
+
+    def run(self):
+        while self.running:
+            try:
+                with self.source_factory() as source:
+                    self.open(source)
+                    if self.on_open:
+                        self.on_open(self)
+                    if not self.capture(source):
+                        break  # The source has no more audio
+            except Exception as e:
+                if not self.running:
+                    break
+                if self.on_error:
+                    self.on_error(e)
+                time.sleep(self.retry)
+        self.stop()
+
+    def open(self, source):
+        if source.SAMPLE_WIDTH != 2:
+            raise ValueError("The microphone must deliver 16-bit audio")
+        if self.buffer is None or source.SAMPLE_RATE != self.sample_rate:
+            frame_samples = source.SAMPLE_RATE * self.frame_ms // 1000
+            # Frame numbers carry on, so readers' positions stay meaningful across a reopen
+            self.buffer = RingBuffer(frame_samples, self.frames(self.seconds), self.buffer.written if self.buffer else 0)
+            self.sample_rate = source.SAMPLE_RATE
+
+    def capture(self, source):
+        buffer = self.buffer
+        frame_bytes = buffer.frame_samples * 2
+        pending = b""
+        while self.running:
+            data = source.stream.read(source.CHUNK)
+            if not data:
+                return False
+            pending += data
+            usable = len(pending) - len(pending) % frame_bytes
+            if not usable:
+                continue
+            frames = np.frombuffer(pending[:usable], dtype=np.int16).reshape(-1, buffer.frame_samples)
+            pending = pending[usable:]
+            levels = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+            for frame, level in zip(frames, levels):
+                buffer.append(frame, self.vad.process(float(level)))
+            with self.condition:
+                self.condition.notify_all()
+        return True
+
+    def stats(self):
+        buffer = self.buffer
+        return {
+            "sample_rate": self.sample_rate,
+            "frames": buffer.written if buffer else 0,
+            "noise_floor": self.vad.noise_floor,
+        }
@@ -0,0 +1,107 @@
+import os
+import sys
+import shutil
+import subprocess
+import threading
+
+class WavPlayer:
+    """Plays WAV files with the lowest-latency backend available; play() blocks until done or stop()"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = None
+        self.backend = self.pick_backend()
+
+    def pick_backend(self):
+        try:
+            import simpleaudio  # noqa: F401
+            return "simpleaudio"
+        except ImportError:
+            pass
+        if sys.platform == "win32":
+            return "winsound"
+        for command in ("afplay", "paplay", "aplay"):
+            if shutil.which(command):
+                return command
+        return None
+
+    @property
+    def available(self):
+        return self.backend is not None
+
+    def play(self, path):
+        if self.backend == "simpleaudio":
+            import simpleaudio
+            play_object = simpleaudio.WaveObject.from_wave_file(path).play()
+            with self.lock:
+                self.current = play_object
+            play_object.wait_done()
+        elif self.backend == "winsound":
+            import winsound
+            with self.lock:
+                self.current = "winsound"
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+        elif self.backend:
+            command = [self.backend, "-q", path] if self.backend == "aplay" else [self.backend, path]
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with self.lock:
+                self.current = process
+            process.wait()
+        else:
+            raise RuntimeError("No audio playback backend available")
+        with self.lock:
+            self.current = None
+
+    def stop(self):
+        with self.lock:
+            current = self.current
+        if current is None:
+            return
+        if current == "winsound":
+            import winsound
+            winsound.PlaySound(None, winsound.SND_PURGE)
+        elif isinstance(current, subprocess.Popen):
+            current.terminate()
+        else:
+            current.stop()
+
+class MusicPlayer:
+    """Plays music files in the background: through a command-line player that can be stopped,
+    or else by handing the file to the system's default application"""
+
+    COMMANDS = {
+        "mpv": ["mpv", "--no-video", "--really-quiet"],
+        "ffplay": ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"],
+        "cvlc": ["cvlc", "--play-and-exit", "--quiet"],
+        "afplay": ["afplay"],
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.process = None
+        self.backend = next((name for name in self.COMMANDS if shutil.which(name)), None)
+
+    def play(self, path):
+        self.stop()
+        if self.backend:
+            process = subprocess.Popen(self.COMMANDS[self.backend] + [path],
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with self.lock:
+                self.process = process
+        elif sys.platform == "win32":
+            os.startfile(path)
+        else:
+            subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", path],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def stop(self):
+        """Stop what we're playing; music handed to another application keeps going"""
+        with self.lock:
+            process, self.process = self.process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    @property
+    def playing(self):
+        with self.lock:
+            return self.process is not None and self.process.poll() is None
@@ -0,0 +1,123 @@
+"""How much of a question that follows the wake word reaches speech recognition.
+
+For each --gaps value, replays "Jarvis", that many seconds of quiet, then a --question long
+question through WavMicrophone, and captures it two ways:
+
+- legacy: what ListenerThread did before audio_capture.py. It listens for the wake phrase
+  (pause threshold 1.0 s) and then, in conversation_mode, reads a second of "ambient noise" to
+  calibrate before listening for the question. Audio during that second is lost, and a
+  question that starts before the wake phrase ends becomes part of it and is ignored.
+- capture: AudioCapture's one reader. The wake segment ends after 1.0 s of quiet; a question
+  that started before then is the rest of the wake phrase, otherwise the next segment, with
+  0.3 s of pre-roll.
+
+Jarvis' spoken prompts are left out of both; the capture path skips them anyway when the
+question follows straight away.
+
+Reports the share of the question's speech handed to recognition as the question, and the
+CPU time the capture thread (ring buffer and VAD) costs per second of audio.
+
+Usage: python benchmarks/bench_audio_capture.py [--gaps 0.3,0.8,1.5,2.5,3.5] [--question 1.5] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import speech_recognition as sr
+from audio_capture import AudioCapture
+from fake_microphone import SAMPLE_RATE, WavMicrophone, synthetic_utterance, write_wav
+
+def scenario(directory, gap, question, seed=3):
+    """WAV path and the question's speech as a (first, last) sample range"""
+    rng = random.Random(seed)
+    wake = synthetic_utterance(0.7, rng, lead=1.5, tail=gap)  # Both calibrate on the first second
+    asked = synthetic_utterance(question, rng, lead=0.0, tail=2.0)
+    path = os.path.join(directory, f"gap_{gap:.2f}.wav")
+    write_wav(path, wake + asked)
+    return path, (len(wake), len(wake) + int(question * SAMPLE_RATE))
+
+def overlap(span, speech):
+    return max(0, min(span[1], speech[1]) - max(span[0], speech[0]))
+
+def legacy(path, speech):
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = 2500
+    recognizer.dynamic_energy_threshold = True
+    recognizer.pause_threshold = 1.0
+    recognizer.phrase_threshold = 0.5
+    with WavMicrophone([path], speed=0) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        recognizer.listen(source, timeout=None, phrase_time_limit=8)  # "Jarvis"
+        # conversation_mode: a new Recognizer, a second of calibration, then the question
+        recognizer = sr.Recognizer()
+        recognizer.energy_threshold = 3000
+        recognizer.dynamic_energy_threshold = True
+        recognizer.pause_threshold = 0.8
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        before = source.stream.position
+        recognizer.listen(source, timeout=None, phrase_time_limit=5)
+        return overlap((before, source.stream.position), speech)
+
+def captured(path, speech):
+    microphone = WavMicrophone([path], speed=0)
+    capture = AudioCapture(lambda: microphone)
+    reader = capture.reader()
+    capture.start()
+    wake = reader.next_segment(timeout=10, hangover=1.0, max_length=8)
+    frame_samples = capture.buffer.frame_samples
+    wake_span = (wake.start * frame_samples, wake.end * frame_samples)
+    if overlap(wake_span, speech):
+        return overlap(wake_span, speech)  # "Jarvis, <question>": the text after the wake word is the question
+    question = reader.next_segment(timeout=10, max_length=5)
+    return overlap((question.start * frame_samples, question.end * frame_samples), speech) if question else 0
+
+def capture_cost(seconds):
+    path = os.path.join(tempfile.mkdtemp(prefix="jarvis-capture-"), "long.wav")
+    rng = random.Random(5)
+    samples = []
+    while len(samples) < seconds * SAMPLE_RATE:
+        samples += synthetic_utterance(1.5, rng, lead=1.0, tail=1.0)
+    write_wav(path, samples)
+    capture = AudioCapture(lambda: WavMicrophone([path], speed=0))
+    capture.running = True
+    started = time.thread_time()
+    capture.run()  # On this thread, to time it; returns when the file runs out
+    return (time.thread_time() - started) / (len(samples) / SAMPLE_RATE) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gaps", default="0.3,0.8,1.5,2.5,3.5", help="seconds between 'Jarvis' and the question")
+    parser.add_argument("--question", type=float, default=1.5, help="seconds of question speech")
+    parser.add_argument("--seconds", type=float, default=120, help="audio for the CPU measurement")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="jarvis-capture-")
+    results = {"question_s": args.question, "gaps": []}
+    for gap in [float(g) for g in args.gaps.split(",")]:
+        path, speech = scenario(directory, gap, args.question)
+        length = speech[1] - speech[0]
+        results["gaps"].append({
+            "gap_s": gap,
+            "legacy_captured_percent": legacy(path, speech) / length * 100,
+            "capture_captured_percent": captured(path, speech) / length * 100,
+        })
+    results["capture_cpu_ms_per_audio_s"] = capture_cost(args.seconds)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Share of a {args.question:.1f} s question handed to recognition, by pause after 'Jarvis':")
+    for row in results["gaps"]:
+        print(f"  {row['gap_s']:.1f} s: legacy {row['legacy_captured_percent']:5.1f}%, "
+              f"capture {row['capture_captured_percent']:5.1f}%")
+    print(f"Capture thread (ring buffer + VAD): {results['capture_cpu_ms_per_audio_s']:.2f} ms CPU per second of audio")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Prompt size per request over a long session, with and without ConversationContext.
+
+Replays a synthetic session of questions and follow-ups and reports the estimated prompt
+tokens per request for three strategies: the managed context window, resending the whole
+conversation, and sending only the current question (what Jarvis did before).
+
+Usage: python benchmarks/bench_context.py [--turns 200] [--budget 600] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conversation_context import ConversationContext, estimate_tokens
+
+SYSTEM_PROMPT = ("You are a helpful AI assistant that gives very concise, direct answers. "
+                 "Answer in one sentence without any additional context or explanation.")
+SESSION = [
+    ("What is the capital of {c}?", "The capital of {c} is its largest city and seat of government."),
+    ("And its population?", "{c} has a population of roughly {n} million people as of the latest estimates."),
+    ("How big is it?", "{c} covers an area of about {n}00 thousand square kilometers."),
+    ("What are the main exports of {c}?", "1. Machinery. 2. Vehicles. 3. Chemicals. 4. Food products. 5. Textiles."),
+]
+COUNTRIES = ["France", "Japan", "Brazil", "Kenya", "Canada", "India", "Norway", "Peru"]
+
+def session(turns):
+    for i in range(turns):
+        question, answer = SESSION[i % len(SESSION)]
+        country = COUNTRIES[i // len(SESSION) % len(COUNTRIES)]
+        yield question.format(c=country), answer.format(c=country, n=10 + i % 90)
+
+def summarize(sizes):
+    return {"first": sizes[0], "last": sizes[-1], "mean": sum(sizes) / len(sizes), "max": max(sizes)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=600, help="token budget of the managed context")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    context = ConversationContext(budget=args.budget)
+    managed, full, single = [], [], []
+    history = []
+    build_time = 0.0
+    for question, answer in session(args.turns):
+        started = time.perf_counter()
+        messages = context.messages(SYSTEM_PROMPT, question)
+        build_time += time.perf_counter() - started
+        managed.append(sum(estimate_tokens(content) for _, content in messages))
+        full.append(estimate_tokens(SYSTEM_PROMPT) + sum(estimate_tokens(text) for text in history) + estimate_tokens(question))
+        single.append(estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(question))
+        context.add(question, answer)
+        history += [question, answer]
+
+    results = {
+        "turns": args.turns,
+        "budget": args.budget,
+        "managed": summarize(managed),
+        "full_history": summarize(full),
+        "question_only": summarize(single),
+        "build_us": build_time / args.turns * 1e6,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.turns} turns, budget {args.budget} tokens, messages built in {results['build_us']:.1f} us")
+    for name in ("managed", "full_history", "question_only"):
+        r = results[name]
+        print(f"  {name:>13}: first {r['first']}, last {r['last']}, mean {r['mean']:.0f}, max {r['max']} tokens/request")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Write throughput and search latency of the conversation history store.
+
+Fills a fresh history database with synthetic question/answer pairs through
+HistoryStore.record() (the batched writer), then times full-text searches for rare and
+common words and the startup recent() query.
+
+Usage: python benchmarks/bench_history.py [--rows 1000000] [--db path] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from history_store import HistoryStore
+from tracing import percentile
+
+COUNTRIES = ["France", "Germany", "Japan", "Brazil", "Canada", "India", "Kenya", "Peru", "Norway", "Egypt",
+             "Mexico", "Chile", "Spain", "Italy", "Ghana", "Nepal", "Cuba", "Fiji", "Oman", "Chad"]
+TEMPLATES = [
+    ("What is the capital of {c}?", "The capital of {c} is {x}.", "capital"),
+    ("What is the population of {c}?", "About {n} million people live in {c}.", "population"),
+    ("How big is {c}?", "{c} covers {n} thousand square kilometers.", "area"),
+    ("Tell me something about {c}", "{c} is known for its {x} and history.", "general"),
+]
+WORDS = ["mountains", "rivers", "cuisine", "music", "festivals", "architecture", "coffee", "football"]
+
+def fill(store, rows, rng):
+    started = time.perf_counter()
+    for i in range(rows):
+        question, answer, category = TEMPLATES[i % len(TEMPLATES)]
+        country = rng.choice(COUNTRIES)
+        word = rng.choice(WORDS) if i % 1000 else f"zebra{i}"  # a few rare words to look for
+        store.record(
+            question.format(c=country), answer.format(c=country, x=word, n=rng.randint(1, 999)),
+            "voice" if i % 3 else "typed", category=category,
+            timings={"first_chunk_ms": rng.uniform(200, 900), "total_ms": rng.uniform(500, 2500)}
+        )
+    queued = time.perf_counter() - started
+    store.flush()
+    return queued, time.perf_counter() - started
+
+def time_query(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": percentile(times, 0.5), "p99_ms": percentile(times, 0.99)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--db", help="database file (default: a temporary one)")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per query")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="jarvis-bench-"), "history.db")
+    store = HistoryStore(path)
+    queued, written = fill(store, args.rows, random.Random(1))
+    results = {
+        "rows": store.count(),
+        "record_us": queued / args.rows * 1e6,
+        "write_rows_per_s": args.rows / written,
+        "batches": store.stats()["batches"],
+        "queries": {},
+    }
+    queries = {
+        "rare word": "zebra5000",
+        "common word": "capital",
+        "two words": "population japan",
+        "prefix": "arch",
+        "no match": "quokka",
+    }
+    for name, text in queries.items():
+        timing = time_query(lambda: store.search(text, limit=20), args.repeat)
+        timing["results"] = len(store.search(text, limit=20))
+        results["queries"][name] = timing
+    results["queries"]["relevance, common word"] = time_query(
+        lambda: store.search("capital", limit=20, order="relevance"), max(1, args.repeat // 10))
+    results["recent"] = time_query(lambda: store.recent(10), args.repeat)
+    store.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['rows']} rows: record() {results['record_us']:.1f} us, "
+          f"{results['write_rows_per_s']:.0f} rows/s written in {results['batches']} batches")
+    for name, timing in list(results["queries"].items()) + [("recent(10)", results["recent"])]:
+        print(f"  {name:>24}: p50 {timing['p50_ms']:.2f} ms, p99 {timing['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
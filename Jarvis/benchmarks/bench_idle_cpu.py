@@ -0,0 +1,81 @@
+"""CPU use of the animated header and background while Jarvis is idle.
+
+Runs RobotAnimation and ParticleBackground offscreen for a few seconds per scenario and
+reports process CPU time per wall-clock second:
+
+  legacy    each widget on its own 50 ms timer (the behaviour before AnimationClock)
+  full      shared clock at full rate (listening, thinking, speaking or recent activity)
+  reduced   shared clock after the idle timeout or on battery
+  hidden    window minimized or hidden, clock paused
+
+Usage: python benchmarks/bench_idle_cpu.py [--seconds 5] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# ai_assistant reads its settings at import; keep this run away from the real caches
+os.environ.setdefault("JARVIS_DATA_DIR", tempfile.mkdtemp(prefix="jarvis-bench-"))
+os.environ.setdefault("MISTRAL_API_KEY", "benchmark")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication, QVBoxLayout, QWidget
+from animation_clock import AnimationClock, FULL, REDUCED
+from ai_assistant import ParticleBackground, RobotAnimation
+
+def build(clock_mode):
+    window = QWidget()
+    window.resize(1366, 768)
+    clock = None
+    if clock_mode:
+        clock = AnimationClock(window)
+        if clock_mode != "auto":
+            clock.set_mode(clock_mode)
+    background = ParticleBackground(window, clock)
+    background.setGeometry(0, 0, 1366, 768)
+    layout = QVBoxLayout(window)
+    layout.addWidget(RobotAnimation(clock))
+    return window, clock
+
+def measure(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    started, started_cpu = time.perf_counter(), time.process_time()
+    loop.exec()
+    wall = time.perf_counter() - started
+    return (time.process_time() - started_cpu) / wall * 100
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement time per scenario")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {}
+    for name, clock_mode in (("legacy", None), ("full", FULL), ("reduced", REDUCED), ("hidden", "auto")):
+        window, clock = build(clock_mode)
+        window.show()
+        if name == "hidden":
+            window.showMinimized()
+            window.hide()
+        app.processEvents()
+        results[name] = {"cpu_percent": measure(args.seconds)}
+        if clock:
+            results[name]["clock"] = clock.stats()
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:>8}: {result['cpu_percent']:5.1f}% CPU")
+
+if __name__ == "__main__":
+    main()
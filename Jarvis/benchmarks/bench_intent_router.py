@@ -0,0 +1,107 @@
+"""Accuracy and speed of the intent router against the old substring checks.
+
+Reads benchmarks/intent_corpus.tsv (text, expected intent, optional JSON slots) and reports
+intent accuracy, slot accuracy and the misroutes of both routers, then times routing.
+
+Usage: python benchmarks/bench_intent_router.py [--corpus path] [--iterations 20000] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+from intent_router import IntentRouter
+
+def legacy_route(question):
+    # The substring checks conversation_mode and select_prompt used before the router
+    question = question.lower()
+    if "goodbye" in question or "bye" in question:
+        return "goodbye"
+    if "set timer" in question:
+        return "set_timer"
+    if "play music" in question:
+        return "play_music"
+    if "capital" in question:
+        return "capital"
+    if "area" in question or "size" in question:
+        return "area"
+    if "population" in question:
+        return "population"
+    if "list" in question or "what are" in question:
+        return "list"
+    return "general"
+
+def load_corpus(path):
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            slots = json.loads(fields[2]) if len(fields) > 2 and fields[2] else None
+            cases.append((fields[0], fields[1], slots))
+    return cases
+
+def evaluate(cases, route):
+    correct, slot_cases, slot_correct, misses = 0, 0, 0, []
+    for text, expected, slots in cases:
+        result = route(text)
+        intent, found = (result.intent, result.slots) if hasattr(result, "intent") else (result, None)
+        if intent == expected:
+            correct += 1
+        else:
+            misses.append(f"{text!r}: {intent}, expected {expected}")
+        if slots is not None and found is not None:
+            slot_cases += 1
+            if all(found.get(name) == value for name, value in slots.items()):
+                slot_correct += 1
+            else:
+                misses.append(f"{text!r}: slots {found}, expected {slots}")
+    return {
+        "accuracy": correct / len(cases),
+        "slot_accuracy": slot_correct / slot_cases if slot_cases else None,
+        "misses": misses,
+    }
+
+def time_routing(cases, route, iterations):
+    texts = [text for text, _, _ in cases]
+    started = time.perf_counter()
+    for i in range(iterations):
+        route(texts[i % len(texts)])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=os.path.join(HERE, "intent_corpus.tsv"))
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    router = IntentRouter()
+    results = {
+        "cases": len(cases),
+        "router": evaluate(cases, router.route),
+        "legacy": evaluate(cases, legacy_route),
+    }
+    results["router"]["route_us"] = time_routing(cases, router.route, args.iterations)
+    results["router"]["match_only_us"] = time_routing(cases, router.match, args.iterations)
+    results["legacy"]["route_us"] = time_routing(cases, legacy_route, args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(cases)} cases")
+    for name in ("legacy", "router"):
+        r = results[name]
+        slots = f", slots {r['slot_accuracy']:.1%}" if r["slot_accuracy"] is not None else ""
+        print(f"  {name:>6}: intents {r['accuracy']:.1%}{slots}, {r['route_us']:.2f} us per route")
+        for miss in r["misses"]:
+            print(f"          {miss}")
+    print(f"  router intent match without slots: {results['router']['match_only_us']:.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Load and fault-injection test of ResilientMistralClient against the local Mistral stub.
+
+Usage: python benchmarks/bench_llm_client.py [--requests 200] [--concurrency 8]
+                                             [--error-rate 0.2] [--hang-rate 0.02] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_client import ResilientMistralClient, CircuitBreaker, CircuitOpenError
+from mistral_stub import StubConfig, start_stub
+from tracing import percentile
+from mistralai.models.chat_completion import ChatMessage
+
+def run(args):
+    config = StubConfig(args.first_token, args.token_delay, args.error_rate, 503, args.hang_rate,
+                        hang_time=args.timeout * 2, seed=1)
+    server, endpoint = start_stub(config)
+    client = ResilientMistralClient(
+        "stub-key", endpoint=endpoint, timeout=args.timeout, deadline=args.deadline,
+        breaker=CircuitBreaker(failure_threshold=args.breaker_threshold, reset_timeout=args.breaker_reset)
+    )
+    messages = [ChatMessage(role="user", content="What is the capital of France?")]
+
+    def one(_):
+        started = time.perf_counter()
+        first = None
+        try:
+            for _ in client.chat_stream(model="mistral-tiny", messages=messages):
+                if first is None:
+                    first = time.perf_counter() - started
+            return "ok", first, time.perf_counter() - started
+        except CircuitOpenError:
+            return "rejected", None, time.perf_counter() - started
+        except Exception:
+            return "failed", None, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    ok = [r for r in results if r[0] == "ok"]
+    first_tokens = [r[1] * 1000 for r in ok]
+    totals = [r[2] * 1000 for r in ok]
+    failed_times = [r[2] * 1000 for r in results if r[0] != "ok"]
+    return {
+        "requests": args.requests,
+        "succeeded": len(ok),
+        "failed": sum(r[0] == "failed" for r in results),
+        "rejected_by_breaker": sum(r[0] == "rejected" for r in results),
+        "throughput_rps": args.requests / elapsed,
+        "first_token_ms_p50": percentile(first_tokens, 0.5),
+        "first_token_ms_p99": percentile(first_tokens, 0.99),
+        "total_ms_p50": percentile(totals, 0.5),
+        "total_ms_p99": percentile(totals, 0.99),
+        "failure_ms_p50": percentile(failed_times, 0.5),
+        "stub_requests": config.requests,
+        "injected_errors": config.errors,
+        "injected_hangs": config.hangs,
+        "client": client.stats(),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--first-token", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--deadline", type=float, default=5.0)
+    parser.add_argument("--breaker-threshold", type=int, default=5)
+    parser.add_argument("--breaker-reset", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key:24} {value}")
+
+if __name__ == "__main__":
+    main()
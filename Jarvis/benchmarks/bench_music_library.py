@@ -0,0 +1,153 @@
+"""Scan and search times of the music library on a synthetic collection.
+
+Creates --files empty audio files laid out as Artist/Album/NN - Title.mp3 (tags come from the
+paths, since the files hold no audio), then measures a first scan, a rescan with nothing
+changed, a rescan after touching, adding and removing files, loading the stored index, and
+"play <query>" searches. The old approach, walking the folders on every command and matching
+file names, is timed for comparison. Tags read from a few other layouts (files directly in the
+music folder, Artist/Title.mp3) are checked as tag_errors.
+
+Usage: python benchmarks/bench_music_library.py [--files 100000] [--queries 2000] [--dir path] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from music_library import MusicLibrary, tags_from_path, words
+from tracing import percentile
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "ven", "tor", "sha", "dun", "el", "ix", "po", "zu", "bel", "nor", "qui", "fa"]
+
+def name(rng, parts):
+    return " ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title() for _ in range(parts))
+
+def build_collection(root, files, seed=7):
+    rng = random.Random(seed)
+    tracks = []
+    while len(tracks) < files:
+        artist = name(rng, rng.randint(1, 2))
+        for _ in range(rng.randint(1, 6)):
+            album = name(rng, rng.randint(1, 3))
+            folder = os.path.join(root, artist, album)
+            os.makedirs(folder, exist_ok=True)
+            for number in range(1, rng.randint(8, 16)):
+                title = name(rng, rng.randint(1, 4))
+                path = os.path.join(folder, f"{number:02d} - {title}.mp3")
+                open(path, "wb").close()
+                tracks.append((artist, title, path))
+                if len(tracks) == files:
+                    return tracks
+    return tracks
+
+# Paths below the music root and the (artist, album, title) read from them
+TAG_CASES = [
+    ("Song.mp3", ("", "", "Song")),
+    ("ABBA - Waterloo.mp3", ("ABBA", "", "Waterloo")),
+    ("99 Luftballons.mp3", ("", "", "99 Luftballons")),
+    ("03 - Yesterday.mp3", ("", "", "Yesterday")),
+    ("Queen/Bohemian Rhapsody.mp3", ("Queen", "", "Bohemian Rhapsody")),
+    ("Queen/A Night at the Opera/11 Bohemian Rhapsody.mp3", ("Queen", "A Night at the Opera", "Bohemian Rhapsody")),
+    ("Rock/Queen/Innuendo/1-06 The Show Must Go On.mp3", ("Queen", "Innuendo", "The Show Must Go On")),
+]
+
+def tag_errors(root):
+    wrong = []
+    for relative, expected in TAG_CASES:
+        got = tags_from_path(os.path.join(root, *relative.split("/")), root)
+        if got != expected:
+            wrong.append({"path": relative, "expected": expected, "got": got})
+    return wrong
+
+def legacy_search(root, query):
+    """Walk the folders and match file names, as a per-command directory listing would"""
+    terms = words(query)
+    for folder, _, names in os.walk(root):
+        for file_name in names:
+            if file_name.endswith((".mp3", ".wav")) and all(t in words(os.path.join(folder, file_name)) for t in terms):
+                return os.path.join(folder, file_name)
+    return None
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--legacy-queries", type=int, default=5)
+    parser.add_argument("--dir", help="where to create the collection (default: a temporary directory)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    base = args.dir or tempfile.mkdtemp(prefix="jarvis-music-")
+    root = os.path.join(base, "Music")
+    tracks, create_ms = timed(build_collection, root, args.files)
+    library = MusicLibrary(os.path.join(base, "music.db"), roots=[root])
+
+    results = {"files": len(tracks), "create_ms": create_ms}
+    results["first_scan"], results["first_scan_ms"] = timed(library.scan)
+    results["rescan"], results["rescan_ms"] = timed(library.scan)
+
+    rng = random.Random(1)
+    for _, _, path in rng.sample(tracks, 100):
+        os.utime(path, (time.time() + 10, time.time() + 10))
+    for _, _, path in rng.sample(tracks, 50):
+        os.remove(path)
+        tracks.remove(next(track for track in tracks if track[2] == path))
+    for i in range(50):
+        path = os.path.join(root, "New Artist", "New Album", f"{i:02d} - New Song {i}.mp3")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+    results["changed_scan"], results["changed_scan_ms"] = timed(library.scan)
+    _, results["load_ms"] = timed(MusicLibrary(os.path.join(base, "music.db"), roots=[root]).load)
+    library.load()
+
+    # "play <title>", "play <title> by <artist>" and "play <artist>"
+    queries = []
+    for artist, title, _ in rng.sample(tracks, min(args.queries, len(tracks))):
+        queries.append(rng.choice([title, f"{title} by {artist}", artist]))
+    latencies, found = [], 0
+    for query in queries:
+        result, ms = timed(library.search, query)
+        latencies.append(ms)
+        found += bool(result)
+    results["search"] = {
+        "queries": len(queries),
+        "found": found,
+        "p50_ms": percentile(latencies, 0.5),
+        "p99_ms": percentile(latencies, 0.99),
+        "max_ms": max(latencies),
+    }
+    legacy = [timed(legacy_search, root, query)[1] for query in queries[:args.legacy_queries]]
+    results["legacy_search_p50_ms"] = percentile(legacy, 0.5)
+    results["stats"] = library.stats()
+    wrong = tag_errors(root)
+    results["tag_errors"] = len(wrong)
+    results["wrong_tags"] = wrong
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['files']} files (created in {create_ms / 1000:.1f} s), {results['stats']['words']} indexed words")
+    print(f"  first scan:         {results['first_scan_ms']:8.0f} ms  {results['first_scan']}")
+    print(f"  rescan, no changes: {results['rescan_ms']:8.0f} ms  {results['rescan']}")
+    print(f"  rescan, 200 changes:{results['changed_scan_ms']:8.0f} ms  {results['changed_scan']}")
+    print(f"  load stored index:  {results['load_ms']:8.0f} ms")
+    search = results["search"]
+    print(f"  search: p50 {search['p50_ms']:.3f} ms, p99 {search['p99_ms']:.3f} ms, "
+          f"max {search['max_ms']:.3f} ms, found {search['found']} of {search['queries']}")
+    if legacy:
+        print(f"  walking the folders per query: p50 {results['legacy_search_p50_ms']:.0f} ms")
+    print(f"  tags read from paths: {len(TAG_CASES) - len(wrong)} of {len(TAG_CASES)} right")
+    for case in wrong:
+        print(f"    {case['path']}: expected {case['expected']}, got {case['got']}")
+
+if __name__ == "__main__":
+    main()
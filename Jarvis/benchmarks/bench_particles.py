@@ -0,0 +1,121 @@
+"""Headless frame-time benchmark of the particle background.
+
+Compares the original list-of-objects simulation against ParticleField + ParticleSprites,
+painting into an offscreen QImage.
+
+Usage: python benchmarks/bench_particles.py [--counts 50,500,2000,5000] [--frames 200] [--json]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor, QGuiApplication, QImage, QPainter
+from particles import ParticleField, ParticleSprites
+
+WIDTH, HEIGHT = 1366, 768
+
+class LegacyParticle:
+    # The per-object particle the background used before ParticleField
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.size = random.randint(2, 5)
+        self.speed = random.uniform(0.5, 2)
+        self.angle = random.uniform(0, 360)
+        self.opacity = random.uniform(0.3, 0.7)
+
+    def move(self):
+        self.x += self.speed * math.cos(math.radians(self.angle))
+        self.y += self.speed * math.sin(math.radians(self.angle))
+        self.opacity = max(0.1, self.opacity - 0.001)
+
+class LegacyBackground:
+    def __init__(self, count):
+        self.particles = [LegacyParticle(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(count)]
+
+    def step(self):
+        for particle in self.particles:
+            particle.move()
+            if particle.x < 0 or particle.x > WIDTH or particle.y < 0 or particle.y > HEIGHT:
+                self.particles.remove(particle)
+                self.particles.append(LegacyParticle(random.randint(0, WIDTH), random.randint(0, HEIGHT)))
+
+    def paint(self, painter):
+        for particle in self.particles:
+            color = QColor("#3498db")
+            color.setAlphaF(particle.opacity)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QBrush(color))
+            painter.drawEllipse(int(particle.x - particle.size / 2), int(particle.y - particle.size / 2),
+                                particle.size, particle.size)
+
+class VectorBackground:
+    def __init__(self, count):
+        self.field = ParticleField(count, WIDTH, HEIGHT, seed=1)
+        self.sprites = ParticleSprites("#3498db")
+
+    def step(self):
+        self.field.step()
+
+    def paint(self, painter):
+        self.sprites.paint(painter, self.field)
+
+def measure(background, frames):
+    image = QImage(WIDTH, HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+    update = paint = 0.0
+    for _ in range(frames):
+        started = time.perf_counter()
+        background.step()
+        update += time.perf_counter() - started
+
+        image.fill(Qt.GlobalColor.transparent)
+        started = time.perf_counter()
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        background.paint(painter)
+        painter.end()
+        paint += time.perf_counter() - started
+    return {
+        "update_ms": update / frames * 1000,
+        "paint_ms": paint / frames * 1000,
+        "frame_ms": (update + paint) / frames * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="50,500,2000,5000", help="comma-separated particle counts")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--skip-legacy", action="store_true", help="only measure the vectorized path")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    random.seed(1)
+    results = []
+    for count in [int(c) for c in args.counts.split(",")]:
+        row = {"particles": count, "vectorized": measure(VectorBackground(count), args.frames)}
+        if not args.skip_legacy:
+            row["legacy"] = measure(LegacyBackground(count), args.frames)
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'particles':>9} {'impl':>10} {'update ms':>10} {'paint ms':>9} {'frame ms':>9} {'fps cap':>8}")
+    for row in results:
+        for impl in ("legacy", "vectorized"):
+            if impl in row:
+                r = row[impl]
+                print(f"{row['particles']:>9} {impl:>10} {r['update_ms']:>10.3f} {r['paint_ms']:>9.3f} "
+                      f"{r['frame_ms']:>9.3f} {1000 / r['frame_ms']:>8.0f}")
+    del app
+
+if __name__ == "__main__":
+    main()
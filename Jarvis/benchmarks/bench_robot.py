@@ -0,0 +1,78 @@
+"""Frame-time benchmark of the header robot: vector repaint vs. cached sprite frames.
+
+Steps the same arm/leg/hover animation RobotAnimation uses and paints each frame into an
+offscreen 150x150 image, reporting wall and CPU time per frame.
+
+Usage: python benchmarks/bench_robot.py [--frames 2000] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QGuiApplication, QImage, QPainter
+from robot_sprite import RobotFrames, paint_robot
+
+def animation(frames):
+    # Same stepping as RobotAnimation.animate
+    hover, arm, leg = 0.0, 0.0, 0.0
+    hover_dir = arm_dir = leg_dir = 1
+    for _ in range(frames):
+        hover += 0.2 * hover_dir
+        if abs(hover) >= 5:
+            hover_dir *= -1
+        arm += 1 * arm_dir
+        if abs(arm) >= 15:
+            arm_dir *= -1
+        leg += 0.5 * leg_dir
+        if abs(leg) >= 10:
+            leg_dir *= -1
+        yield hover, arm, leg
+
+def measure(frames, cache):
+    image = QImage(150, 150, QImage.Format.Format_ARGB32_Premultiplied)
+    wall = cpu = 0.0
+    worst = 0.0
+    for hover, arm, leg in animation(frames):
+        image.fill(Qt.GlobalColor.transparent)
+        started, started_cpu = time.perf_counter(), time.process_time()
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if cache:
+            cache.draw(painter, 75, 75 + hover, arm, leg)
+        else:
+            painter.translate(75, 75 + hover)
+            paint_robot(painter, arm, leg)
+        painter.end()
+        elapsed = time.perf_counter() - started
+        wall += elapsed
+        cpu += time.process_time() - started_cpu
+        worst = max(worst, elapsed)
+    result = {"frame_ms": wall / frames * 1000, "cpu_ms": cpu / frames * 1000, "worst_ms": worst * 1000}
+    if cache:
+        result.update(cache.stats())
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    results = {"vector": measure(args.frames, None), "cached": measure(args.frames, RobotFrames())}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name:>7}: {r['frame_ms']:.3f} ms/frame, {r['cpu_ms']:.3f} ms CPU/frame, worst {r['worst_ms']:.3f} ms")
+    cached = results["cached"]
+    print(f"cache: {cached['frames']} frames rendered, {cached['hits']} hits, {cached['misses']} misses")
+    del app
+
+if __name__ == "__main__":
+    main()
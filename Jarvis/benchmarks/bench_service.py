@@ -0,0 +1,179 @@
+"""Latency and throughput of the headless service under concurrent clients, against the Mistral stub.
+
+Starts benchmarks/mistral_stub.py in this process and jarvis_service.py in a subprocess
+pointed at it (with a throwaway data directory), then runs --requests questions at each
+--concurrency level. Every client keeps one connection and one session and asks streamed
+questions back to back, so follow-up context is exercised too. Reports time to the first
+streamed event and to the final answer (p50/p99), answers per second, and 503 rejections.
+Questions are distinct so none are served from the answer cache.
+
+Usage: python benchmarks/bench_service.py [--requests 200] [--concurrency 1,8,32] [--websocket]
+                                          [--first-token 0.2] [--token-delay 0.01] [--json]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+JARVIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, JARVIS_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jarvis_service import encode_frame, read_message
+from mistral_stub import StubConfig, start_stub
+from tracing import percentile
+
+def start_service(endpoint, data_dir):
+    env = dict(os.environ, MISTRAL_ENDPOINT=endpoint, MISTRAL_API_KEY="stub", JARVIS_DATA_DIR=data_dir,
+               JARVIS_SERVICE_SPEECH="0", PYTHONUNBUFFERED="1")
+    process = subprocess.Popen([sys.executable, os.path.join(JARVIS_DIR, "jarvis_service.py"), "--port", "0"],
+                               cwd=JARVIS_DIR, env=env, stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if "listening on" in line:
+            return process, int(line.rsplit(":", 1)[1])
+    raise RuntimeError("The service exited before it was listening")
+
+async def read_head(reader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = {}
+    for line in head[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return int(head[0].split(" ")[1]), headers
+
+async def ask_http(connection, question, session):
+    reader, writer = connection
+    body = json.dumps({"question": question, "session": session, "stream": True}).encode("utf-8")
+    writer.write(f"POST /v1/ask HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    started = time.perf_counter()
+    status, headers = await read_head(reader)
+    if headers.get("transfer-encoding") != "chunked":
+        await reader.readexactly(int(headers.get("content-length", 0)))
+        return status, None, None
+    first = None
+    while True:
+        size = int(await reader.readuntil(b"\r\n"), 16)
+        data = await reader.readexactly(size + 2)
+        if not size:
+            break
+        if first is None:
+            first = time.perf_counter() - started
+    return status, first, time.perf_counter() - started
+
+async def open_websocket(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(f"GET /v1/ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status, _ = await read_head(reader)
+    if status != 101:
+        raise RuntimeError(f"WebSocket upgrade failed with {status}")
+    return reader, writer
+
+async def ask_websocket(connection, question, session):
+    reader, writer = connection
+    writer.write(encode_frame(0x1, json.dumps({"question": question, "session": session}).encode("utf-8"), mask=True))
+    await writer.drain()
+    started = time.perf_counter()
+    first = None
+    while True:
+        event = json.loads(await read_message(reader, writer))
+        if event["type"] == "busy":
+            return 503, None, None
+        if first is None:
+            first = time.perf_counter() - started
+        if event["type"] == "answer":
+            return 200, first, time.perf_counter() - started
+
+async def run_level(host, port, requests, concurrency, websocket, level):
+    counter = iter(range(requests))
+    firsts, totals, statuses = [], [], []
+
+    async def client(number):
+        if websocket:
+            connection = await open_websocket(host, port)
+        else:
+            connection = await asyncio.open_connection(host, port)
+        ask = ask_websocket if websocket else ask_http
+        session = f"bench-{level}-{number}"
+        try:
+            for i in counter:
+                status, first, total = await ask(connection, f"Tell me one fact about topic number {level}-{i}?", session)
+                statuses.append(status)
+                if status == 200:
+                    firsts.append(first * 1000)
+                    totals.append(total * 1000)
+                else:
+                    await asyncio.sleep(0.05)  # Turned away: back off a little
+        finally:
+            connection[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(statuses),
+        "answered": len(totals),
+        "rejected": sum(status == 503 for status in statuses),
+        "throughput_rps": len(totals) / elapsed,
+        "first_event_p50_ms": percentile(firsts, 0.5),
+        "first_event_p99_ms": percentile(firsts, 0.99),
+        "answer_p50_ms": percentile(totals, 0.5),
+        "answer_p99_ms": percentile(totals, 0.99),
+    }
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /v1/stats HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    await writer.drain()
+    _, headers = await read_head(reader)
+    stats = json.loads(await reader.readexactly(int(headers["content-length"])))
+    writer.close()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="questions per concurrency level")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated numbers of concurrent clients")
+    parser.add_argument("--websocket", action="store_true", help="ask over WebSockets instead of streamed HTTP")
+    parser.add_argument("--first-token", type=float, default=0.2, help="stub seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="stub seconds between tokens")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    stub, endpoint = start_stub(StubConfig(first_token=args.first_token, token_delay=args.token_delay))
+    process, port = start_service(endpoint, tempfile.mkdtemp(prefix="jarvis-service-"))
+    try:
+        levels = [asyncio.run(run_level("127.0.0.1", port, args.requests, int(level), args.websocket, level))
+                  for level in args.concurrency.split(",")]
+        stats = asyncio.run(fetch_stats("127.0.0.1", port))
+    finally:
+        process.terminate()
+        process.wait()
+        stub.shutdown()
+
+    results = {"transport": "websocket" if args.websocket else "http", "first_token_s": args.first_token,
+               "token_delay_s": args.token_delay, "levels": levels,
+               "service": {key: stats[key] for key in ("answered", "rejected", "p50_ms", "p99_ms", "sessions")}}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['transport']} against the stub (first token {args.first_token * 1000:.0f} ms, "
+          f"{args.token_delay * 1000:.0f} ms per token)")
+    for level in levels:
+        print(f"  {level['concurrency']:>3} clients: {level['answered']}/{level['requests']} answered, "
+              f"{level['rejected']} rejected, {level['throughput_rps']:6.1f} answers/s, "
+              f"first event p50 {level['first_event_p50_ms']:.0f} ms p99 {level['first_event_p99_ms']:.0f} ms, "
+              f"answer p50 {level['answer_p50_ms']:.0f} ms p99 {level['answer_p99_ms']:.0f} ms")
+
+if __name__ == "__main__":
+    main()
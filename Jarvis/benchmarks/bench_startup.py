@@ -0,0 +1,111 @@
+"""Time to first paint and time to ready, with subsystems loaded behind the window and up front.
+
+Starts Jarvis in a fresh process (offscreen unless QT_QPA_PLATFORM says otherwise) --runs
+times and reads the startup profile: when imports finished, when the window first painted,
+and when speech recognition, the voice, translation and the AI client finished loading.
+The eager run imports and builds everything before creating the window, as startup used to.
+Times are from the launch of the process, so they include starting the interpreter. Without a
+microphone, speech recognition shows up as failed once opening it gives up.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--wait 15] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+JARVIS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = ("mistralai.client", "mistralai.models.chat_completion", "speech_recognition", "requests", "wake_word")
+
+def child(eager, wait, launched):
+    sys.path.insert(0, JARVIS_DIR)
+    import ai_assistant
+    if eager:
+        for name in EAGER_IMPORTS:
+            __import__(name)
+        ai_assistant.pipeline.client.load()
+        ai_assistant.pipeline.translator.load()
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    startup = ai_assistant.startup
+    offset = (startup.started - time.perf_counter()) * 1000 + (time.time() - launched) * 1000
+    app = QApplication([])
+    window = ai_assistant.JarvisUI()
+    window.show()
+    deadline = time.perf_counter() + wait
+
+    def check():
+        subsystems = startup.report()["subsystems"]
+        settled = "speech" in subsystems and not startup.pending()
+        if settled or time.perf_counter() > deadline:
+            app.quit()
+    poll = QTimer()
+    poll.timeout.connect(check)
+    poll.start(10)
+    app.exec()
+    report = startup.report()
+    report["offset_ms"] = offset  # Interpreter start until the profiler's clock started
+    print("STARTUP " + json.dumps(report))
+    os._exit(0)  # Don't wait for the microphone retry loop
+
+def run(eager, wait):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.getenv("QT_QPA_PLATFORM", "offscreen"))
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--wait", str(wait), "--launched", repr(time.time())]
+    if eager:
+        command.append("--eager")
+    output = subprocess.run(command, env=env, cwd=JARVIS_DIR, capture_output=True, text=True, timeout=wait + 60).stdout
+    line = next((line for line in output.splitlines() if line.startswith("STARTUP ")), None)
+    if line is None:
+        raise RuntimeError("Jarvis did not report its startup:\n" + output[-2000:])
+    report = json.loads(line[len("STARTUP "):])
+    offset = report["offset_ms"]
+    result = {name: ms + offset for name, ms in report["marks"].items()}
+    for name, stage in report["subsystems"].items():
+        result[name] = stage["ready_ms"] + offset if stage["ready_ms"] is not None else None
+        result[name + "_state"] = stage["state"]
+    ready = [result[name] for name in report["subsystems"] if result[name] is not None]
+    result["ready"] = max(ready) if ready else None
+    return result
+
+def median(values):
+    values = sorted(value for value in values if value is not None)
+    return values[len(values) // 2] if values else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--wait", type=float, default=15.0, help="seconds to wait for every subsystem")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--launched", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.eager, args.wait, args.launched)
+        return
+
+    results = {}
+    for name, eager in (("staged", False), ("eager", True)):
+        runs = [run(eager, args.wait) for _ in range(args.runs)]
+        keys = [key for key in runs[0] if not key.endswith("_state")]
+        results[name] = {key: median(r.get(key) for r in runs) for key in keys}
+        results[name]["states"] = {key[:-len("_state")]: runs[-1][key] for key in runs[0] if key.endswith("_state")}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Median of {args.runs} launches, ms from process start")
+    for name, result in results.items():
+        subsystems = ", ".join(
+            f"{key} {result[key]:.0f}" + ("" if state == "ready" else f" ({state})")
+            for key, state in result["states"].items() if result[key] is not None
+        )
+        print(f"  {name:>6}: imports {result['imports']:.0f}, first paint {result['first_paint']:.0f}, "
+              f"ready {result['ready']:.0f}  [{subsystems}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Thread count and firing accuracy with thousands of timers.
+
+Schedules --timers timers spread over --spread seconds, first with TimerService and then with
+one threading.Timer per timer (what set_timer used to do), and reports the peak number of
+threads, the time to schedule them all and how late they fired. TimerService also persists
+every timer to an SQLite file, and is restarted once to check that pending timers come back.
+
+Usage: python benchmarks/bench_timers.py [--timers 10000] [--legacy-timers 10000] [--spread 3] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from timer_service import TimerService
+
+class Recorder:
+    def __init__(self, expected):
+        self.lock = threading.Lock()
+        self.lateness = []
+        self.expected = expected
+        self.done = threading.Event()
+
+    def fired(self, due):
+        lateness = time.time() - due
+        with self.lock:
+            self.lateness.append(lateness)
+            if len(self.lateness) == self.expected:
+                self.done.set()
+
+    def summary(self):
+        values = sorted(self.lateness)
+        if not values:
+            return {"fired": 0}
+        return {
+            "fired": len(values),
+            "p50_late_ms": values[len(values) // 2] * 1000,
+            "p99_late_ms": values[int(len(values) * 0.99)] * 1000,
+            "max_late_ms": values[-1] * 1000,
+        }
+
+def watch_threads(stop, peak):
+    while not stop.is_set():
+        peak[0] = max(peak[0], threading.active_count())
+        time.sleep(0.01)
+
+def run(schedule, count, spread):
+    recorder = Recorder(count)
+    stop, peak = threading.Event(), [threading.active_count()]
+    watcher = threading.Thread(target=watch_threads, args=(stop, peak), daemon=True)
+    watcher.start()
+    baseline = threading.active_count()
+    started = time.perf_counter()
+    schedule(recorder, count, spread)
+    schedule_ms = (time.perf_counter() - started) * 1000
+    recorder.done.wait(spread + 30)
+    stop.set()
+    watcher.join()
+    return dict(recorder.summary(), baseline_threads=baseline, peak_threads=peak[0], schedule_ms=schedule_ms)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--legacy-timers", type=int, default=10000, help="0 skips the threading.Timer run")
+    parser.add_argument("--spread", type=float, default=3.0, help="timers are due over this many seconds")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="jarvis-timers-"), "timers.db")
+    services = []
+
+    def schedule_service(recorder, count, spread):
+        service = TimerService(path, on_fire=lambda timer: recorder.fired(timer.due))
+        services.append(service)
+        service.start()
+        for i in range(count):
+            service.add(0.5 + spread * i / count, label=f"timer {i}")
+
+    def schedule_threads(recorder, count, spread):
+        for i in range(count):
+            due = time.time() + 0.5 + spread * i / count
+            threading.Timer(due - time.time(), recorder.fired, args=(due,)).start()
+
+    results = {"timers": args.timers, "spread_s": args.spread}
+    results["service"] = run(schedule_service, args.timers, args.spread)
+    services[0].stop()
+
+    # Persistence: schedule some far-off timers, restart, and count what comes back
+    service = TimerService(path)
+    for i in range(100):
+        service.add(3600 + i, label=f"later {i}")
+    service.cancel(service.list()[0].id)
+    restarted = TimerService(path)
+    results["restored_after_restart"] = len(restarted.list())
+
+    if args.legacy_timers:
+        try:
+            results["threading_timer"] = run(schedule_threads, args.legacy_timers, args.spread)
+        except RuntimeError as e:  # can't start new thread
+            results["threading_timer"] = {"error": str(e)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.timers} timers due over {args.spread:.0f} s")
+    for name in ("service", "threading_timer"):
+        r = results.get(name)
+        if not r:
+            continue
+        if "error" in r:
+            print(f"  {name:>15}: failed: {r['error']}")
+            continue
+        print(f"  {name:>15}: threads {r['baseline_threads']} -> peak {r['peak_threads']}, "
+              f"scheduled in {r['schedule_ms']:.0f} ms, fired {r['fired']}, "
+              f"late p50 {r['p50_late_ms']:.1f} ms, p99 {r['p99_late_ms']:.1f} ms")
+    print(f"  {results['restored_after_restart']} of 99 pending timers restored after a restart")
+
+if __name__ == "__main__":
+    main()
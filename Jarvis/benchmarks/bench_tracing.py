@@ -0,0 +1,99 @@
+"""Cost of tracing a question, compared with how long answering one takes.
+
+Replays --traces traces with the spans a spoken question produces (listen, recognize, queue,
+translate, ai_first_token, ai, answer, and speech_wait/speak for three sentences) through
+a Tracer with tracing off, on, and on while appending to a JSON-lines file, and times
+summary() over full histograms. Then answers --questions distinct questions through the real
+pipeline against the Mistral stub, traced, to relate the cost per trace to a request.
+
+Usage: python benchmarks/bench_tracing.py [--traces 20000] [--questions 30] [--first-token 0.2] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tracing import Tracer
+from mistral_stub import StubConfig, start_stub
+
+def replay(tracer, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        trace = tracer.start("voice")
+        with trace.span("listen"):
+            pass
+        with trace.span("recognize"):
+            pass
+        for stage in ("queue", "translate", "ai_first_token", "ai", "answer"):
+            trace.add(stage, 1.0)
+        for _ in range(3):
+            trace.hold()
+        for _ in range(3):
+            trace.add("speech_wait", 1.0)
+            with trace.span("speak"):
+                pass
+            trace.release()
+        trace.finish(category="general")
+    return (time.perf_counter() - started) / count * 1e6
+
+def answer_questions(count, first_token):
+    stub, endpoint = start_stub(StubConfig(first_token=first_token, token_delay=0.01))
+    os.environ.update(MISTRAL_ENDPOINT=endpoint, MISTRAL_API_KEY="stub", JARVIS_LOCAL_FACTS="0")
+    from answer_pipeline import create_pipeline
+    from request_scheduler import Request
+    pipeline = create_pipeline(tempfile.mkdtemp(prefix="jarvis-tracing-"))
+    tracer = Tracer()
+    totals = []
+    for i in range(count):
+        request = Request(i, f"Tell me one fact about topic number {i}?", "typed", lambda *args: None,
+                          trace=tracer.start("typed"))
+        started = time.perf_counter()
+        pipeline.answer_request(request)
+        request.trace.finish()
+        totals.append((time.perf_counter() - started) * 1000)
+    stub.shutdown()
+    return sorted(totals)[len(totals) // 2], tracer.summary()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=20000)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--first-token", type=float, default=0.2, help="stub seconds before the first token")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {"traces": args.traces}
+    results["off_us"] = replay(Tracer(enabled=False), args.traces)
+    tracer = Tracer()
+    results["on_us"] = replay(tracer, args.traces)
+    started = time.perf_counter()
+    stages = tracer.summary()
+    results["summary_ms"] = (time.perf_counter() - started) * 1000
+    results["summary_stages"] = len(stages)
+    path = os.path.join(tempfile.mkdtemp(prefix="jarvis-traces-"), "traces.jsonl")
+    file_tracer = Tracer(path=path)
+    results["on_with_file_us"] = replay(file_tracer, args.traces)
+    file_tracer.close()
+    results["file_bytes_per_trace"] = os.path.getsize(path) / args.traces
+
+    median_ms, pipeline_stages = answer_questions(args.questions, args.first_token)
+    results["request_p50_ms"] = median_ms
+    results["overhead_percent"] = results["on_with_file_us"] / 1000 / median_ms * 100
+    results["pipeline_stages"] = {stage: round(stats["p50_ms"], 2) for stage, stats in pipeline_stages.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Per trace (13 spans, 3 sentences): off {results['off_us']:.1f} us, on {results['on_us']:.1f} us, "
+          f"on with JSON-lines export {results['on_with_file_us']:.1f} us ({results['file_bytes_per_trace']:.0f} bytes)")
+    print(f"summary() over {results['summary_stages']} stages of full histograms: {results['summary_ms']:.2f} ms")
+    print(f"Answering a question through the pipeline against the stub: p50 {median_ms:.0f} ms; "
+          f"tracing adds {results['overhead_percent']:.4f}%")
+    print("  stage p50 ms: " + ", ".join(f"{stage} {ms}" for stage, ms in results["pipeline_stages"].items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Append latency and memory of the chat transcript.
+
+Appends messages to a visible TranscriptView (offscreen) and lets Qt lay out and paint after
+every `--batch` appends, the way messages arrive in a session. RSS is sampled as it grows.
+`--legacy` runs the same load against the old QTextBrowser HTML transcript for comparison
+(use a smaller count, it gets slow).
+
+Usage: python benchmarks/bench_transcript.py [--messages 100000] [--window 200] [--legacy 2000] [--json]
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtWidgets import QApplication, QTextBrowser
+from transcript import TranscriptView, TranscriptArchive, USER, JARVIS
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        # Peak rather than current, but all we have off Linux (kilobytes on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+def message(i):
+    if i % 2 == 0:
+        return f"👤 You: What is the population of country number {i}?", USER
+    return f"🤖 Jarvis: Country number {i} has about {i * 37 % 100000} thousand people. " * (1 + i % 3), JARVIS
+
+def legacy_html(text, is_user):
+    # The per-message HTML block the QTextBrowser transcript appended
+    align = "right" if is_user else "left"
+    return f"""
+        <div style='margin: 15px 0;'>
+            <div style='text-align: {align};'>
+                <span style='padding: 12px 20px; border-radius: 20px; display: inline-block; max-width: 85%;'>
+                    {text}
+                </span>
+                <br>
+                <span style='color: #888888; font-size: 0.8em; margin-top: 5px; display: inline-block;'>12:00</span>
+            </div>
+        </div>
+    """
+
+def run(app, count, batch, append, samples=10):
+    latencies = []
+    rss = []
+    started = time.perf_counter()
+    for i in range(count):
+        text, kind = message(i)
+        t = time.perf_counter()
+        append(text, kind)
+        if (i + 1) % batch == 0:
+            app.processEvents()
+        latencies.append(time.perf_counter() - t)
+        if (i + 1) % max(1, count // samples) == 0:
+            rss.append({"messages": i + 1, "rss_mb": round(rss_mb(), 1)})
+    total = time.perf_counter() - started
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        "messages": count,
+        "total_s": total,
+        "append_p50_ms": pick(0.50),
+        "append_p99_ms": pick(0.99),
+        "append_max_ms": latencies[-1] * 1000,
+        "rss": rss,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--window", type=int, default=200, help="messages kept in the view")
+    parser.add_argument("--batch", type=int, default=1, help="appends between event loop runs")
+    parser.add_argument("--legacy", type=int, default=0, help="also run the QTextBrowser transcript with this many messages")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {}
+
+    view = TranscriptView(archive=TranscriptArchive(tempfile.mkdtemp(prefix="jarvis-bench-")), max_rows=args.window)
+    view.resize(900, 600)
+    view.show()
+    results["transcript_view"] = run(app, args.messages, args.batch, view.add)
+    view.close()
+
+    if args.legacy:
+        browser = QTextBrowser()
+        browser.resize(900, 600)
+        browser.show()
+
+        def append(text, kind):
+            browser.append(legacy_html(text, kind == USER))
+            browser.verticalScrollBar().setValue(browser.verticalScrollBar().maximum())
+        results["legacy_text_browser"] = run(app, args.legacy, args.batch, append)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name}: {r['messages']} messages in {r['total_s']:.1f}s, append p50 {r['append_p50_ms']:.3f} ms, "
+              f"p99 {r['append_p99_ms']:.3f} ms, max {r['append_max_ms']:.1f} ms")
+        print("  RSS: " + ", ".join(f"{s['messages']}: {s['rss_mb']} MB" for s in r["rss"]))
+
+if __name__ == "__main__":
+    main()
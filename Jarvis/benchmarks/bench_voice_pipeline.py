@@ -0,0 +1,170 @@
+"""End-to-end latency of a spoken question, offline: WAV microphone -> Google STT -> translation -> Mistral.
+
+Replays utterances through WavMicrophone into AudioCapture and cuts each question out with
+SegmentReader.next_segment, as conversation_mode does, then sends it to the Google speech
+and translate stand-ins (benchmarks/google_stubs.py) and the
+Mistral stand-in (benchmarks/mistral_stub.py), and answers them with the real pipeline from
+answer_pipeline.create_pipeline. Some questions are not English, so translation is on the
+path. Every question is traced from the start of its speech, as in Jarvis; the report has
+each stage's p50/p95 and the time from the end of speech to the first sentence (when
+speaking would start) and to the whole answer.
+Speech output is not part of the run: pyttsx3 needs a sound device.
+
+Utterances are synthetic (noise bursts shaped like speech) unless --fixtures names a
+directory of <name>.wav + <name>.txt recordings.
+
+Usage: python benchmarks/bench_voice_pipeline.py [--utterances 10] [--fixtures DIR] [--speed 1.0]
+                                                 [--stt-latency 0.3] [--translate-latency 0.1]
+                                                 [--first-token 0.3] [--error-rate 0.0] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import speech_recognition as sr
+from audio_capture import AudioCapture
+from fake_microphone import WavMicrophone, load_fixtures, synthetic_utterances
+from google_stubs import GoogleStubs, ServiceConfig, start_stubs
+from mistral_stub import StubConfig, start_stub
+from tracing import Tracer, percentile
+
+QUESTIONS = [
+    "what is the tallest mountain on earth",
+    "cuál es el río más largo del mundo",
+    "how many moons does jupiter have",
+    "who painted the mona lisa",
+    "quelle est la capitale de l'australie",
+    "why is the sky blue",
+    "how does a rainbow form",
+    "wie hoch ist der eiffelturm",
+    "what causes earthquakes",
+    "who invented the telephone",
+]
+
+PHRASES = {
+    "cuál es el río más largo del mundo": "what is the longest river in the world",
+    "quelle est la capitale de l'australie": "what is the capital of australia",
+    "wie hoch ist der eiffelturm": "how tall is the eiffel tower",
+}
+
+def run(fixtures, speed, stt, pipeline, tracer):
+    from request_scheduler import Request
+
+    first_sentence, answered, failures = [], [], {"unrecognized": 0, "stt_errors": 0, "answer_errors": 0}
+    microphone = WavMicrophone([path for path, _ in fixtures], speed=speed)
+    # The ring buffer holds the whole replay, so nothing is overwritten while an answer is awaited
+    seconds = len(microphone.frames) / microphone.SAMPLE_WIDTH / microphone.SAMPLE_RATE + 1
+    capture = AudioCapture(lambda: microphone, seconds=max(30.0, seconds))
+    reader = capture.reader()
+    capture.start()
+    for index in range(len(fixtures)):
+        segment = reader.next_segment(max_length=5)  # conversation_mode's settings
+        if segment is None:
+            break
+        trace = tracer.start("voice", started=reader.heard_at)
+        trace.add("listen", (time.perf_counter() - reader.heard_at) * 1000, start_ms=0)
+        try:
+            with trace.span("recognize"):
+                question = stt.recognize(segment.audio()).lower()
+        except sr.UnknownValueError:
+            failures["unrecognized"] += 1
+            trace.finish(error=True)
+            continue
+        except sr.RequestError:
+            failures["stt_errors"] += 1
+            trace.finish(error=True)
+            continue
+
+        sentences = []
+        request = Request(index, question, "voice", lambda kind, request_id, payload:
+                          sentences.append(time.perf_counter()) if kind == "sentence" else None, trace=trace)
+        pipeline.answer_request(request)
+        done = time.perf_counter()
+        trace.finish(intent="question")
+        failures["answer_errors"] += request.details.get("error", False)
+        if speed:
+            spoken = microphone.speech_ended(index)
+            answered.append((done - spoken) * 1000)
+            if sentences:
+                first_sentence.append((sentences[0] - spoken) * 1000)
+    capture.stop()
+    return first_sentence, answered, failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=10)
+    parser.add_argument("--fixtures", help="directory of <name>.wav + <name>.txt recordings to replay instead")
+    parser.add_argument("--speed", type=float, default=1.0, help="microphone speed, 1.0 is real time")
+    parser.add_argument("--stt-latency", type=float, default=0.3, help="seconds per speech recognition request")
+    parser.add_argument("--translate-latency", type=float, default=0.1, help="seconds per translation request")
+    parser.add_argument("--first-token", type=float, default=0.3, help="Mistral stub seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Mistral stub seconds between tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of failing requests, every service")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="jarvis-voice-")
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)[:args.utterances]
+    else:
+        transcripts = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.utterances)]
+        fixtures = synthetic_utterances(os.path.join(work_dir, "audio"), transcripts)
+
+    stubs = GoogleStubs(ServiceConfig(args.stt_latency, error_rate=args.error_rate, seed=1),
+                        ServiceConfig(args.translate_latency, error_rate=args.error_rate, seed=2),
+                        script=[text for _, text in fixtures], phrases=PHRASES)
+    google, speech_endpoint, translate_endpoint = start_stubs(stubs)
+    mistral, mistral_endpoint = start_stub(StubConfig(first_token=args.first_token, token_delay=args.token_delay,
+                                                      error_rate=args.error_rate, seed=3))
+    os.environ.update(MISTRAL_ENDPOINT=mistral_endpoint, MISTRAL_API_KEY="stub",
+                      JARVIS_TRANSLATE_ENDPOINT=translate_endpoint, JARVIS_LOCAL_FACTS="0")
+    from answer_pipeline import create_pipeline
+    from stt_backends import create_chain
+    pipeline = create_pipeline(os.path.join(work_dir, "data"))
+    pipeline.load()
+    stt = create_chain("google", google_endpoint=speech_endpoint)
+    tracer = Tracer()
+
+    started = time.perf_counter()
+    first_sentence, answered, failures = run(fixtures, args.speed, stt, pipeline, tracer)
+    elapsed = time.perf_counter() - started
+    google.shutdown()
+    mistral.shutdown()
+
+    results = {
+        "utterances": len(fixtures),
+        "answered": len(answered) if args.speed else sum(1 for trace in tracer.recent(len(fixtures))
+                                                       if not trace.attrs.get("error")),
+        "speed": args.speed,
+        "elapsed_s": elapsed,
+        "speech_end_to_first_sentence_p50_ms": percentile(first_sentence, 0.5),
+        "speech_end_to_first_sentence_p95_ms": percentile(first_sentence, 0.95),
+        "speech_end_to_answer_p50_ms": percentile(answered, 0.5),
+        "speech_end_to_answer_p95_ms": percentile(answered, 0.95),
+        "failures": failures,
+        "stubs": stubs.stats(),
+        "stages": {stage: {"p50_ms": stats["p50_ms"], "p95_ms": stats["p95_ms"], "count": stats["count"]}
+                   for stage, stats in tracer.summary().items()},
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['utterances']} utterances at {args.speed}x, {results['answered']} answered in {elapsed:.1f} s "
+          f"(STT {args.stt_latency * 1000:.0f} ms, translate {args.translate_latency * 1000:.0f} ms, "
+          f"first token {args.first_token * 1000:.0f} ms, error rate {args.error_rate:.0%})")
+    if first_sentence:
+        print(f"  end of speech -> first sentence: p50 {results['speech_end_to_first_sentence_p50_ms']:.0f} ms, "
+              f"p95 {results['speech_end_to_first_sentence_p95_ms']:.0f} ms")
+        print(f"  end of speech -> whole answer:   p50 {results['speech_end_to_answer_p50_ms']:.0f} ms, "
+              f"p95 {results['speech_end_to_answer_p95_ms']:.0f} ms")
+    print("  failures: " + ", ".join(f"{kind} {count}" for kind, count in failures.items()))
+    for stage, stats in results["stages"].items():
+        print(f"  {stage:<16} p50 {stats['p50_ms']:7.1f} ms  p95 {stats['p95_ms']:7.1f} ms  ({stats['count']})")
+
+if __name__ == "__main__":
+    main()
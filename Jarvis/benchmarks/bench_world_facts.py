@@ -0,0 +1,140 @@
+"""Local hit rate and lookup time of the bundled country fact table.
+
+Routes a question set through IntentRouter and WorldFacts the way stream_answer does and
+reports how many capital/area/population questions are answered without calling Mistral.
+The default set asks about every country by name, alias and misspelling, plus questions the
+table can't answer (cities, regions, follow-ups, nested questions). With --history the
+questions recorded in a history.db are replayed instead. Any of the questions the table can't
+answer that still gets a local answer is listed as a local answer error.
+
+Usage: python benchmarks/bench_world_facts.py [--history ~/.jarvis/history.db] [--iterations 20000] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from intent_router import IntentRouter
+from world_facts import WorldFacts, BUNDLED_CSV, read_csv, compile_facts
+
+TEMPLATES = [
+    "what is the capital of {}",
+    "how big is {}",
+    "what is the population of {}",
+    "how many people live in {}?",
+    "what is the area of {} in square kilometers",
+]
+# Fact questions the table should leave to the LLM
+UNRESOLVED = [
+    "what is the population of tokyo", "what is the population of mexico city", "how big is texas",
+    "what is the area of the sahara", "what is the capital of bavaria", "population of europe",
+    "and its population?", "how big is it", "what is the capital of california",
+    "what is the population of the world", "how large is lake victoria", "what is the capital of scotland",
+    # Nested: the place is itself a fact, so "The capital of Japan is Tokyo." would be wrong
+    "what is the population of the capital of japan", "how many people live in the capital of spain",
+]
+
+def misspell(name, rng):
+    if len(name) < 6:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1:]
+
+def synthetic_questions(seed=1):
+    rng = random.Random(seed)
+    questions = []
+    for name, _, _, _, aliases in read_csv(BUNDLED_CSV):
+        for template in TEMPLATES:
+            questions.append(template.format(name))
+        for alias in aliases[:2]:
+            questions.append(rng.choice(TEMPLATES).format(alias))
+        questions.append(rng.choice(TEMPLATES).format(misspell(name, rng)))
+    return questions + UNRESOLVED
+
+def history_questions(path):
+    db = sqlite3.connect(path)
+    rows = db.execute("SELECT COALESCE(translated, question) FROM history WHERE category IN ('capital', 'area', 'population')")
+    return [row[0] for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", help="replay the fact questions of a history.db")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="jarvis-facts-")
+    bin_path = os.path.join(directory, "world_facts.bin")
+    started = time.perf_counter()
+    compile_facts(BUNDLED_CSV, bin_path)
+    compile_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    facts = WorldFacts(bin_path)
+    open_ms = (time.perf_counter() - started) * 1000
+
+    router = IntentRouter()
+    questions = history_questions(args.history) if args.history else synthetic_questions()
+    asked = [(question, router.route(question)) for question in questions]
+    asked = [(question, route) for question, route in asked if route.intent in WorldFacts.CATEGORIES]
+    routes = [route for _, route in asked]
+    missed = [question for question, route in asked if facts.answer(route.intent, route.slots.get("place")) is None]
+
+    stats = facts.stats()
+    wrong = []
+    for question in UNRESOLVED:
+        route = router.route(question)
+        answer = facts.answer(route.intent, route.slots.get("place"))
+        if answer is not None:
+            wrong.append(f"{question} -> {answer}")
+
+    # Time hits only, since those replace a Mistral round trip; close spellings take the slow path
+    exact, fuzzy = [], []
+    for route in routes:
+        before = facts.fuzzy_hits
+        if facts.find(route.slots.get("place") or "") is not None:
+            (fuzzy if facts.fuzzy_hits > before else exact).append(route)
+    timings = {}
+    for name, sample in (("exact", exact), ("fuzzy", fuzzy)):
+        if not sample:
+            continue
+        started = time.perf_counter()
+        for i in range(args.iterations):
+            route = sample[i % len(sample)]
+            facts.answer(route.intent, route.slots.get("place"))
+        timings[name] = (time.perf_counter() - started) / args.iterations * 1e6
+    results = {
+        "questions": len(questions),
+        "fact_questions": len(routes),
+        "answered_locally": len(routes) - len(missed),
+        "hit_rate": (len(routes) - len(missed)) / len(routes) if routes else 0.0,
+        "fuzzy_hits": stats["fuzzy_hits"],
+        "answer_us": timings,
+        "compile_ms": compile_ms,
+        "open_ms": open_ms,
+        "table_bytes": os.path.getsize(bin_path),
+        "countries": stats["countries"],
+        "aliases": stats["aliases"],
+        "local_answer_errors": len(wrong),
+        "missed": missed,
+        "wrong": wrong,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['countries']} countries, {results['aliases']} names, {results['table_bytes']} bytes "
+          f"(compiled in {compile_ms:.1f} ms, mapped in {open_ms:.3f} ms)")
+    print(f"{results['answered_locally']} of {results['fact_questions']} fact questions answered locally "
+          f"({results['hit_rate']:.1%}, {results['fuzzy_hits']} by close spelling)")
+    print("Per local answer: " + ", ".join(f"{name} name {us:.1f} us" for name, us in timings.items()))
+    for question in missed:
+        print(f"  left to the LLM: {question}")
+    for question in wrong:
+        print(f"  answered locally, but should have been left to the LLM: {question}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare two benchmark reports from run_suite.py and flag regressions.
+
+Every number in both reports is matched by its path (list entries by their concurrency,
+particle count or name where they have one). Whether lower or higher is better follows
+from the metric's name: times (_ms, _us, _s), sizes, CPU and errors should go down;
+throughput, hit rates, accuracy and answered counts should go up. Other numbers (workload
+sizes, counters) are shown with --all but never judged. Changes beyond --threshold percent
+are reported; values below --ignore-below in both reports are too small to judge.
+
+Exits with status 1 when anything regressed, so it can gate a change.
+
+Usage: python benchmarks/compare_reports.py OLD.json NEW.json [--threshold 10] [--ignore-below 1.0]
+                                            [--all] [--json]
+"""
+import argparse
+import json
+import sys
+
+# Checked in this order against the metric's name; the first match decides
+HIGHER_IS_BETTER = ("_per_s", "rps", "throughput", "hit_rate", "accuracy", "answered", "succeeded", "hits")
+LOWER_IS_BETTER_UNITS = ("_ms", "_us", "_s", "_mb", "bytes", "bytes_per_trace", "ms_p50", "ms_p99", "cpu_percent",
+                         "overhead_percent")  # Suffixes
+LOWER_IS_BETTER = ("error", "failed", "rejected", "misses", "peak_threads", "unrecognized")
+# Lists of results are keyed by the first of these their entries have
+LIST_KEYS = ("name", "concurrency", "particles", "messages", "count")
+
+def flatten(value, path="", metrics=None):
+    """{"service.levels[concurrency=8].answer_p50_ms": 416.7, ...} for every number in `value`"""
+    metrics = {} if metrics is None else metrics
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flatten(item, f"{path}.{key}" if path else key, metrics)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            key = next((f"{name}={item[name]}" for name in LIST_KEYS if isinstance(item, dict) and name in item), index)
+            flatten(item, f"{path}[{key}]", metrics)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        metrics[path] = value
+    return metrics
+
+def direction(path):
+    """1 when higher is better, -1 when lower is better, 0 when the number is not a measure of speed"""
+    parts = path.replace("[", ".").split(".")
+    name = parts[-1]
+    if any(marker in name for marker in HIGHER_IS_BETTER):
+        return 1
+    if name.endswith(LOWER_IS_BETTER_UNITS) or any(marker in name for marker in LOWER_IS_BETTER):
+        return -1
+    if len(parts) > 1 and parts[-2] in ("stages", "pipeline_stages"):
+        return -1  # {stage: milliseconds}
+    return 0
+
+def benchmark_metrics(report, names):
+    metrics = {}
+    for name in names:
+        flatten(report["benchmarks"][name]["results"], name, metrics)
+    return metrics
+
+def compare(old, new, threshold, ignore_below):
+    """(rows, benchmarks only one report measured, numbers only one report has)"""
+    measured = lambda report: {name for name, result in report["benchmarks"].items() if "results" in result}  # noqa: E731
+    common = measured(old) & measured(new)
+    old_metrics, new_metrics = benchmark_metrics(old, common), benchmark_metrics(new, common)
+    rows = []
+    for path in sorted(old_metrics.keys() & new_metrics.keys()):
+        before, after = old_metrics[path], new_metrics[path]
+        better = direction(path)
+        change = (after - before) / abs(before) * 100 if before else (0.0 if after == before else float("inf"))
+        if not better or max(abs(before), abs(after)) < ignore_below or abs(change) <= threshold:
+            verdict = "same" if better else "info"
+        else:
+            verdict = "improved" if change * better > 0 else "regressed"
+        rows.append({"metric": path, "old": before, "new": after, "change_percent": change, "verdict": verdict})
+    return rows, sorted(measured(old) ^ measured(new)), sorted(old_metrics.keys() ^ new_metrics.keys())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change that counts")
+    parser.add_argument("--ignore-below", type=float, default=1.0, help="don't judge values smaller than this")
+    parser.add_argument("--all", action="store_true", help="show unchanged and informational numbers too")
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+    rows, unmatched_benchmarks, unmatched_metrics = compare(old, new, args.threshold, args.ignore_below)
+    regressed = [row for row in rows if row["verdict"] == "regressed"]
+
+    if args.json:
+        print(json.dumps({"old": old["meta"], "new": new["meta"], "metrics": rows,
+                          "unmatched_benchmarks": unmatched_benchmarks, "unmatched_metrics": unmatched_metrics,
+                          "regressions": len(regressed)}, indent=2))
+    else:
+        print(f"{(old['meta'].get('commit') or '?')[:12]} -> {(new['meta'].get('commit') or '?')[:12]}")
+        for key in ("platform", "python", "cpus", "quick"):
+            if old["meta"].get(key) != new["meta"].get(key):
+                print(f"  Warning: {key} differs ({old['meta'].get(key)} vs {new['meta'].get(key)}), "
+                      "so the numbers may not be comparable")
+        for row in rows:
+            if args.all or row["verdict"] in ("improved", "regressed"):
+                print(f"  {row['verdict']:<9} {row['metric']:<60} {row['old']:>12.4g} -> {row['new']:>12.4g} "
+                      f"({row['change_percent']:+.1f}%)")
+        if unmatched_benchmarks:
+            print("  Not in both reports (or failed in one): " + ", ".join(unmatched_benchmarks))
+        if unmatched_metrics:
+            print(f"  {len(unmatched_metrics)} numbers are in only one report, e.g. {unmatched_metrics[0]}")
+        improved = sum(row["verdict"] == "improved" for row in rows)
+        print(f"{len(regressed)} regressed, {improved} improved beyond {args.threshold:g}%, "
+              f"{len(rows)} numbers compared")
+    sys.exit(1 if regressed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Offline evaluation of the local wake-word detector against recorded WAV fixtures.
+
+Fixture layout:
+    <fixtures>/templates/*.wav   recordings of "Jarvis" used as detector templates
+    <fixtures>/positive/*.wav    clips that contain the wake word
+    <fixtures>/negative/*.wav    ambient audio and speech without the wake word
+
+A positive clip may have a sidecar <name>.txt holding the time (seconds) where the
+wake word ends; otherwise the end of the first voiced region is used.
+
+Usage: python benchmarks/eval_wake_word.py <fixtures> [--chunk 1024] [--json]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import percentile
+from wake_word import create_detector, read_wav
+
+def wake_word_end(path, samples, rate, block):
+    marker = os.path.splitext(path)[0] + '.txt'
+    if os.path.exists(marker):
+        with open(marker) as f:
+            return float(f.read().strip())
+    usable = len(samples) - len(samples) % block
+    rms = np.sqrt(np.mean(samples[:usable].astype(np.float64).reshape(-1, block) ** 2, axis=1))
+    voiced = rms >= rms.max() * 0.1
+    start = int(np.argmax(voiced))
+    end = start
+    # First voiced region, bridging gaps shorter than 200 ms
+    gap = 0
+    for i in range(start, len(voiced)):
+        if voiced[i]:
+            end, gap = i, 0
+        else:
+            gap += 1
+            if gap * block / rate > 0.2:
+                break
+    return (end + 1) * block / rate
+
+def run_clip(detector, samples, chunk):
+    """Feed a clip through the detector; returns (detection sample offsets, cpu seconds)"""
+    detector.reset()
+    detections = []
+    started = time.process_time()
+    for offset in range(0, len(samples), chunk):
+        if detector.process(samples[offset:offset + chunk].tobytes()):
+            detections.append(min(offset + chunk, len(samples)))
+    return detections, time.process_time() - started
+
+def evaluate(fixtures, chunk):
+    rate = None
+    clips = {}
+    for kind in ('positive', 'negative'):
+        clips[kind] = []
+        for path in sorted(glob.glob(os.path.join(fixtures, kind, '*.wav'))):
+            samples, clip_rate = read_wav(path)
+            rate = rate or clip_rate
+            if clip_rate != rate:
+                raise ValueError(f"{path}: all fixtures must share one sample rate ({rate} Hz)")
+            clips[kind].append((path, samples))
+    if rate is None:
+        raise ValueError(f"No fixtures found in {fixtures}")
+
+    detector = create_detector(os.path.join(fixtures, 'templates'), rate)
+    if detector is None:
+        raise ValueError(f"No templates found in {os.path.join(fixtures, 'templates')}")
+
+    audio_seconds = 0.0
+    cpu_seconds = 0.0
+    latencies = []
+    missed = []
+    for path, samples in clips['positive']:
+        detections, cpu = run_clip(detector, samples, chunk)
+        audio_seconds += len(samples) / rate
+        cpu_seconds += cpu
+        if detections:
+            end = wake_word_end(path, samples, rate, detector.block)
+            latencies.append(max(0.0, detections[0] / rate - end) * 1000)
+        else:
+            missed.append(os.path.basename(path))
+
+    false_accepts = 0
+    negative_seconds = 0.0
+    accepted = []
+    for path, samples in clips['negative']:
+        detections, cpu = run_clip(detector, samples, chunk)
+        audio_seconds += len(samples) / rate
+        negative_seconds += len(samples) / rate
+        cpu_seconds += cpu
+        if detections:
+            false_accepts += len(detections)
+            accepted.append(os.path.basename(path))
+
+    positives = len(clips['positive'])
+    return {
+        "sample_rate": rate,
+        "templates": len(detector.templates),
+        "threshold": detector.threshold,
+        "positives": positives,
+        "detection_rate": (positives - len(missed)) / positives if positives else None,
+        "missed": missed,
+        "latency_ms_mean": float(np.mean(latencies)) if latencies else None,
+        "latency_ms_p50": percentile(latencies, 0.5),
+        "latency_ms_p95": percentile(latencies, 0.95),
+        "negative_seconds": negative_seconds,
+        "false_accepts": false_accepts,
+        "false_accepts_per_hour": false_accepts * 3600 / negative_seconds if negative_seconds else None,
+        "false_accept_files": accepted,
+        "cpu_seconds_per_audio_second": cpu_seconds / audio_seconds if audio_seconds else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures')
+    parser.add_argument('--chunk', type=int, default=1024, help="samples per microphone read (sr.Microphone uses 1024)")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    report = evaluate(args.fixtures, args.chunk)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key:32} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""A microphone that replays WAV files, for benchmarking the voice path without a sound card.
+
+WavMicrophone is a speech_recognition AudioSource, so Recognizer.listen() and
+adjust_for_ambient_noise() read it exactly as they read sr.Microphone. Reads are paced to
+the recording (faster with `speed`), and the stream ends, which ends listen(), after the
+last file. Files must be 16-bit mono; use write_wav() or synthetic_utterances() to make some.
+
+Real recordings can be replayed from a directory of <name>.wav files, each with a
+<name>.txt holding what is said in it.
+
+Usage: python benchmarks/fake_microphone.py DIR [--count 5]   (writes synthetic utterances to DIR)
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+def synthetic_utterance(seconds, rng, sample_rate=SAMPLE_RATE, lead=0.6, tail=1.2):
+    """Quiet room noise, `seconds` of speech-like noise, then enough quiet for listen() to end.
+
+    The noise comes in 100 ms syllables with 150 ms soft gaps: listen() keeps raising its
+    threshold towards 1.5 times the energy it hears, so steady noise would be cut off early.
+    """
+    quiet = lambda duration: [int(rng.gauss(0, 120)) for _ in range(int(duration * sample_rate))]  # noqa: E731
+    speech = []
+    for i in range(int(seconds * sample_rate)):
+        level = 12000 if (i * 20 // sample_rate) % 5 < 2 else 1500
+        speech.append(max(-32767, min(32767, int(rng.gauss(0, level)))))
+    return quiet(lead) + speech + quiet(tail)
+
+def synthetic_utterances(directory, transcripts, seed=7):
+    """Write one WAV (with its .txt) per transcript, speech about 0.25 s per word"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    for i, text in enumerate(transcripts):
+        samples = synthetic_utterance(min(4.0, 0.6 + 0.25 * len(text.split())), rng)
+        name = os.path.join(directory, f"utterance_{i:03d}")
+        write_wav(name + ".wav", samples)
+        with open(name + ".txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return load_fixtures(directory)
+
+def load_fixtures(directory):
+    """[(wav path, transcript)] for every <name>.wav with a <name>.txt, in name order"""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        base, extension = os.path.splitext(name)
+        transcript = os.path.join(directory, base + ".txt")
+        if extension.lower() == ".wav" and os.path.exists(transcript):
+            with open(transcript, encoding="utf-8") as f:
+                fixtures.append((os.path.join(directory, name), f.read().strip()))
+    return fixtures
+
+class WavStream:
+    def __init__(self, microphone):
+        self.microphone = microphone
+        self.position = 0
+
+    def read(self, size):
+        mic = self.microphone
+        data = mic.frames[self.position * mic.SAMPLE_WIDTH:(self.position + size) * mic.SAMPLE_WIDTH]
+        self.position += len(data) // mic.SAMPLE_WIDTH
+        if mic.speed:
+            # Hand out audio no faster than it would arrive from a real microphone
+            if mic.started is None:
+                mic.started = time.perf_counter()
+            due = mic.started + self.position / mic.SAMPLE_RATE / mic.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self):
+        pass
+
+class WavMicrophone(sr.AudioSource):
+    """Replays `paths` back to back as one stream.
+
+    `speed` 1.0 is real time, 0 is as fast as the reader goes. speech_ended(index) is when
+    the last chunk of a file louder than `speech_level` RMS (conversation_mode's energy
+    threshold) arrived, to measure latency from the end of what was said.
+    """
+
+    def __init__(self, paths, speed=1.0, chunk_size=1024, speech_level=3000):
+        self.SAMPLE_RATE = None
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk_size
+        self.speed = speed
+        self.stream = None
+        self.started = None  # When the stream handed out its first chunk; kept after it is closed
+        chunks, self.speech_ends = [], []
+        offset = 0
+        for path in paths:
+            with wave.open(path, "rb") as wav:
+                if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                    raise ValueError(f"{path}: expected 16-bit mono audio")
+                if self.SAMPLE_RATE not in (None, wav.getframerate()):
+                    raise ValueError(f"{path}: every file must have the same sample rate")
+                self.SAMPLE_RATE = wav.getframerate()
+                chunks.append(wav.readframes(wav.getnframes()))
+            samples = np.frombuffer(chunks[-1], dtype="<i2").astype(np.float64)
+            windows = samples[:len(samples) // chunk_size * chunk_size].reshape(-1, chunk_size)
+            loud = np.flatnonzero(np.sqrt((windows ** 2).mean(axis=1)) > speech_level)
+            self.speech_ends.append(offset + ((loud[-1] + 1) * chunk_size if len(loud) else 0))
+            offset += len(samples)
+        self.frames = b"".join(chunks)
+        self.SAMPLE_RATE = self.SAMPLE_RATE or SAMPLE_RATE
+
+    def __enter__(self):
+        self.stream = WavStream(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+    def speech_ended(self, index):
+        """perf_counter time at which the speech in file `index` had been read out (paced streams only)"""
+        return self.started + self.speech_ends[index] / self.SAMPLE_RATE / self.speed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=5)
+    args = parser.parse_args()
+    transcripts = ["what time is it", "tell me a joke", "what is the capital of france",
+                   "how far away is the moon", "who wrote hamlet"]
+    fixtures = synthetic_utterances(args.directory, (transcripts * args.count)[:args.count])
+    print(f"Wrote {len(fixtures)} utterances to {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Local stand-ins for Google speech recognition and Google Translate, with latency and fault injection.
+
+The speech stub answers the speech-api/v2 "recognize" requests recognize_google() sends,
+with the next line of its script (it does not decode the audio). The translate stub answers
+translate_a/single requests from a phrase table, and otherwise echoes the text marked as
+"[en]". Point Jarvis at them with
+JARVIS_GOOGLE_STT_ENDPOINT=http://127.0.0.1:<port>/speech-api/v2/recognize and
+JARVIS_TRANSLATE_ENDPOINT=http://127.0.0.1:<port>/translate_a/single.
+
+Usage: python benchmarks/google_stubs.py [--port 8766] [--latency 0.15] [--error-rate 0.1]
+                                         [--script transcripts.txt]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+class ServiceConfig:
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def delay_and_roll(self):
+        """Sleep for the configured latency; True when this request should fail"""
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+            self.errors += failed
+        time.sleep(delay)
+        return failed
+
+class GoogleStubs:
+    def __init__(self, speech=None, translate=None, script=(), phrases=None):
+        self.speech = speech or ServiceConfig()
+        self.translate = translate or ServiceConfig()
+        self.script = list(script)
+        self.phrases = dict(phrases or {})
+        self.lock = threading.Lock()
+        self.recognized = 0
+
+    def next_transcript(self):
+        with self.lock:
+            if not self.script:
+                return None
+            text = self.script[self.recognized % len(self.script)]
+            self.recognized += 1
+            return text
+
+    def translation(self, text):
+        return self.phrases.get(text.strip(), f"[en] {text.strip()}")
+
+    def stats(self):
+        return {
+            "speech_requests": self.speech.requests, "speech_errors": self.speech.errors,
+            "translate_requests": self.translate.requests, "translate_errors": self.translate.errors,
+        }
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stubs = GoogleStubs()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="application/json; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))  # FLAC audio, not decoded
+        if urlparse(self.path).path.rstrip("/") != "/speech-api/v2/recognize":
+            self.send_body(404, json.dumps({"error": f"Unknown path {self.path}"}))
+            return
+        text = self.stubs.next_transcript()  # Taken even when failing, so the script stays in step with the audio
+        if self.stubs.speech.delay_and_roll():
+            self.send_body(self.stubs.speech.error_status, json.dumps({"error": "Injected failure"}))
+            return
+        # Like the real API: an empty result first, then the transcript, one JSON object per line
+        lines = ['{"result":[]}']
+        if text:
+            lines.append(json.dumps({"result": [{"alternative": [{"transcript": text, "confidence": 0.92}], "final": True}],
+                                     "result_index": 0}))
+        self.send_body(200, "\n".join(lines) + "\n")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/translate_a/single":
+            self.send_body(404, json.dumps({"error": f"Unknown path {self.path}"}))
+            return
+        if self.stubs.translate.delay_and_roll():
+            self.send_body(self.stubs.translate.error_status, json.dumps({"error": "Injected failure"}))
+            return
+        text = parse_qs(url.query).get("q", [""])[0]
+        # Batched texts are separated by line breaks, and so are their translations
+        translated = "\n".join(self.stubs.translation(line) for line in text.split("\n"))
+        self.send_body(200, json.dumps([[[translated, text, None, None, 1]], None, "auto"]))
+
+def start_stubs(stubs=None, port=0):
+    """Start both stubs on one background server; returns (server, speech endpoint, translate endpoint)"""
+    handler = type("ConfiguredGoogleStubHandler", (StubHandler,), {"stubs": stubs or GoogleStubs()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, base + "/speech-api/v2/recognize", base + "/translate_a/single"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per request, both services")
+    parser.add_argument("--jitter", type=float, default=0.05, help="up to this many seconds more")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--script", help="file with one transcript per line, recognized in turn")
+    args = parser.parse_args()
+
+    script = []
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = [line.strip() for line in f if line.strip()]
+    config = lambda: ServiceConfig(args.latency, args.jitter, args.error_rate, args.error_status)  # noqa: E731
+    server, speech, translate = start_stubs(GoogleStubs(config(), config(), script or ["what time is it"]), args.port)
+    print(f"Speech stub on {speech}\nTranslate stub on {translate}\n(Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
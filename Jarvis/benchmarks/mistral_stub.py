@@ -0,0 +1,145 @@
+"""Local stand-in for the Mistral chat completions API, with latency and fault injection.
+
+Point the client at it with MISTRAL_ENDPOINT=http://127.0.0.1:<port>.
+
+Usage: python benchmarks/mistral_stub.py [--port 8765] [--first-token 0.2] [--token-delay 0.02]
+                                         [--error-rate 0.1] [--error-status 503] [--hang-rate 0.05]
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubConfig:
+    def __init__(self, first_token=0.2, token_delay=0.02, error_rate=0.0, error_status=503,
+                 hang_rate=0.0, hang_time=30.0, answer=None, seed=None):
+        self.first_token = first_token
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang_time = hang_time
+        self.answer = answer
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.hangs = 0
+
+    def roll(self):
+        with self.lock:
+            self.requests += 1
+            value = self.random.random()
+            if value < self.error_rate:
+                self.errors += 1
+                return "error"
+            if value < self.error_rate + self.hang_rate:
+                self.hangs += 1
+                return "hang"
+            return "ok"
+
+def answer_for(config, body):
+    if config.answer:
+        return config.answer
+    question = next((m.get("content", "") for m in reversed(body.get("messages", [])) if m.get("role") == "user"), "")
+    return f"This is a stub answer to: {question[:80]}. It arrives one token at a time."
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StubConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self.send_json(404, {"object": "error", "message": f"Unknown path {self.path}"})
+            return
+
+        outcome = self.config.roll()
+        time.sleep(self.config.first_token)
+        if outcome == "error":
+            self.send_json(self.config.error_status, {"object": "error", "message": "Injected failure"})
+            return
+        if outcome == "hang":
+            time.sleep(self.config.hang_time)
+
+        answer = answer_for(self.config, body)
+        model = body.get("model", "stub")
+        completion_id = uuid.uuid4().hex
+        created = int(time.time())
+        if not body.get("stream"):
+            self.send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": len(answer.split()), "total_tokens": 10 + len(answer.split())},
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = answer.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.config.token_delay)
+            self.send_event({
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": word + (" " if i < len(words) - 1 else "")},
+                             "finish_reason": "stop" if i == len(words) - 1 else None}],
+            })
+        self.send_chunk(b"data: [DONE]\n\n")
+        self.send_chunk(b"")
+
+    def send_event(self, payload):
+        self.send_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+def start_stub(config=None, port=0):
+    """Start the stub on a background thread; returns (server, endpoint URL)"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config or StubConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--first-token", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between tokens")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="share of requests that stall for --hang-time")
+    parser.add_argument("--hang-time", type=float, default=30.0)
+    args = parser.parse_args()
+
+    config = StubConfig(args.first_token, args.token_delay, args.error_rate, args.error_status,
+                        args.hang_rate, args.hang_time)
+    server, endpoint = start_stub(config, args.port)
+    print(f"Mistral stub listening on {endpoint} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
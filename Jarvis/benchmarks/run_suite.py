@@ -0,0 +1,115 @@
+"""Run every benchmark offline and write one machine-readable report.
+
+Each benchmark runs in its own process with --json, Qt offscreen and throwaway data
+directories, so nothing needs a display, a microphone or the network. The report holds the
+commit, Python and platform it was measured on and each benchmark's JSON (or its error).
+Compare two reports with benchmarks/compare_reports.py.
+
+--quick uses smaller workloads (about a minute in all); the full run uses each benchmark's
+own defaults.
+
+Usage: python benchmarks/run_suite.py [--quick] [--only particles,voice_pipeline] [--output report.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name: (script, quick arguments, full arguments)
+BENCHMARKS = {
+    "particles": ("bench_particles.py", ["--counts", "500,2000", "--frames", "60"], []),
+    "robot": ("bench_robot.py", ["--frames", "500"], []),
+    "idle_cpu": ("bench_idle_cpu.py", ["--seconds", "2"], []),
+    "startup": ("bench_startup.py", ["--runs", "1"], []),
+    "intent_router": ("bench_intent_router.py", ["--iterations", "2000"], []),
+    "context": ("bench_context.py", ["--turns", "50"], []),
+    "transcript": ("bench_transcript.py", ["--messages", "10000", "--legacy", "500"], []),
+    "history": ("bench_history.py", ["--rows", "50000"], []),
+    "timers": ("bench_timers.py", ["--timers", "2000", "--legacy-timers", "500"], []),
+    "music_library": ("bench_music_library.py", ["--files", "5000", "--queries", "200"], []),
+    "world_facts": ("bench_world_facts.py", ["--iterations", "2000"], []),
+    "llm_client": ("bench_llm_client.py", ["--requests", "40"], []),
+    "tracing": ("bench_tracing.py", ["--traces", "2000", "--questions", "5"], []),
+    "service": ("bench_service.py", ["--requests", "40", "--concurrency", "1,8"], []),
+    "voice_pipeline": ("bench_voice_pipeline.py", ["--utterances", "4"], []),
+    "audio_capture": ("bench_audio_capture.py", ["--seconds", "30"], []),
+}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(name, script, arguments, timeout):
+    # Benchmarks that talk to Mistral start the stub; the rest only need some key to start up
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONUNBUFFERED="1", MISTRAL_API_KEY="offline",
+               JARVIS_DATA_DIR=tempfile.mkdtemp(prefix=f"jarvis-{name}-"))
+    started = time.perf_counter()
+    try:
+        process = subprocess.run([sys.executable, os.path.join(BENCHMARK_DIR, script), *arguments, "--json"],
+                                 cwd=os.path.dirname(BENCHMARK_DIR), env=env, capture_output=True,
+                                 text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout} s"}
+    elapsed = time.perf_counter() - started
+    if process.returncode:
+        return {"error": f"exit status {process.returncode}", "stderr": process.stderr[-2000:]}
+    try:
+        # Some benchmarks print progress first; the JSON is the last thing on stdout
+        output = process.stdout
+        start = 0 if output.startswith("{") else output.rfind("\n{") + 1
+        return {"seconds": elapsed, "results": json.loads(output[start:])}
+    except ValueError:
+        return {"error": "no JSON on stdout", "stdout": process.stdout[-2000:]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller workloads")
+    parser.add_argument("--only", help="comma-separated benchmark names: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--output", help="report path (default benchmarks/reports/<commit>.json)")
+    parser.add_argument("--timeout", type=float, default=900, help="seconds per benchmark")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: " + ", ".join(unknown))
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "benchmarks": {},
+    }
+    for name in names:
+        script, quick, full = BENCHMARKS[name]
+        print(f"{name}...", end=" ", flush=True)
+        result = run_benchmark(name, script, quick if args.quick else full, args.timeout)
+        report["benchmarks"][name] = result
+        print(f"failed: {result['error']}" if "error" in result else f"{result['seconds']:.1f} s")
+
+    path = args.output or os.path.join(BENCHMARK_DIR, "reports", f"{(commit or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    failed = [name for name, result in report["benchmarks"].items() if "error" in result]
+    print(f"Report written to {path}" + (f" ({len(failed)} failed: {', '.join(failed)})" if failed else ""))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
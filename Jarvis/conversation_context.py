@@ -0,0 +1,121 @@
+import re
+import time
+import threading
+from collections import deque
+
+# Openers and pronouns that only make sense with the previous turns
+FOLLOW_UP = re.compile(
+    r"^\s*(and|also|what about|how about|then|so)\b|\b(it|its|it's|they|them|their|there|that|those|these|he|she|him|her|his)\b",
+    re.IGNORECASE
+)
+
+MESSAGE_OVERHEAD = 4  # role and separators
+
+def estimate_tokens(text):
+    # Rule of thumb for English with Mistral's tokenizer: about four characters per token
+    return (len(text) + 3) // 4 + MESSAGE_OVERHEAD
+
+def first_sentence(text, limit=160):
+    sentence = re.split(r"(?<=[.!?])\s", text.strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= limit else sentence[:limit].rsplit(" ", 1)[0] + "…"
+
+class Turn:
+    def __init__(self, question, answer, created=None):
+        self.question = question
+        self.answer = answer
+        self.created = created or time.time()
+        self.tokens = estimate_tokens(question) + estimate_tokens(answer)
+
+class ConversationContext:
+    """Recent turns sent along with each question, kept under a fixed token budget.
+
+    The system prompt always comes first and unchanged, followed by a summary of older
+    turns, then the recent turns and the new question. When a request would go over `budget`,
+    the oldest turns are folded into the summary (question and first sentence of the
+    answer), and the summary itself is cut from the front. Turns older than `max_age`
+    seconds are forgotten, so a new conversation starts clean.
+    """
+
+    def __init__(self, budget=600, max_turns=6, summary_budget=150, max_age=1800):
+        self.budget = budget
+        self.max_turns = max_turns
+        self.summary_budget = summary_budget
+        self.max_age = max_age
+        self.turns = deque()
+        self.summary = []
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.tokens_sent = 0
+        self.max_tokens = 0
+        self.last_tokens = 0
+
+    def is_follow_up(self, question):
+        with self.lock:
+            self.expire()
+            return bool(self.turns or self.summary) and FOLLOW_UP.search(question) is not None
+
+    def add(self, question, answer, created=None):
+        with self.lock:
+            self.turns.append(Turn(question, answer, created))
+            while len(self.turns) > self.max_turns:
+                self.fold(self.turns.popleft())
+
+    def expire(self):
+        cutoff = time.time() - self.max_age
+        if self.turns and self.turns[-1].created < cutoff:
+            self.turns.clear()
+            self.summary = []
+        while self.turns and self.turns[0].created < cutoff:
+            self.turns.popleft()
+
+    def fold(self, turn):
+        self.summary.append(f"Q: {first_sentence(turn.question)} A: {first_sentence(turn.answer)}")
+        while len(self.summary) > 1 and estimate_tokens(" ".join(self.summary)) > self.summary_budget:
+            self.summary.pop(0)
+
+    def summary_text(self):
+        return "Earlier in this conversation: " + " ".join(self.summary) if self.summary else ""
+
+    def messages(self, system_prompt, user_prompt):
+        """(role, content) pairs for one request, within the budget"""
+        with self.lock:
+            self.expire()
+            fixed = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+            while self.turns:
+                summary = self.summary_text()
+                total = fixed + sum(turn.tokens for turn in self.turns) + (estimate_tokens(summary) if summary else 0)
+                if total <= self.budget:
+                    break
+                self.fold(self.turns.popleft())
+            while self.summary and fixed + estimate_tokens(self.summary_text()) > self.budget:
+                self.summary.pop(0)
+
+            # The summary goes after the system prompt, so the start of every request stays the same
+            messages = [("system", system_prompt + "\n\n" + self.summary_text() if self.summary else system_prompt)]
+            for turn in self.turns:
+                messages.append(("user", turn.question))
+                messages.append(("assistant", turn.answer))
+            messages.append(("user", user_prompt))
+
+            tokens = sum(estimate_tokens(content) for _, content in messages)
+            self.requests += 1
+            self.tokens_sent += tokens
+            self.max_tokens = max(self.max_tokens, tokens)
+            self.last_tokens = tokens
+            return messages
+
+    def clear(self):
+        with self.lock:
+            self.turns.clear()
+            self.summary = []
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "tokens_sent": self.tokens_sent,
+            "mean_tokens": self.tokens_sent / self.requests if self.requests else 0.0,
+            "max_tokens": self.max_tokens,
+            "last_tokens": self.last_tokens,
+            "turns": len(self.turns),
+        }
@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import time
+import queue
+import sqlite3
+import threading
+
+def connect(path):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+def fts_query(text):
+    """Turn typed text into an FTS5 query: every word must match, the last one as a prefix"""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+class HistoryStore:
+    """Append-only conversation log in SQLite with a full-text index.
+
+    record() only queues the entry; a writer thread inserts everything that queued up
+    since its last commit in one transaction, so the GUI and answer threads never wait
+    on the disk. Reads use their own connection, which WAL lets run next to the writer.
+    """
+
+    def __init__(self, path, batch_size=500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.db = connect(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS history (
+                id INTEGER PRIMARY KEY,
+                created REAL NOT NULL,
+                source TEXT NOT NULL,
+                question TEXT NOT NULL,
+                translated TEXT,
+                answer TEXT NOT NULL,
+                category TEXT,
+                timings TEXT
+            )
+        """)
+        try:
+            self.db.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS history_fts
+                USING fts5(question, translated, answer, content='history', content_rowid='id')
+            """)
+            self.db.execute("""
+                CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+                    INSERT INTO history_fts (rowid, question, translated, answer)
+                    VALUES (new.id, new.question, new.translated, new.answer);
+                END
+            """)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: search falls back to a (slow) LIKE scan
+            print(f"Full-text search is not available: {e}")
+            self.fts = False
+        self.db.commit()
+
+        self.queue = queue.Queue()
+        self.written = 0
+        self.batches = 0
+        self.writer = threading.Thread(target=self.write_loop, name="jarvis-history", daemon=True)
+        self.writer.start()
+
+    def record(self, question, answer, source, translated=None, category=None, timings=None):
+        self.queue.put((
+            time.time(), source, question,
+            translated if translated and translated != question else None,
+            answer, category, json.dumps(timings) if timings else None
+        ))
+
+    def write_loop(self):
+        db = connect(self.path)
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                self.queue.task_done()
+                break
+            # Group commit: whatever arrived while the last batch was written goes in together
+            batch = [entry]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT INTO history (created, source, question, translated, answer, category, timings) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", batch
+                    )
+                self.written += len(batch)
+                self.batches += 1
+            except sqlite3.Error as e:
+                print(f"Could not save conversation history: {e}")
+            for _ in range(len(batch) + stop):
+                self.queue.task_done()
+            if stop:
+                break
+        db.close()
+
+    def flush(self):
+        """Block until everything recorded so far is on disk"""
+        self.queue.join()
+
+    def close(self):
+        self.queue.put(None)
+        self.writer.join(timeout=5)
+
+    def rows(self, cursor):
+        columns = [c[0] for c in cursor.description]
+        results = []
+        for row in cursor.fetchall():
+            entry = dict(zip(columns, row))
+            if entry.get("timings"):
+                entry["timings"] = json.loads(entry["timings"])
+            results.append(entry)
+        return results
+
+    def search(self, text, limit=20, order="recent"):
+        """Entries matching all words of `text`, newest first (or best match first with order="relevance")"""
+        query = fts_query(text)
+        if query is None:
+            return []
+        with self.lock:
+            if not self.fts:
+                pattern = f"%{text.strip()}%"
+                cursor = self.db.execute(
+                    "SELECT *, answer AS snippet FROM history WHERE question LIKE ? OR answer LIKE ? "
+                    "ORDER BY id DESC LIMIT ?", (pattern, pattern, limit)
+                )
+                return self.rows(cursor)
+            ranking = "rank" if order == "relevance" else "history_fts.rowid DESC"
+            cursor = self.db.execute(f"""
+                SELECT history.*, snippet(history_fts, -1, '[', ']', '…', 12) AS snippet
+                FROM history_fts JOIN history ON history.id = history_fts.rowid
+                WHERE history_fts MATCH ?
+                ORDER BY {ranking}
+                LIMIT ?
+            """, (query, limit))
+            return self.rows(cursor)
+
+    def recent(self, limit=10):
+        """The last `limit` entries, oldest first"""
+        with self.lock:
+            cursor = self.db.execute("SELECT * FROM history ORDER BY id DESC LIMIT ?", (limit,))
+            return self.rows(cursor)[::-1]
+
+    def count(self):
+        with self.lock:
+            return self.db.execute("SELECT MAX(id) FROM history").fetchone()[0] or 0
+
+    def stats(self):
+        return {"written": self.written, "batches": self.batches, "queued": self.queue.qsize(), "fts": self.fts}
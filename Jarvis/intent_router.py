@@ -0,0 +1,248 @@
+import re
+from datetime import datetime, timedelta
+
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+    "thirty": 30, "forty": 40, "forty-five": 45, "fifty": 50, "sixty": 60, "ninety": 90,
+}
+UNIT_SECONDS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hr": 3600, "hour": 3600}
+
+DURATION = re.compile(
+    r"\b(half an? hour|\d+(?:\.\d+)?|(?:" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")\b)"
+    r"\s*(?:(s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?)\b)?",
+    re.IGNORECASE
+)
+PLACE = re.compile(
+    r"\b(?:in|of|for|at|how (?:big|large) is|about)\s+(?:the\s+)?([^\W\d_](?:[^\W\d_]|[ .'-])*?)\s*"
+    r"(?:[?.!,]|$|\b(?:today|tonight|now|right now|tomorrow|please|is|are|was|in square)\b)",
+    re.IGNORECASE
+)
+# "at 7", "at 7:30 pm", "at noon", "for 6:30" (an alarm), optionally "tomorrow"
+CLOCK = re.compile(
+    r"\b(?:(at|for)\s+(?:(noon|midday|midnight)|(\d{1,2})(?:[:.](\d{2}))?\s*(?:(am|pm|a\.m\.|p\.m\.)|o'?clock)?)\b\.?)",
+    re.IGNORECASE
+)
+TOMORROW = re.compile(r"\btomorrow\b", re.IGNORECASE)
+REMINDER = re.compile(r"\b(?:remind me|set (?:a |an |the )?reminder)\b(.*)", re.IGNORECASE)
+# "in 5 minutes", "for an hour and 30 seconds", "tomorrow": not part of a reminder's text
+WHEN = re.compile(
+    r"\s*\b(?:(?:in|after|for)\s+)?(?:(?:and\s+)?(?:half an? hour|(?:\d+|" + "|".join(NUMBER_WORDS) + r")\s*"
+    r"(?:seconds?|secs?|minutes?|mins?|hours?|hrs?)))+\b|\s*\b(?:tomorrow|tonight)\b",
+    re.IGNORECASE
+)
+
+MUSIC_QUERY = re.compile(r"\b(?:play|put on|listen to)\s+(.*)", re.IGNORECASE)
+MUSIC_FILLER = re.compile(r"^(?:(?:some|me|a|an|any|the|something|music|songs?|tracks?|a song)\s+)*(?:by\s+|from\s+)?", re.IGNORECASE)
+MUSIC_TRAILER = re.compile(r"\s+(?:please|for me|now|on (?:my )?(?:computer|speakers?))$", re.IGNORECASE)
+
+# A place given by another fact: "the capital of France", "the largest city of Brazil"
+RELATION = r"(?:largest|biggest|smallest|oldest|main|most populous)\s+\w+"
+NESTED_PLACE = re.compile(r"^(?:(?:capitals?(?: city)?|population|inhabitants|people|area|size|weather|" + RELATION +
+                          r")\s+(?:of|in)\s+(?:the\s+)?)+", re.IGNORECASE)
+RELATED_PLACE = re.compile(r"^" + RELATION + r"\s+(?:of|in)\b", re.IGNORECASE)
+
+# Phrases of the questions WorldFacts answers, shared with nested_fact()
+FACT_PHRASES = {
+    "capital": [r"capitals?(?: city)?"],
+    "area": [r"area", r"size", r"how (?:big|large)", r"square (?:kilometers|kilometres|miles)"],
+    "population": [r"population", r"how many people", r"inhabitants"],
+}
+FACT_WORDS = [re.compile(r"\b(?:" + "|".join(phrases) + r")\b", re.IGNORECASE) for phrases in FACT_PHRASES.values()]
+FACT_ANY = re.compile(r"\b(?:" + "|".join(p for phrases in FACT_PHRASES.values() for p in phrases) + r")\b", re.IGNORECASE)
+# What may follow the last fact phrase: "of|in <place>" ("is <place>" after "how big") and little else,
+# so "the capital gains tax in France" and "the capital of India in Hindi" aren't fact questions
+FACT_TAIL = re.compile(
+    r"^(?:\s+(?:of|in|for|is|are|live in|lives in|living in)\s+(?:the\s+)?[^\W\d_]+(?:[ .'-]+(?!in\b)[^\W\d_]+)*)?"
+    r"(?:\s*,?\s*\b(?:please|today|now|right now|currently|in square (?:kilometers|kilometres|miles)))*\s*[?.!]*\s*$",
+    re.IGNORECASE
+)
+
+def parse_duration(text):
+    """Seconds in phrases like "5 minutes", "an hour and 30 seconds" or "half an hour"; None without one"""
+    total = 0.0
+    for amount, unit in DURATION.findall(text):
+        amount = amount.lower()
+        if amount.startswith("half"):
+            total += 1800
+            continue
+        if not unit:
+            continue  # A bare number isn't a duration
+        unit = unit.lower().rstrip("s") or "s"
+        value = float(amount) if amount[0].isdigit() else NUMBER_WORDS[amount]
+        total += value * UNIT_SECONDS[unit]
+    return int(total) if total else None
+
+def parse_clock(text, now=None):
+    """The next datetime matching "at 7:30 pm", "at noon" or "tomorrow at 9"; None without one"""
+    match = CLOCK.search(text)
+    if not match:
+        return None
+    preposition, word, hour, minute, meridiem = match.groups()
+    if preposition.lower() == "for" and not (word or minute or meridiem):
+        return None  # "for 5" is a duration, not a time of day
+    now = now or datetime.now()
+    if word:
+        hour, minute = (0, 0) if word.lower() == "midnight" else (12, 0)
+        meridiem = None
+    else:
+        hour, minute = int(hour), int(minute or 0)
+        if hour > 23 or minute > 59 or (meridiem and not 1 <= hour <= 12):
+            return None
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem.lower().startswith("p") else 0)
+    due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if TOMORROW.search(text):
+        return due + timedelta(days=1)
+    if due <= now and not meridiem and not word and hour < 12 and due + timedelta(hours=12) > now:
+        return due + timedelta(hours=12)  # "at 7" said in the afternoon means 7 pm
+    return due if due > now else due + timedelta(days=1)
+
+def parse_at(text):
+    when = parse_clock(text)
+    return when.timestamp() if when else None
+
+def parse_reminder(text):
+    """What to be reminded of: "call mom" for "remind me to call mom in 10 minutes", None without it"""
+    match = REMINDER.search(text)
+    if not match:
+        return None
+    label = CLOCK.sub("", WHEN.sub("", match.group(1)))
+    label = re.sub(r"^\s*(?:to|about|that)\s+", "", label.strip(" .?!,"))
+    return label.strip(" .?!,") or None
+
+def parse_all(text):
+    return True if re.search(r"\ball\b", text, re.IGNORECASE) else None
+
+def parse_music_query(text):
+    """What to play: "bohemian rhapsody by queen" in "play bohemian rhapsody by queen"; None for any music"""
+    match = MUSIC_QUERY.search(text)
+    if not match:
+        return None
+    query = MUSIC_TRAILER.sub("", match.group(1).strip(" .?!,"))
+    query = MUSIC_FILLER.sub("", query + " ").strip()
+    return query if query.lower() not in ("", "music", "something", "songs", "some music") else None
+
+def parse_place(text):
+    match = PLACE.search(text)
+    if not match:
+        return None
+    # Only the weather uses a nested place as is: "the weather in the capital of France" looks up France
+    place = NESTED_PLACE.sub("", match.group(1)).strip(" .'-")
+    return place.title() if place else None
+
+def nested_fact(text):
+    """True when a fact question asks about a place named by another fact ("the population of
+    the capital of Japan") or mixes categories; the fact table can't answer those"""
+    if sum(1 for words in FACT_WORDS if words.search(text)) > 1:
+        return True
+    match = PLACE.search(text)
+    return bool(match and RELATED_PLACE.match(match.group(1)))
+
+def not_a_fact(text):
+    """True when a capital, area or population question is one the fact table can't answer:
+    nested, or asking something more than the fact about a place"""
+    if nested_fact(text):
+        return True
+    last = None
+    for last in FACT_ANY.finditer(text):
+        pass
+    return bool(last and not FACT_TAIL.match(text[last.end():]))
+
+class Intent:
+    """A named intent: regex phrases matched on word boundaries, a priority for when
+    several intents match, and slot extractors run on the whole text once it wins. When
+    `unless` is true for the text, the winning intent gives way to the default route"""
+
+    def __init__(self, name, phrases, priority=0, slots=None, unless=None):
+        self.name = name
+        self.phrases = phrases
+        self.priority = priority
+        self.slots = slots or {}
+        self.unless = unless
+
+class Route:
+    __slots__ = ("intent", "slots")
+
+    def __init__(self, intent, slots=None):
+        self.intent = intent
+        self.slots = slots or {}
+
+    def __repr__(self):
+        return f"Route({self.intent!r}, {self.slots!r})"
+
+# Commands first, then the question categories in the order Jarvis has always preferred them
+INTENTS = [
+    Intent("goodbye", [r"good ?bye", r"bye", r"see you", r"that'?s all"], priority=100),
+    Intent("cancel_timer", [r"(?:cancel|stop|delete|clear|remove) (?:the |my |that |this |all |all my |all the )?"
+                            r"(?:timers?|reminders?|alarms?)"],
+           priority=95, slots={"all": parse_all}),
+    Intent("list_timers", [r"(?:list|show|what are) (?:my |the |all |all my )?(?:timers|reminders|alarms)",
+                           r"(?:any|which) (?:timers|reminders|alarms)", r"how (?:much time|long) is left",
+                           r"(?:timers|reminders|alarms) (?:do i have|have i set|are (?:set|running|left|there|on))"],
+           priority=95),
+    Intent("set_timer", [r"set (?:a |an |the )?(?:timer|alarm|reminder)", r"timer for", r"start (?:a )?timer",
+                         r"alarm for", r"remind me", r"wake me up", r"count ?down"],
+           priority=90, slots={"duration": parse_duration, "at": parse_at, "label": parse_reminder}),
+    Intent("stop_music", [r"(?:stop|pause) (?:the |playing |that )?(?:music|song|playback)", r"stop playing"],
+           priority=85),
+    Intent("play_music", [r"play (?:some |a |me )?(?:music|songs?)", r"put on (?:some )?music", r"play something",
+                          r"listen to (?:some )?music",
+                          # "play <song or artist>" only at the start, so "how do I play chess" stays a question
+                          r"^(?:(?:hey |ok )?jarvis,? |please |can you |could you |would you )?play"],
+           priority=80, slots={"query": parse_music_query}),
+    Intent("weather", [r"weather", r"temperature (?:in|outside)", r"forecast", r"is it (?:raining|sunny|cold|hot)"],
+           priority=70, slots={"city": parse_place}),
+    Intent("capital", FACT_PHRASES["capital"], priority=50, slots={"place": parse_place}, unless=not_a_fact),
+    Intent("area", FACT_PHRASES["area"], priority=40, slots={"place": parse_place}, unless=not_a_fact),
+    Intent("population", FACT_PHRASES["population"], priority=30, slots={"place": parse_place},
+           unless=not_a_fact),
+    Intent("list", [r"list", r"what are", r"top \d+", r"name (?:some|a few)"], priority=20),
+]
+
+class IntentRouter:
+    """Routes text to the highest-priority intent whose phrase it contains.
+
+    All phrases are compiled into one alternation with a named group per intent, so
+    routing is a single regex scan however many intents there are.
+    """
+
+    def __init__(self, intents=INTENTS, default="general"):
+        self.intents = sorted(intents, key=lambda intent: -intent.priority)
+        self.default = default
+        # At the same position the alternation prefers the earlier, higher-priority intent
+        groups = [f"(?P<i{i}>{'|'.join(intent.phrases)})" for i, intent in enumerate(self.intents)]
+        self.pattern = re.compile(r"\b(?:" + "|".join(groups) + r")\b", re.IGNORECASE)
+
+    def match(self, text):
+        """Index of the winning intent in self.intents, or None"""
+        best = None
+        for match in self.pattern.finditer(text):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return best
+
+    def route(self, text):
+        index = self.match(text)
+        if index is None:
+            return Route(self.default)
+        intent = self.intents[index]
+        if intent.unless and intent.unless(text):
+            return Route(self.default)
+        slots = {}
+        for name, extract in intent.slots.items():
+            value = extract(text)
+            if value is not None:
+                slots[name] = value
+        return Route(intent.name, slots)
+
+def format_duration(seconds):
+    parts = []
+    for name, size in (("hour", 3600), ("minute", 60), ("second", 1)):
+        count, seconds = divmod(seconds, size)
+        if count:
+            parts.append(f"{count} {name}{'s' if count != 1 else ''}")
+    return " ".join(parts) or "0 seconds"
@@ -0,0 +1,470 @@
+"""Headless Jarvis: the answer pipeline behind a local HTTP and WebSocket API, without a window or microphone.
+
+Every client talks in sessions; each session has its own conversation context, so follow-up
+questions work per client. Answers are streamed as they arrive and can come with the spoken
+answer as a WAV file (needs pyttsx3).
+
+    POST   /v1/ask              {"question": "...", "session": "...", "stream": false, "audio": false}
+    DELETE /v1/sessions/<id>    forget a session's conversation
+    GET    /v1/health           liveness and which subsystems are loaded
+    GET    /v1/stats            queue, latency, per-stage percentiles and pipeline counters
+    GET    /v1/ws               WebSocket; send {"question": ...} messages, receive the same events
+
+A streamed answer (or a WebSocket) delivers JSON events: "partial" with the answer so far,
+"sentence" for each complete sentence, then "answer" with the final text, the session id and
+the timings and the trace id. Without "stream" the "answer" event is the response body. A session id is made
+up when a question comes without one; send it back to continue the conversation.
+
+Usage: python jarvis_service.py [--host 127.0.0.1] [--port 8770]
+"""
+import os
+import json
+import time
+import uuid
+import base64
+import struct
+import asyncio
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from startup import StartupProfiler
+from answer_pipeline import create_pipeline
+from request_scheduler import RequestScheduler, SchedulerBusy
+from tracing import Tracer, percentile
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MAX_BODY = 64 * 1024
+
+STATUS_TEXT = {
+    101: "Switching Protocols", 200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable",
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+async def read_request(reader):
+    """(method, path, headers, body) of the next request on a keep-alive connection, or None once it closes"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HttpError(413, "Request headers are too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY:
+        raise HttpError(413, f"Request bodies are limited to {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], headers, body
+
+def response_head(status, headers):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+async def send_json(writer, status, payload, headers=None):
+    data = json.dumps(payload).encode("utf-8")
+    writer.write(response_head(status, dict({"Content-Type": "application/json", "Content-Length": len(data)}, **(headers or {}))) + data)
+    await writer.drain()
+
+def apply_mask(payload, key):
+    # XOR the whole payload at once instead of byte by byte
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+def encode_frame(opcode, payload, mask=False):
+    """One final WebSocket frame; clients must mask theirs, servers must not"""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        header.append(mask_bit | len(payload))
+    elif len(payload) < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack(">H", len(payload))
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack(">Q", len(payload))
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = apply_mask(payload, key)
+    return bytes(header) + payload
+
+async def read_frame(reader, max_size=MAX_BODY):
+    """(final, opcode, payload) of the next WebSocket frame"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    if length > max_size:
+        raise HttpError(413, f"WebSocket messages are limited to {max_size} bytes")
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    return bool(first & 0x80), first & 0x0F, apply_mask(payload, key) if key else payload
+
+async def read_message(reader, writer):
+    """Text of the next WebSocket message, answering pings on the way; None once the client closes"""
+    parts = []
+    while True:
+        final, opcode, payload = await read_frame(reader)
+        if opcode == 0x8:
+            writer.write(encode_frame(0x8, payload[:2]))
+            await writer.drain()
+            return None
+        if opcode == 0x9:
+            writer.write(encode_frame(0xA, payload))
+            await writer.drain()
+            continue
+        if opcode == 0xA:
+            continue
+        parts.append(payload)
+        if final:
+            return b"".join(parts).decode("utf-8")
+
+class Session:
+    def __init__(self, session_id, conversation):
+        self.id = session_id
+        self.conversation = conversation
+        self.questions = 0
+
+class SessionStore:
+    """Conversation context per client session; the least recently used ones are dropped beyond `max_sessions`"""
+
+    def __init__(self, conversation_factory, max_sessions=1000):
+        self.conversation_factory = conversation_factory
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.evicted = 0
+
+    def get(self, session_id=None):
+        session_id = str(session_id or uuid.uuid4().hex)
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(session_id, self.conversation_factory())
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def drop(self, session_id):
+        return self.sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        return len(self.sessions)
+
+class SpeechRenderer:
+    """Renders answers to WAV on one thread that owns the speech engine, through the audio cache"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jarvis-synth")
+        self.engine = None
+        self.cache = None
+
+    def render(self, text):
+        from tts_worker import clean_for_speech, initialize_com, voice_key
+        if self.engine is None:
+            import pyttsx3
+            from audio_cache import AudioCache
+            initialize_com()
+            self.engine = pyttsx3.init()
+            self.cache = AudioCache(self.directory, voice_key(self.engine), self.max_bytes)
+        text = clean_for_speech(text)
+        path = self.cache.get(text) or self.cache.render(self.engine, text)
+        if path is None:
+            raise RuntimeError("the speech engine produced no audio")
+        with open(path, "rb") as file:
+            return file.read()
+
+    async def wav(self, text):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self.render, text)
+
+class JarvisService:
+    """Serves the answer pipeline to any number of local clients.
+
+    Questions go through a RequestScheduler of their own, so at most `workers` are answered at
+    once and a full queue is reported as 503 instead of piling up. Pipeline events arrive on
+    worker threads and are handed to the event loop through a per-request asyncio.Queue.
+    """
+
+    def __init__(self, pipeline, workers=16, max_pending=64, max_sessions=1000, speech=None, tracer=None):
+        self.pipeline = pipeline
+        self.tracer = tracer or Tracer()
+        self.scheduler = RequestScheduler(pipeline.answer_request, workers=workers, max_pending=max_pending)
+        self.sessions = SessionStore(pipeline.new_conversation, max_sessions)
+        self.speech = speech
+        self.started = time.time()
+        self.answered = 0
+        self.rejected = 0
+        self.connections = 0
+        self.latencies = deque(maxlen=1000)
+
+    def submit(self, question, session):
+        """Queue a question; raises SchedulerBusy when too many are waiting"""
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def listener(kind, request_id, payload):
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, (kind, payload))
+            except RuntimeError:
+                pass  # The event loop has shut down
+
+        try:
+            request = self.scheduler.submit(question, "api", listener, supersede=False, context=session.conversation,
+                                            trace=self.tracer.start("api", session=session.id))
+        except SchedulerBusy:
+            self.rejected += 1
+            raise
+        session.questions += 1
+        return request, events
+
+    async def events(self, request, events, session, audio=False):
+        """The request's events as JSON-ready dicts, ending with the "answer" event"""
+        started = time.perf_counter()
+        try:
+            while True:
+                kind, payload = await events.get()
+                if kind == "done":
+                    request.trace.finish()
+                    return
+                event = {"type": kind, "request": request.id, "text": payload}
+                if kind == "answer":
+                    self.answered += 1
+                    self.latencies.append((time.perf_counter() - started) * 1000)
+                    event.update(session=session.id, trace=request.trace.id, **request.details)
+                    if audio:
+                        with request.trace.span("synthesize"):
+                            await self.add_audio(event)
+                yield event
+        finally:
+            request.cancel()  # The client went away before the answer was complete
+
+    async def add_audio(self, event):
+        if self.speech is None:
+            event["audio_error"] = "speech output is turned off"
+            return
+        try:
+            event["audio"] = base64.b64encode(await self.speech.wav(event["text"])).decode("ascii")
+            event["audio_type"] = "audio/wav"
+        except Exception as e:
+            event["audio_error"] = str(e)
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    if path == "/v1/ws" and headers.get("upgrade", "").lower() == "websocket":
+                        await self.websocket(reader, writer, headers)
+                        break
+                    await self.route(method, path, body, writer)
+                except HttpError as e:
+                    await send_json(writer, e.status, {"error": e.message}, {"Connection": "close"})
+                    break
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def route(self, method, path, body, writer):
+        if path == "/v1/ask":
+            if method != "POST":
+                raise HttpError(405, "Use POST")
+            await self.ask(parse_question(body), writer)
+        elif path.startswith("/v1/sessions/"):
+            if method != "DELETE":
+                raise HttpError(405, "Use DELETE")
+            await send_json(writer, 200, {"cleared": self.sessions.drop(path[len("/v1/sessions/"):])})
+        elif path == "/v1/health":
+            await send_json(writer, 200, {
+                "status": "ok",
+                "ai": self.pipeline.client.loaded,
+                "translation": self.pipeline.translator.loaded,
+                "speech": self.speech is not None,
+            })
+        elif path == "/v1/stats":
+            await send_json(writer, 200, self.stats())
+        else:
+            raise HttpError(404, f"Unknown path {path}")
+
+    async def ask(self, message, writer):
+        session = self.sessions.get(message.get("session"))
+        try:
+            request, events = self.submit(message["question"], session)
+        except SchedulerBusy as e:
+            await send_json(writer, 503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+        answer_events = self.events(request, events, session, bool(message.get("audio")))
+        if not message.get("stream"):
+            answer = {}
+            async for event in answer_events:
+                if event["type"] == "answer":
+                    answer = event
+            await send_json(writer, 200, answer)
+            return
+
+        # One JSON event per line, flushed as each arrives
+        writer.write(response_head(200, {"Content-Type": "application/x-ndjson", "Transfer-Encoding": "chunked"}))
+        try:
+            async for event in answer_events:
+                data = (json.dumps(event) + "\n").encode("utf-8")
+                writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                await writer.drain()
+        finally:
+            await answer_events.aclose()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            raise HttpError(400, "Missing Sec-WebSocket-Key")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(response_head(101, {"Upgrade": "websocket", "Connection": "Upgrade", "Sec-WebSocket-Accept": accept}))
+        await writer.drain()
+
+        session = None
+        answering = None
+        try:
+            while True:
+                try:
+                    text = await read_message(reader, writer)
+                except HttpError as e:
+                    writer.write(encode_frame(0x8, struct.pack(">H", 1009) + e.message.encode("utf-8")))
+                    break
+                if text is None:
+                    break
+                try:
+                    message = parse_question(text.encode("utf-8"))
+                except HttpError as e:
+                    writer.write(encode_frame(0x1, json.dumps({"type": "error", "error": e.message}).encode("utf-8")))
+                    continue
+                if session is None or message.get("session") not in (None, session.id):
+                    session = self.sessions.get(message.get("session"))
+                # A new question supersedes the one still being answered, like in the window
+                if answering is not None:
+                    answering.cancel()
+                answering = asyncio.ensure_future(self.answer_over_websocket(writer, message, session))
+        finally:
+            if answering is not None:
+                answering.cancel()
+
+    async def answer_over_websocket(self, writer, message, session):
+        try:
+            request, events = self.submit(message["question"], session)
+        except SchedulerBusy as e:
+            writer.write(encode_frame(0x1, json.dumps({"type": "busy", "error": str(e)}).encode("utf-8")))
+            return
+        answer_events = self.events(request, events, session, bool(message.get("audio")))
+        try:
+            async for event in answer_events:
+                writer.write(encode_frame(0x1, json.dumps(event).encode("utf-8")))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            await answer_events.aclose()
+
+    def stats(self):
+        return {
+            "uptime_s": time.time() - self.started,
+            "connections": self.connections,
+            "sessions": len(self.sessions),
+            "sessions_evicted": self.sessions.evicted,
+            "answered": self.answered,
+            "rejected": self.rejected,
+            "p50_ms": percentile(self.latencies, 0.5),
+            "p99_ms": percentile(self.latencies, 0.99),
+            "stages": self.tracer.summary(),
+            "scheduler": self.scheduler.stats(),
+            "pipeline": self.pipeline.stats(),
+        }
+
+    async def serve(self, host, port, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+
+def parse_question(body):
+    try:
+        message = json.loads(body or b"{}")
+    except ValueError:
+        raise HttpError(400, "The body must be JSON")
+    if not isinstance(message, dict) or not isinstance(message.get("question"), str) or not message["question"].strip():
+        raise HttpError(400, 'Expected {"question": "..."}')
+    message["question"] = message["question"].strip()
+    return message
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv('JARVIS_SERVICE_HOST', '127.0.0.1'))
+    parser.add_argument("--port", type=int, default=int(os.getenv('JARVIS_SERVICE_PORT', '8770')), help="0 picks a free port")
+    args = parser.parse_args()
+
+    load_dotenv()
+    startup = StartupProfiler()
+    data_dir = os.getenv('JARVIS_DATA_DIR', os.path.join(os.path.expanduser('~'), '.jarvis'))
+    pipeline = create_pipeline(data_dir, startup)
+    threading.Thread(target=pipeline.load, name="jarvis-startup", daemon=True).start()
+    speech = SpeechRenderer(
+        os.path.join(data_dir, 'audio'), int(os.getenv('JARVIS_AUDIO_CACHE_MB', '200')) * 1024 * 1024
+    ) if os.getenv('JARVIS_SERVICE_SPEECH', '1') == '1' else None
+    tracer = Tracer(
+        capacity=int(os.getenv('JARVIS_TRACE_BUFFER', '500')),
+        path=os.getenv('JARVIS_TRACE_FILE') or None,
+        enabled=os.getenv('JARVIS_TRACING', '1') == '1'
+    )
+    service = JarvisService(
+        pipeline,
+        workers=int(os.getenv('JARVIS_SERVICE_WORKERS', '16')),
+        max_pending=int(os.getenv('JARVIS_SERVICE_MAX_PENDING', '64')),
+        max_sessions=int(os.getenv('JARVIS_SERVICE_SESSIONS', '1000')),
+        speech=speech,
+        tracer=tracer
+    )
+
+    def ready(port):
+        # Flushed right away: bench_service.py waits for this line to learn the port
+        print(f"Jarvis service listening on http://{args.host}:{port}", flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    stats = service.stats()
+    print(f"Answered {stats['answered']} questions, p50 {stats['p50_ms'] or 0:.0f} ms, p99 {stats['p99_ms'] or 0:.0f} ms, "
+          f"{stats['rejected']} turned away; startup: {startup.summary()}")
+    tracer.close()
+    pipeline.history.close()
+
+if __name__ == "__main__":
+    main()
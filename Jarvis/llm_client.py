@@ -0,0 +1,179 @@
+import time
+import random
+import threading
+
+class CircuitOpenError(Exception):
+    """Raised without calling the API while it is considered unhealthy"""
+
+class DeadlineExceeded(Exception):
+    """Raised when a call runs past its deadline"""
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after `reset_timeout` one probe call is let through"""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.times_opened = 0
+
+    def allow(self):
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.probing = False
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+    def record_cancelled(self):
+        # The caller stopped reading, which says nothing about the API; let the next probe through
+        with self.lock:
+            self.probing = False
+
+def is_transient(error):
+    from mistralai.exceptions import MistralAPIException
+    # Client errors (bad key, bad request) won't get better by retrying; everything else might
+    if isinstance(error, MistralAPIException) and error.http_status is not None:
+        return error.http_status in (408, 409, 429) or error.http_status >= 500
+    return True
+
+class ResilientMistralClient:
+    """MistralClient with per-call deadlines, jittered exponential retries and a circuit breaker.
+
+    MistralClient keeps a single httpx.Client, so connections are pooled and kept alive
+    between calls. Its own retry loop (fixed 2**n second sleeps) is disabled in favour of ours.
+    Each attempt's network timeout is capped by what is left of the deadline.
+    """
+
+    def __init__(self, api_key, endpoint=None, timeout=10, deadline=20.0, max_attempts=3,
+                 base_delay=0.25, max_delay=4.0, breaker=None):
+        # Imported here: mistralai and httpx take a noticeable part of a second to import
+        from mistralai.client import MistralClient
+        options = {"endpoint": endpoint} if endpoint else {}
+        self.client = MistralClient(api_key=api_key, max_retries=0, timeout=timeout, **options)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.cancelled = 0
+
+    def backoff(self, attempt):
+        # Full jitter keeps retrying clients from hitting the API in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def attempt_timeout(self, deadline_at):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Mistral answer took longer than its deadline")
+        return min(self.timeout, remaining)
+
+    def request(self, stream, timeout, messages, model=None, **options):
+        """MistralClient.chat(_stream) with a timeout for this call, which its public methods don't take"""
+        body = self.client._make_chat_request(messages, model, stream=stream, **options)
+        return self.client._request("post", body, "v1/chat/completions", stream=stream, timeout=timeout)
+
+    def chat_stream(self, deadline=None, **kwargs):
+        """Stream chat chunks; failures before the first chunk are retried, later ones are raised"""
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise CircuitOpenError("Mistral API is unavailable, not calling it for now")
+            attempt += 1
+            self.calls += 1
+            started = False
+            try:
+                from mistralai.models.chat_completion import ChatCompletionStreamResponse
+                for data in self.request(True, self.attempt_timeout(deadline_at), **kwargs):
+                    if time.monotonic() > deadline_at:
+                        raise DeadlineExceeded("Mistral answer took longer than its deadline")
+                    started = True
+                    yield ChatCompletionStreamResponse(**data)
+            except GeneratorExit:
+                # The caller stopped reading, so this call neither succeeded nor failed
+                self.cancelled += 1
+                self.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                transient = is_transient(e)
+                if transient:
+                    self.breaker.record_failure()
+                delay = self.backoff(attempt)
+                if started or not transient or attempt >= self.max_attempts or time.monotonic() + delay >= deadline_at:
+                    self.failures += 1
+                    raise
+                print(f"Retrying Mistral request after error: {e}")
+                self.retries += 1
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return
+
+    def chat(self, deadline=None, **kwargs):
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise CircuitOpenError("Mistral API is unavailable, not calling it for now")
+            attempt += 1
+            self.calls += 1
+            try:
+                from mistralai.models.chat_completion import ChatCompletionResponse
+                # A response that arrives just past the deadline is still used
+                response = ChatCompletionResponse(**next(self.request(False, self.attempt_timeout(deadline_at), **kwargs)))
+            except Exception as e:
+                transient = is_transient(e)
+                if transient:
+                    self.breaker.record_failure()
+                delay = self.backoff(attempt)
+                if not transient or attempt >= self.max_attempts or time.monotonic() + delay >= deadline_at:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return response
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+        }
@@ -0,0 +1,217 @@
+import os
+import re
+import random
+import sqlite3
+import threading
+import unicodedata
+
+try:
+    import mutagen
+except ImportError:
+    mutagen = None
+
+AUDIO_EXTENSIONS = {".mp3", ".flac", ".ogg", ".oga", ".opus", ".m4a", ".aac", ".wav", ".wma"}
+
+# Words that don't help find a track ("play the song ... by ...")
+STOP_WORDS = {"the", "a", "an", "by", "song", "songs", "track", "music", "some", "me", "from", "album", "of", "and"}
+
+WORD = re.compile(r"[^\W_]+")
+
+# "03 - Title", "03. Title"; without the separator ("03 Title", "1-03 Title") only inside an album
+# folder, since "99 Luftballons" and "7 Years" start with a number too
+TRACK_NUMBER = re.compile(r"^\s*(?:\d+[-.])?\d+\s*[-.]\s+")
+ALBUM_TRACK_NUMBER = re.compile(r"^\s*(?:\d+[-.])?\d+(?:\s*[-.]\s*|\s+)")
+
+def words(text):
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return WORD.findall(text.lower().replace("'", ""))
+
+def tags_from_path(path, root=None):
+    """Artist, album and title from the usual Artist/Album/NN - Title.ext or Artist - Title.ext layout"""
+    folder, name = os.path.split(path)
+    stem = os.path.splitext(name)[0]
+    if root is None:
+        folders = [os.path.basename(os.path.dirname(folder)), os.path.basename(folder)]
+    else:
+        # Only folders below the music root name the artist and album, not ~/Music or the user's home
+        relative = os.path.relpath(os.path.abspath(folder), os.path.abspath(root))
+        folders = [] if relative == os.curdir or relative.startswith(os.pardir) else relative.split(os.sep)
+    in_album = root is not None and bool(folders)
+    title = (ALBUM_TRACK_NUMBER if in_album else TRACK_NUMBER).sub("", stem).strip() or stem
+    artist, album = "", ""
+    if len(folders) > 1:
+        artist, album = folders[-2:]
+    elif folders:
+        artist = folders[0]  # Artist/track
+    if " - " in title:
+        artist, title = [part.strip() for part in title.split(" - ", 1)]
+    return artist, album, title
+
+def read_tags(path, root=None):
+    """(artist, album, title), from the file's tags when mutagen is installed, else from its path"""
+    artist, album, title = tags_from_path(path, root)
+    try:
+        tags = mutagen.File(path, easy=True) if mutagen else None
+    except Exception:
+        tags = None
+    if tags:
+        first = lambda key, default: (tags.get(key) or [default])[0]  # noqa: E731
+        artist, album, title = first("artist", artist), first("album", album), first("title", title)
+    return artist, album, title
+
+class Track:
+    __slots__ = ("id", "path", "artist", "album", "title", "title_words", "artist_words")
+
+    def __init__(self, id, path, artist, album, title):
+        self.id = id
+        self.path = path
+        self.artist = artist
+        self.album = album
+        self.title = title
+        self.title_words = frozenset(words(title))
+        self.artist_words = frozenset(words(artist))
+
+    def describe(self):
+        return f"{self.title} by {self.artist}" if self.artist else self.title
+
+class MusicLibrary:
+    """Audio files under `roots`, with tags, kept in SQLite and searched through an in-memory word index.
+
+    scan() walks the roots and only reads tags of files whose mtime or size changed; files
+    that disappeared are dropped. Every word of a track's artist, album and title points at
+    the track, so a query is answered by intersecting a few small sets.
+    """
+
+    def __init__(self, path, roots=()):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.roots = [os.path.expanduser(root) for root in roots]
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS tracks (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                artist TEXT NOT NULL,
+                album TEXT NOT NULL,
+                title TEXT NOT NULL
+            )
+        """)
+        self.db.commit()
+        self.tracks = {}
+        self.index = {}
+        self.ready = threading.Event()
+        self.scanning = None
+        self.last_scan = {}
+
+    def load(self):
+        """Build the in-memory index from what the last scan stored"""
+        tracks, index = {}, {}
+        with self.lock:
+            rows = self.db.execute("SELECT id, path, artist, album, title FROM tracks").fetchall()
+        for row in rows:
+            track = Track(*row)
+            tracks[track.id] = track
+            for word in track.title_words | track.artist_words | set(words(track.album)):
+                index.setdefault(word, set()).add(track.id)
+        self.tracks, self.index = tracks, index
+        self.ready.set()
+
+    def scan(self):
+        """Bring the stored index up to date with the files on disk; returns what changed"""
+        with self.lock:
+            known = {path: (id, mtime, size) for id, path, mtime, size in
+                     self.db.execute("SELECT id, path, mtime, size FROM tracks")}
+        seen = set()
+        changed = []
+        for root in self.roots:
+            for path, stat in self.walk(root):
+                seen.add(path)
+                entry = known.get(path)
+                if entry is None or entry[1] != stat.st_mtime or entry[2] != stat.st_size:
+                    changed.append((path, stat.st_mtime, stat.st_size, *read_tags(path, root)))
+        removed = [(path,) for path in known if path not in seen]
+        with self.lock:
+            self.db.executemany(
+                "INSERT INTO tracks (path, mtime, size, artist, album, title) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET mtime = excluded.mtime, size = excluded.size, "
+                "artist = excluded.artist, album = excluded.album, title = excluded.title", changed
+            )
+            self.db.executemany("DELETE FROM tracks WHERE path = ?", removed)
+            self.db.commit()
+        self.last_scan = {"files": len(seen), "changed": len(changed), "removed": len(removed)}
+        return self.last_scan
+
+    def walk(self, root):
+        stack = [root]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+    def refresh(self):
+        """Serve the stored index right away, then rescan and rebuild it"""
+        self.load()
+        try:
+            self.scan()
+        except Exception as e:
+            print(f"Music library scan failed: {e}")
+        self.load()
+
+    def start(self):
+        if self.scanning is None or not self.scanning.is_alive():
+            self.scanning = threading.Thread(target=self.refresh, name="jarvis-music-scan", daemon=True)
+            self.scanning.start()
+
+    def search(self, query, limit=5):
+        """Tracks matching the words of `query`, best first: all words, else the most of them"""
+        terms = [word for word in words(query) if word not in STOP_WORDS]
+        tracks, index = self.tracks, self.index
+        if not terms:
+            return []
+        postings = sorted((index.get(term, set()) for term in terms), key=len)
+        matches = set.intersection(*postings) if postings[0] else set()
+        if not matches:
+            counts = {}
+            for posting in postings:
+                for track_id in posting:
+                    counts[track_id] = counts.get(track_id, 0) + 1
+            if not counts:
+                return []
+            best = max(counts.values())
+            if best * 2 < len(terms):
+                return []  # Less than half the words match: more likely a miss than a track
+            matches = {track_id for track_id, count in counts.items() if count == best}
+
+        def rank(track_id):
+            # Prefer the title saying it, then the artist, then shorter titles
+            track = tracks[track_id]
+            return (-sum(term in track.title_words for term in terms),
+                    -sum(term in track.artist_words for term in terms), len(track.title))
+
+        if len(matches) > 100:
+            matches = random.sample(list(matches), 100)
+        return [tracks[track_id] for track_id in sorted(matches, key=rank)[:limit]]
+
+    def shuffle(self):
+        tracks = self.tracks
+        return tracks[random.choice(list(tracks))] if tracks else None
+
+    def stats(self):
+        return {"tracks": len(self.tracks), "words": len(self.index), "ready": self.ready.is_set(), **self.last_scan}
@@ -0,0 +1,73 @@
+import numpy as np
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QColor, QPainter, QPixmap, QBrush
+
+class ParticleField:
+    """Struct-of-arrays particle simulation: positions, velocities, sizes and opacities live in NumPy arrays"""
+
+    def __init__(self, count, width, height, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.width = width
+        self.height = height
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.size = np.zeros(count, dtype=np.int32)
+        self.opacity = np.zeros(count)
+        self.spawn(np.ones(count, dtype=bool))
+
+    def __len__(self):
+        return len(self.x)
+
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+
+    def spawn(self, mask):
+        count = int(mask.sum())
+        speed = self.rng.uniform(0.5, 2, count)
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        self.x[mask] = self.rng.integers(0, self.width + 1, count)
+        self.y[mask] = self.rng.integers(0, self.height + 1, count)
+        self.vx[mask] = speed * np.cos(angle)
+        self.vy[mask] = speed * np.sin(angle)
+        self.size[mask] = self.rng.integers(2, 6, count)
+        self.opacity[mask] = self.rng.uniform(0.3, 0.7, count)
+
+    def step(self, ticks=1.0):
+        """Advance by `ticks` 50 ms animation steps and respawn particles that left the area"""
+        self.x += self.vx * ticks
+        self.y += self.vy * ticks
+        np.maximum(self.opacity - 0.001 * ticks, 0.1, out=self.opacity)
+        gone = (self.x < 0) | (self.x > self.width) | (self.y < 0) | (self.y > self.height)
+        if gone.any():
+            self.spawn(gone)
+
+class ParticleSprites:
+    """Pre-rendered particle dots, drawn in one drawPixmapFragments call per particle size"""
+
+    def __init__(self, color, sizes=range(2, 6)):
+        self.sprites = {}
+        for size in sizes:
+            pixmap = QPixmap(size, size)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QBrush(QColor(color)))
+            painter.drawEllipse(0, 0, size, size)
+            painter.end()
+            self.sprites[size] = (pixmap, QRectF(0, 0, size, size))
+
+    def paint(self, painter, field):
+        create = QPainter.PixmapFragment.create
+        for size, (pixmap, source) in self.sprites.items():
+            mask = field.size == size
+            if not mask.any():
+                continue
+            fragments = [
+                create(QPointF(x, y), source, 1.0, 1.0, 0.0, opacity)
+                for x, y, opacity in zip(field.x[mask].tolist(), field.y[mask].tolist(), field.opacity[mask].tolist())
+            ]
+            painter.drawPixmapFragments(fragments, pixmap)
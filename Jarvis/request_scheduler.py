@@ -0,0 +1,127 @@
+import itertools
+import queue
+import threading
+import time
+
+class SchedulerBusy(Exception):
+    """Raised when the pending-request queue is full"""
+
+class Request:
+    """A question travelling through the answer pipeline"""
+
+    def __init__(self, request_id, question, source, listener, context=None, trace=None):
+        self.id = request_id
+        self.question = question
+        self.source = source
+        self.listener = listener
+        self.context = context  # Passed through to the handler, e.g. the session's conversation
+        self.details = {}  # Filled in by the handler: category, timings
+        self.trace = trace  # tracing.Trace the handler adds its stages to
+        self.created = time.time()
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def emit(self, kind, payload=""):
+        # Superseded requests stay silent, except for the final "done" event
+        if kind == "done" or not self.cancelled.is_set():
+            self.listener(kind, self.id, payload)
+
+class RequestScheduler:
+    """Bounded worker pool that runs questions from the typed and voice paths.
+
+    A newer question cancels older ones (supersede), at most `workers` requests
+    run at once and at most `max_pending` wait in the queue before submit()
+    pushes back with SchedulerBusy.
+    """
+
+    def __init__(self, handler, workers=2, max_pending=8):
+        self.handler = handler
+        self.worker_count = workers
+        self.pending = queue.Queue(max_pending)
+        self.active = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.workers = []
+        self.completed = 0
+        self.cancelled = 0
+
+    def start(self):
+        with self.lock:
+            while len(self.workers) < self.worker_count:
+                worker = threading.Thread(target=self.work, name=f"jarvis-worker-{len(self.workers)}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def submit(self, question, source, listener, supersede=True, timeout=None, context=None, trace=None):
+        """Queue a question; blocks up to `timeout` seconds when the queue is full (None = don't wait)"""
+        self.start()
+        request = Request(next(self.ids), question, source, listener, context, trace)
+        if supersede:
+            self.cancel_all()
+        with self.lock:
+            self.active[request.id] = request
+        try:
+            self.pending.put(request, block=timeout is not None, timeout=timeout)
+        except queue.Full:
+            with self.lock:
+                del self.active[request.id]
+            raise SchedulerBusy("Too many questions are waiting for an answer")
+        return request
+
+    def cancel_all(self):
+        with self.lock:
+            for request in self.active.values():
+                request.cancel()
+
+        # Release queued requests right away instead of letting them hold queue slots
+        while True:
+            try:
+                request = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self.pending.put(request)
+                break
+            self.finish(request)
+
+    def work(self):
+        while True:
+            request = self.pending.get()
+            if request is None:
+                return
+            try:
+                if not request.cancelled.is_set():
+                    self.handler(request)
+            except Exception as e:
+                print(f"Error handling request {request.id}: {e}")
+                request.emit("answer", f"I apologize, but I encountered an error: {str(e)}")
+            finally:
+                self.finish(request)
+
+    def finish(self, request):
+        with self.lock:
+            self.active.pop(request.id, None)
+            if request.cancelled.is_set():
+                self.cancelled += 1
+            else:
+                self.completed += 1
+        request.emit("done")
+        request.done.set()
+
+    def stop(self):
+        self.cancel_all()
+        for _ in self.workers:
+            self.pending.put(None)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "active": len(self.active),
+                "pending": self.pending.qsize(),
+                "workers": len(self.workers),
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+            }
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QLinearGradient, QPixmap
+
+def paint_robot(painter, arm_angle, leg_angle):
+    """Draw the robot centred on the painter's origin"""
+    # Draw robot body (torso)
+    painter.setPen(QPen(QColor("#3498db"), 2))
+    painter.setBrush(QBrush(QColor("#2c3e50")))
+    painter.drawRoundedRect(-20, -15, 40, 50, 10, 10)  # Torso
+
+    # Draw head with glowing elements
+    painter.drawEllipse(-25, -45, 50, 40)  # Head
+
+    # Draw glowing eyes
+    painter.setBrush(QBrush(QColor("#3498db")))
+    painter.drawEllipse(-15, -35, 10, 10)  # Left eye
+    painter.drawEllipse(5, -35, 10, 10)    # Right eye
+
+    # Draw antenna with glowing tip
+    painter.drawLine(0, -45, 0, -55)
+    gradient = QLinearGradient(0, -60, 0, -55)
+    gradient.setColorAt(0, QColor("#3498db"))
+    gradient.setColorAt(1, QColor("#2980b9"))
+    painter.setBrush(QBrush(gradient))
+    painter.drawEllipse(-5, -60, 10, 10)
+
+    # Draw arms with joints
+    painter.save()
+    painter.rotate(arm_angle)  # Animate arms
+    # Left arm
+    painter.drawRoundedRect(-45, -10, 25, 10, 5, 5)  # Upper arm
+    painter.drawEllipse(-48, -12, 14, 14)  # Shoulder joint
+    # Right arm
+    painter.drawRoundedRect(20, -10, 25, 10, 5, 5)   # Upper arm
+    painter.drawEllipse(34, -12, 14, 14)   # Shoulder joint
+    painter.restore()
+
+    # Draw legs with joints
+    painter.save()
+    painter.rotate(leg_angle)  # Animate legs
+    # Left leg
+    painter.drawRoundedRect(-30, 35, 15, 30, 5, 5)   # Upper leg
+    painter.drawEllipse(-28, 32, 12, 12)   # Hip joint
+    # Right leg
+    painter.drawRoundedRect(15, 35, 15, 30, 5, 5)    # Upper leg
+    painter.drawEllipse(16, 32, 12, 12)    # Hip joint
+    painter.restore()
+
+    # Draw chest light
+    gradient = QLinearGradient(0, -5, 0, 5)
+    gradient.setColorAt(0, QColor("#3498db"))
+    gradient.setColorAt(1, QColor("#2980b9"))
+    painter.setBrush(QBrush(gradient))
+    painter.drawEllipse(-10, 0, 20, 20)
+
+class RobotFrames:
+    """Pre-rendered robot frames keyed by quantized (arm, leg) angles.
+
+    Frames are rendered on first use and kept up to `max_frames`, least recently used
+    first out. The default animation repeats every 240 ticks, so that many frames cover it.
+    Hover only moves the robot, so it is applied as the blit offset.
+    """
+
+    # Square around the origin that holds every pose
+    EXTENT = 75
+
+    def __init__(self, arm_step=1.0, leg_step=0.5, max_frames=240):
+        self.arm_step = arm_step
+        self.leg_step = leg_step
+        self.max_frames = max_frames
+        self.frames = OrderedDict()
+        self.ratio = 1.0
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, arm_angle, leg_angle):
+        return round(arm_angle / self.arm_step), round(leg_angle / self.leg_step)
+
+    def frame(self, arm_angle, leg_angle, ratio=1.0):
+        if ratio != self.ratio:
+            # Moved to a screen with another scale factor
+            self.frames.clear()
+            self.ratio = ratio
+        key = self.key(arm_angle, leg_angle)
+        pixmap = self.frames.get(key)
+        if pixmap is not None:
+            self.frames.move_to_end(key)
+            self.hits += 1
+            return pixmap
+        self.misses += 1
+        pixmap = self.render(key[0] * self.arm_step, key[1] * self.leg_step, ratio)
+        self.frames[key] = pixmap
+        if len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return pixmap
+
+    def render(self, arm_angle, leg_angle, ratio):
+        side = 2 * self.EXTENT
+        pixmap = QPixmap(round(side * ratio), round(side * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(self.EXTENT, self.EXTENT)
+        paint_robot(painter, arm_angle, leg_angle)
+        painter.end()
+        return pixmap
+
+    def draw(self, painter, cx, cy, arm_angle, leg_angle, ratio=1.0):
+        """Blit the frame for this pose centred on (cx, cy)"""
+        pixmap = self.frame(arm_angle, leg_angle, ratio)
+        painter.drawPixmap(round(cx - self.EXTENT), round(cy - self.EXTENT), pixmap)
+
+    def stats(self):
+        return {"frames": len(self.frames), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,124 @@
+import time
+import threading
+
+# Taken when this module is first imported, which ai_assistant does before anything heavy
+PROCESS_STARTED = time.perf_counter()
+
+class StartupProfiler:
+    """Milestones ("first_paint") and subsystem load times, in ms since startup.
+
+    A subsystem is "loading" between begin() and end(), then "ready" or "failed". Listeners
+    are called with (name, state) from whichever thread changed it.
+    """
+
+    def __init__(self, started=PROCESS_STARTED):
+        self.started = started
+        self.lock = threading.Lock()
+        self.marks = {}
+        self.stages = {}
+        self.listeners = []
+
+    def now(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name):
+        with self.lock:
+            self.marks.setdefault(name, self.now())
+
+    def begin(self, name):
+        with self.lock:
+            if name in self.stages:
+                return
+            self.stages[name] = {"began_ms": self.now(), "ready_ms": None, "state": "loading"}
+        self.notify(name, "loading")
+
+    def end(self, name, error=None):
+        state = "failed" if error is not None else "ready"
+        with self.lock:
+            stage = self.stages.setdefault(name, {"began_ms": self.now(), "ready_ms": None, "state": "loading"})
+            if stage["state"] == "ready":
+                return  # Only the first successful load counts
+            stage["state"] = state
+            stage["ready_ms"] = self.now()
+            if error is not None:
+                stage["error"] = str(error)
+        self.notify(name, state)
+
+    def timed(self, name, factory):
+        """Wrap a factory so its first call is recorded as the load of `name`"""
+        def load(*args, **kwargs):
+            self.begin(name)
+            try:
+                value = factory(*args, **kwargs)
+            except Exception as e:
+                self.end(name, e)
+                raise
+            self.end(name)
+            return value
+        return load
+
+    def notify(self, name, state):
+        for listener in list(self.listeners):
+            try:
+                listener(name, state)
+            except Exception as e:
+                print(f"Startup listener error: {e}")
+
+    def pending(self):
+        with self.lock:
+            return [name for name, stage in self.stages.items() if stage["state"] == "loading"]
+
+    def report(self):
+        with self.lock:
+            return {
+                "marks": dict(self.marks),
+                "subsystems": {
+                    name: dict(stage, load_ms=stage["ready_ms"] - stage["began_ms"] if stage["ready_ms"] else None)
+                    for name, stage in self.stages.items()
+                },
+            }
+
+    def summary(self):
+        report = self.report()
+        parts = [f"{name} {ms:.0f} ms" for name, ms in report["marks"].items()]
+        for name, stage in report["subsystems"].items():
+            if stage["state"] == "loading":
+                parts.append(f"{name} still loading")
+            else:
+                parts.append(f"{name} {stage['state']} at {stage['ready_ms']:.0f} ms (took {stage['load_ms']:.0f} ms)")
+        return ", ".join(parts)
+
+class Lazy:
+    """Stands in for an object that is expensive to create (imports, network clients).
+
+    The object is built on first attribute access, or ahead of time by calling load() from a
+    background thread; either way only once, and callers that arrive while it is loading wait.
+    """
+
+    def __init__(self, name, factory, profiler=None):
+        self._name = name
+        self._factory = profiler.timed(name, factory) if profiler else factory
+        self._lock = threading.Lock()
+        self._value = None
+
+    def load(self):
+        value = self._value
+        if value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self._factory()
+                value = self._value
+        return value
+
+    @property
+    def loaded(self):
+        return self._value is not None
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        if attribute.startswith("_"):
+            object.__setattr__(self, attribute, value)
+        else:
+            setattr(self.load(), attribute, value)
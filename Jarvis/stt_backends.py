@@ -0,0 +1,174 @@
+import os
+import glob
+import time
+import hashlib
+import threading
+import speech_recognition as sr
+
+class STTBackend:
+    """Turns sr.AudioData into text, raising sr.UnknownValueError or sr.RequestError like recognize_google"""
+    name = "base"
+
+    def recognize(self, audio):
+        raise NotImplementedError
+
+class GoogleBackend(STTBackend):
+    name = "google"
+
+    def __init__(self, language="en-US", timeout=5, endpoint=None):
+        self.language = language
+        self.endpoint = endpoint  # A local stand-in such as benchmarks/google_stubs.py
+        self.recognizer = sr.Recognizer()
+        self.recognizer.operation_timeout = timeout  # Fail over instead of hanging on a slow network
+
+    def recognize(self, audio):
+        if self.endpoint:
+            return self.recognizer.recognize_google(audio, language=self.language, endpoint=self.endpoint)
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+class SphinxBackend(STTBackend):
+    """Offline engine slot: CMU PocketSphinx through speech_recognition, if installed"""
+    name = "sphinx"
+
+    def __init__(self, language="en-US"):
+        import pocketsphinx  # noqa: F401  (raises ImportError when the engine is missing)
+        self.language = language
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+def audio_key(raw_data):
+    return hashlib.sha1(raw_data).hexdigest()
+
+class FixtureBackend(STTBackend):
+    """Local stand-in for tests and benchmarks.
+
+    Transcripts are looked up by a hash of the audio, loaded from <name>.wav + <name>.txt
+    pairs; unknown audio takes the next line of `script` if one is given. `latency` and
+    `error_rate` simulate a remote service.
+    """
+    name = "fixture"
+
+    def __init__(self, transcripts=None, script=None, latency=0.0, error_rate=0.0, seed=None):
+        import random
+        self.transcripts = dict(transcripts or {})
+        self.script = list(script or [])
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs):
+        transcripts = {}
+        for path in glob.glob(os.path.join(directory, '*.wav')):
+            text_path = os.path.splitext(path)[0] + '.txt'
+            if not os.path.exists(text_path):
+                continue
+            with sr.AudioFile(path) as source:
+                audio = sr.Recognizer().record(source)
+            with open(text_path, encoding='utf-8') as f:
+                transcripts[audio_key(audio.get_raw_data())] = f.read().strip()
+        return cls(transcripts, **kwargs)
+
+    def recognize(self, audio):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                raise sr.RequestError("Injected fixture backend failure")
+            text = self.transcripts.get(audio_key(audio.get_raw_data()))
+            if text is None and self.script:
+                text = self.script.pop(0)
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+class BackendStats:
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.unrecognized = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.consecutive_failures = 0
+        self.skip_until = 0.0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "unrecognized": self.unrecognized,
+            "mean_ms": self.total_time / self.calls * 1000 if self.calls else 0.0,
+            "last_ms": self.last_time * 1000,
+        }
+
+class STTChain:
+    """Tries backends in order; a failed backend is skipped for a while and the next one answers"""
+
+    def __init__(self, backends, cooldown=30.0, failures_before_cooldown=2):
+        if not backends:
+            raise ValueError("At least one speech recognition backend is required")
+        self.backends = backends
+        self.cooldown = cooldown
+        self.failures_before_cooldown = failures_before_cooldown
+        self.stats = {backend.name: BackendStats() for backend in backends}
+
+    def recognize(self, audio):
+        errors = []
+        now = time.time()
+        candidates = [b for b in self.backends if self.stats[b.name].skip_until <= now]
+        for backend in candidates or self.backends:
+            stats = self.stats[backend.name]
+            started = time.perf_counter()
+            try:
+                text = backend.recognize(audio)
+            except sr.UnknownValueError:
+                # The backend worked, there just wasn't any intelligible speech
+                self.record(stats, started, failed=False)
+                stats.unrecognized += 1
+                raise
+            except Exception as e:
+                self.record(stats, started, failed=True)
+                print(f"Speech backend {backend.name} failed: {e}")
+                errors.append(f"{backend.name}: {e}")
+                continue
+            self.record(stats, started, failed=False)
+            return text
+        raise sr.RequestError("All speech recognition backends failed (" + "; ".join(errors) + ")")
+
+    def record(self, stats, started, failed):
+        stats.last_time = time.perf_counter() - started
+        stats.total_time += stats.last_time
+        stats.calls += 1
+        if failed:
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if stats.consecutive_failures >= self.failures_before_cooldown:
+                stats.skip_until = time.time() + self.cooldown
+        else:
+            stats.consecutive_failures = 0
+            stats.skip_until = 0.0
+
+    def metrics(self):
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+def create_chain(names, fixture_dir=None, language="en-US", google_endpoint=None):
+    """Build a chain from a comma-separated list such as "google,sphinx"; unavailable engines are skipped"""
+    backends = []
+    for name in [n.strip() for n in names.split(',') if n.strip()]:
+        try:
+            if name == "google":
+                backends.append(GoogleBackend(language, endpoint=google_endpoint))
+            elif name == "sphinx":
+                backends.append(SphinxBackend(language))
+            elif name == "fixture":
+                backends.append(FixtureBackend.from_directory(fixture_dir) if fixture_dir else FixtureBackend())
+            else:
+                print(f"Unknown speech backend: {name}")
+        except ImportError as e:
+            print(f"Speech backend {name} is not available: {e}")
+    if not backends:
+        backends.append(GoogleBackend(language, endpoint=google_endpoint))
+    return STTChain(backends)
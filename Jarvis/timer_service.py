@@ -0,0 +1,164 @@
+import os
+import time
+import heapq
+import sqlite3
+import itertools
+import threading
+
+class Timer:
+    __slots__ = ("id", "due", "label", "alarm", "created", "late")
+
+    def __init__(self, id, due, label="", alarm=False, created=None):
+        self.id = id
+        self.due = due
+        self.label = label
+        self.alarm = bool(alarm)  # Set for a time of day rather than a duration
+        self.created = created or time.time()
+        self.late = False
+
+    @property
+    def remaining(self):
+        return max(0.0, self.due - time.time())
+
+    def __lt__(self, other):
+        return (self.due, self.id) < (other.due, other.id)
+
+    def __repr__(self):
+        return f"Timer({self.id}, due in {self.remaining:.0f}s, {self.label!r})"
+
+class TimerService:
+    """Timers and reminders on one scheduler thread, kept in a heap ordered by due time.
+
+    Pending timers are stored in SQLite (or kept in memory with path=None), so they survive a
+    restart; ones that fell due while Jarvis was closed fire as soon as it starts, marked late.
+    Cancelled timers stay in the heap and are skipped when they come up. `on_fire` is called on
+    the scheduler thread with every timer that is due.
+    """
+
+    def __init__(self, path=None, on_fire=None, max_wait=60.0):
+        self.on_fire = on_fire
+        self.max_wait = max_wait  # Re-check now and then in case the wall clock jumps
+        self.cond = threading.Condition()
+        self.heap = []
+        self.pending = {}
+        self.thread = None
+        self.stopping = False
+        self.fired = 0
+        self.cancelled = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS timers (
+                id INTEGER PRIMARY KEY,
+                due REAL NOT NULL,
+                label TEXT NOT NULL,
+                alarm INTEGER NOT NULL,
+                created REAL NOT NULL
+            )
+        """)
+        self.db.commit()
+        for row in self.db.execute("SELECT id, due, label, alarm, created FROM timers"):
+            timer = Timer(*row)
+            self.pending[timer.id] = timer
+            heapq.heappush(self.heap, timer)
+        self.ids = itertools.count(max(self.pending, default=0) + 1)
+
+    def start(self, on_fire=None):
+        if on_fire is not None:
+            self.on_fire = on_fire
+        with self.cond:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self.run, name="jarvis-timers", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.stopping = True
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join()
+
+    def add(self, seconds=None, at=None, label=""):
+        """Schedule a timer `seconds` from now or at the epoch time `at`"""
+        due = at if at is not None else time.time() + seconds
+        with self.cond:
+            timer = Timer(next(self.ids), due, label, alarm=at is not None)
+            self.db.execute("INSERT INTO timers VALUES (?, ?, ?, ?, ?)",
+                            (timer.id, timer.due, timer.label, timer.alarm, timer.created))
+            self.db.commit()
+            self.pending[timer.id] = timer
+            heapq.heappush(self.heap, timer)
+            if self.heap[0] is timer:
+                self.cond.notify()  # Sooner than what the scheduler is waiting for
+        return timer
+
+    def cancel(self, timer_id=None):
+        """Cancel one timer, or all of them without an id; returns the cancelled timers"""
+        with self.cond:
+            ids = list(self.pending) if timer_id is None else [timer_id] if timer_id in self.pending else []
+            cancelled = [self.pending.pop(i) for i in ids]
+            self.db.executemany("DELETE FROM timers WHERE id = ?", [(i,) for i in ids])
+            self.db.commit()
+            self.cancelled += len(cancelled)
+            if len(self.heap) > 2 * len(self.pending) + 64:
+                # Drop cancelled entries once they make up most of the heap
+                self.heap = list(self.pending.values())
+                heapq.heapify(self.heap)
+        return cancelled
+
+    def list(self):
+        """Pending timers, soonest first"""
+        with self.cond:
+            return sorted(self.pending.values())
+
+    def run(self):
+        while True:
+            with self.cond:
+                while True:
+                    if self.stopping:
+                        return
+                    while self.heap and self.heap[0].id not in self.pending:
+                        heapq.heappop(self.heap)  # Cancelled
+                    wait = self.heap[0].due - time.time() if self.heap else self.max_wait
+                    if wait <= 0:
+                        break
+                    self.cond.wait(min(wait, self.max_wait))
+                now = time.time()
+                due = []
+                while self.heap and self.heap[0].due <= now:
+                    timer = heapq.heappop(self.heap)
+                    if self.pending.pop(timer.id, None) is not None:
+                        due.append(timer)
+                self.db.executemany("DELETE FROM timers WHERE id = ?", [(timer.id,) for timer in due])
+                self.db.commit()
+
+            for timer in due:
+                lateness = now - timer.due
+                # Fired a while after it was due: Jarvis was closed or the machine was asleep
+                timer.late = lateness > 5.0
+                self.fired += 1
+                self.total_lateness += lateness
+                self.max_lateness = max(self.max_lateness, lateness)
+                if self.on_fire is not None:
+                    try:
+                        self.on_fire(timer)
+                    except Exception as e:
+                        print(f"Timer callback error: {e}")
+
+    def stats(self):
+        return {
+            "pending": len(self.pending),
+            "fired": self.fired,
+            "cancelled": self.cancelled,
+            "mean_lateness_ms": self.total_lateness / self.fired * 1000 if self.fired else 0.0,
+            "max_lateness_ms": self.max_lateness * 1000,
+        }
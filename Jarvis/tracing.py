@@ -0,0 +1,192 @@
+import json
+import time
+import uuid
+import threading
+from collections import deque
+
+class SpanTimer:
+    __slots__ = ("trace", "stage", "started")
+
+    def __init__(self, trace, stage):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        ended = time.perf_counter()
+        self.trace.spans.append((self.stage, (self.started - self.trace.started) * 1000,
+                                 (ended - self.started) * 1000, kind is not None))
+        return False
+
+class Trace:
+    """One question on its way from the microphone (or keyboard) to the speaker.
+
+    Spans are (stage, start ms, duration ms, failed) tuples, start relative to the trace. The
+    trace is recorded when finish() has been called and everything that hold() it (queued
+    sentences) has released it, so the speech of the last sentence is included.
+    """
+
+    def __init__(self, tracer, name, attrs, started=None):
+        self.tracer = tracer
+        self.id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        now = time.perf_counter()
+        self.started = now if started is None else started
+        self.created = time.time() - (now - self.started)
+        self.spans = []
+        self.holds = 1
+        self.duration = None
+
+    def span(self, stage):
+        """Time a block: with trace.span("translate"): ..."""
+        return SpanTimer(self, stage)
+
+    def add(self, stage, duration_ms, start_ms=None, failed=False):
+        """Record a stage that was timed elsewhere, ending now unless `start_ms` says otherwise"""
+        if start_ms is None:
+            start_ms = (time.perf_counter() - self.started) * 1000 - duration_ms
+        self.spans.append((stage, start_ms, duration_ms, failed))
+
+    def hold(self):
+        with self.tracer.lock:
+            self.holds += 1
+
+    def release(self):
+        with self.tracer.lock:
+            self.holds -= 1
+            if self.holds:
+                return
+        self.duration = (time.perf_counter() - self.started) * 1000
+        self.tracer.record(self)
+
+    def finish(self, **attrs):
+        self.attrs.update(attrs)
+        self.release()
+
+    def to_dict(self):
+        return {
+            "trace_id": self.id,
+            "name": self.name,
+            "created": self.created,
+            "total_ms": self.duration,
+            "attrs": self.attrs,
+            "spans": [{"stage": stage, "start_ms": start, "duration_ms": duration, "failed": failed}
+                      for stage, start, duration, failed in sorted(self.spans, key=lambda span: span[1])],
+        }
+
+class NullTrace:
+    """Stands in for a trace when tracing is off; every call does nothing"""
+    id = None
+    attrs = {}
+
+    def span(self, stage):
+        return NULL_SPAN
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        return False
+
+    def add(self, stage, duration_ms, start_ms=None, failed=False):
+        pass
+
+    def hold(self):
+        pass
+
+    def release(self):
+        pass
+
+    def finish(self, **attrs):
+        pass
+
+NULL_TRACE = NULL_SPAN = NullTrace()
+
+def percentile(values, fraction):
+    """The value `fraction` of the way through `values` (0.95 for p95), None when there are none"""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+class Tracer:
+    """Keeps the last `capacity` traces and the last `samples` durations of every stage.
+
+    Percentiles are computed when asked for, so recording a trace is a few appends. With
+    `path`, every recorded trace is also appended to that file as one JSON line.
+    """
+
+    def __init__(self, capacity=500, samples=2000, path=None, enabled=True):
+        self.enabled = enabled
+        self.samples = samples
+        self.lock = threading.Lock()
+        self.traces = deque(maxlen=capacity)
+        self.stages = {}
+        self.recorded = 0
+        self.path = path
+        self.file = None
+
+    def start(self, name, started=None, **attrs):
+        """A new trace, begun now or at perf_counter() time `started`"""
+        return Trace(self, name, attrs, started) if self.enabled else NULL_TRACE
+
+    def record(self, trace):
+        with self.lock:
+            self.traces.append(trace)
+            self.recorded += 1
+            for stage, _, duration, _ in trace.spans:
+                durations = self.stages.get(stage)
+                if durations is None:
+                    durations = self.stages[stage] = deque(maxlen=self.samples)
+                durations.append(duration)
+            durations = self.stages.get("total")
+            if durations is None:
+                durations = self.stages["total"] = deque(maxlen=self.samples)
+            durations.append(trace.duration)
+            if self.path:
+                try:
+                    if self.file is None:
+                        self.file = open(self.path, "a", encoding="utf-8", buffering=1)
+                    self.file.write(json.dumps(trace.to_dict()) + "\n")
+                except OSError as e:
+                    print(f"Could not write trace: {e}")
+                    self.path = None
+
+    def summary(self):
+        """{stage: count, mean, p50, p95, p99 and max in ms}, in the order stages were first seen"""
+        with self.lock:
+            stages = {stage: sorted(durations) for stage, durations in self.stages.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "mean_ms": sum(values) / len(values),
+                "p50_ms": percentile(values, 0.5),
+                "p95_ms": percentile(values, 0.95),
+                "p99_ms": percentile(values, 0.99),
+                "max_ms": values[-1],
+            }
+            for stage, values in stages.items() if values
+        }
+
+    def recent(self, count=20):
+        with self.lock:
+            return list(self.traces)[-count:][::-1]
+
+    def export(self, path):
+        """Write the buffered traces to `path` as JSON lines; returns how many"""
+        with self.lock:
+            traces = list(self.traces)
+        with open(path, "w", encoding="utf-8") as file:
+            for trace in traces:
+                file.write(json.dumps(trace.to_dict()) + "\n")
+        return len(traces)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,265 @@
+import os
+import json
+from array import array
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QTimer
+from PyQt6.QtGui import QColor, QPainter, QBrush, QLinearGradient, QFontMetrics
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+
+USER = "user"
+JARVIS = "jarvis"
+STATUS = "status"
+
+MessageRole = Qt.ItemDataRole.UserRole
+
+class Message:
+    __slots__ = ("seq", "text", "kind", "timestamp", "size")
+
+    def __init__(self, seq, text, kind, timestamp=None):
+        self.seq = seq
+        self.text = text
+        self.kind = kind
+        self.timestamp = timestamp or datetime.now().strftime("%H:%M")
+        self.size = None  # (view width, text width, text height, size hint) measured by the delegate
+
+    def to_json(self):
+        return json.dumps({"seq": self.seq, "text": self.text, "kind": self.kind, "timestamp": self.timestamp})
+
+    @classmethod
+    def from_json(cls, line):
+        data = json.loads(line)
+        return cls(data["seq"], data["text"], data["kind"], data["timestamp"])
+
+class TranscriptArchive:
+    """Spool of the messages that left the in-memory window.
+
+    One JSON line per message, in order, plus an in-memory table of line offsets so any
+    range can be read back with a single seek. The spool only lives for one session.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.file = open(os.path.join(directory, 'transcript.jsonl'), 'w+b')
+        self.offsets = array('q')
+        self.end = 0
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, message):
+        line = (message.to_json() + "\n").encode('utf-8')
+        self.file.seek(self.end)
+        self.file.write(line)
+        self.offsets.append(self.end)
+        self.end += len(line)
+
+    def read(self, start, stop):
+        if start >= stop:
+            return []
+        end = self.offsets[stop] if stop < len(self.offsets) else self.end
+        self.file.flush()
+        self.file.seek(self.offsets[start])
+        data = self.file.read(end - self.offsets[start])
+        return [Message.from_json(line) for line in data.decode('utf-8').splitlines()]
+
+    def close(self):
+        self.file.close()
+
+class TranscriptModel(QAbstractListModel):
+    """The newest messages of the conversation; older ones are paged in from the archive on demand"""
+
+    def __init__(self, archive=None, max_rows=200, page=100, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.max_rows = max_rows
+        self.page = page
+        self.rows = []
+        self.first = 0  # seq of rows[0]
+        self.next_seq = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message.text
+        if role == MessageRole:
+            return message
+        return None
+
+    def append(self, text, kind, trim=True, timestamp=None):
+        message = Message(self.next_seq, text, kind, timestamp)
+        self.next_seq += 1
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(message)
+        self.endInsertRows()
+        if trim:
+            self.trim()
+        return message.seq
+
+    def set_text(self, seq, text):
+        row = seq - self.first
+        if 0 <= row < len(self.rows):
+            self.rows[row].text = text
+            self.rows[row].size = None
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def trim(self):
+        # Drop a whole page at a time so appending stays O(1) amortized
+        if len(self.rows) <= self.max_rows + self.page:
+            return
+        count = len(self.rows) - self.max_rows
+        if self.archive is not None:
+            for message in self.rows[:count]:
+                if message.seq >= len(self.archive):
+                    self.archive.append(message)
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        del self.rows[:count]
+        self.first += count
+        self.endRemoveRows()
+
+    def can_load_older(self):
+        return self.archive is not None and self.first > 0
+
+    def load_older(self):
+        """Prepend the previous page from the archive; returns how many rows were added"""
+        if not self.can_load_older():
+            return 0
+        start = max(0, self.first - self.page)
+        messages = self.archive.read(start, self.first)
+        self.beginInsertRows(QModelIndex(), 0, len(messages) - 1)
+        self.rows[:0] = messages
+        self.first = start
+        self.endInsertRows()
+        return len(messages)
+
+class MessageDelegate(QStyledItemDelegate):
+    """Paints chat bubbles; sizes are measured once per message and width"""
+
+    PAD_X = 20
+    PAD_Y = 12
+    MARGIN = 8
+    STAMP_HEIGHT = 18
+
+    def text_width(self, width, message):
+        if message.kind == STATUS:
+            return max(50, width - 2 * self.PAD_X)
+        return max(50, int(width * 0.85) - 2 * self.PAD_X)
+
+    def measure(self, message, font, width):
+        if message.size is None or message.size[0] != width:
+            metrics = QFontMetrics(font)
+            bounds = metrics.boundingRect(QRect(0, 0, self.text_width(width, message), 100000),
+                                          Qt.TextFlag.TextWordWrap, message.text)
+            if message.kind == STATUS:
+                height = bounds.height() + 2 * self.MARGIN
+            else:
+                height = bounds.height() + 2 * self.PAD_Y + self.STAMP_HEIGHT + 2 * self.MARGIN
+            message.size = (width, bounds.width(), bounds.height(), QSize(width, height))
+        return message.size
+
+    def sizeHint(self, option, index):
+        # Called for every row on each relayout, so skip the model's data() round trip
+        view = self.parent()
+        message = view.transcript.rows[index.row()]
+        return self.measure(message, option.font, view.viewport().width())[3]
+
+    def paint(self, painter, option, index):
+        message = index.data(MessageRole)
+        rect = option.rect
+        _, text_width, text_height, _ = self.measure(message, option.font, rect.width())
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(option.font)
+
+        if message.kind == STATUS:
+            painter.setPen(QColor("#888888"))
+            painter.drawText(QRect(rect.left() + self.PAD_X, rect.top() + self.MARGIN, text_width + 1, text_height),
+                             Qt.TextFlag.TextWordWrap, message.text)
+            painter.restore()
+            return
+
+        bubble_width = text_width + 2 * self.PAD_X
+        bubble_height = text_height + 2 * self.PAD_Y
+        left = rect.right() - self.MARGIN - bubble_width if message.kind == USER else rect.left() + self.MARGIN
+        bubble = QRect(left, rect.top() + self.MARGIN, bubble_width, bubble_height)
+        if message.kind == USER:
+            gradient = QLinearGradient(bubble.topLeft().toPointF(), bubble.bottomRight().toPointF())
+            gradient.setColorAt(0, QColor("#3498db"))
+            gradient.setColorAt(1, QColor("#2980b9"))
+            painter.setBrush(QBrush(gradient))
+        else:
+            painter.setBrush(QBrush(QColor("#2c3e50")))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(bubble, 16, 16)
+
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(bubble.adjusted(self.PAD_X, self.PAD_Y, -self.PAD_X + 1, -self.PAD_Y),
+                         Qt.TextFlag.TextWordWrap, message.text)
+
+        stamp_font = painter.font()
+        if stamp_font.pixelSize() > 0:
+            stamp_font.setPixelSize(max(1, round(stamp_font.pixelSize() * 0.8)))
+        else:
+            stamp_font.setPointSizeF(stamp_font.pointSizeF() * 0.8)
+        painter.setFont(stamp_font)
+        painter.setPen(QColor("#888888"))
+        align = Qt.AlignmentFlag.AlignRight if message.kind == USER else Qt.AlignmentFlag.AlignLeft
+        painter.drawText(QRect(bubble.left(), bubble.bottom() + 2, bubble.width(), self.STAMP_HEIGHT),
+                         align | Qt.AlignmentFlag.AlignVCenter, message.timestamp)
+        painter.restore()
+
+class TranscriptView(QListView):
+    """Chat transcript that only lays out the messages it holds and keeps following the newest one"""
+
+    def __init__(self, archive=None, max_rows=200, page=100, parent=None):
+        super().__init__(parent)
+        self.transcript = TranscriptModel(archive, max_rows, page, self)
+        self.setModel(self.transcript)
+        self.setItemDelegate(MessageDelegate(self))
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(False)
+        self.follow_pending = False
+        self.verticalScrollBar().valueChanged.connect(self.scrolled)
+
+    def at_bottom(self):
+        scrollbar = self.verticalScrollBar()
+        return self.follow_pending or scrollbar.value() >= scrollbar.maximum() - 4
+
+    def follow(self):
+        # Scrolling forces a relayout, so do it once per event loop turn rather than per message
+        if not self.follow_pending:
+            self.follow_pending = True
+            QTimer.singleShot(0, self.scroll_to_newest)
+
+    def scroll_to_newest(self):
+        self.follow_pending = False
+        self.scrollToBottom()
+
+    def add(self, text, kind, timestamp=None):
+        # While the user reads older messages, don't trim them away or jump to the bottom
+        follow = self.at_bottom()
+        seq = self.transcript.append(text, kind, trim=follow, timestamp=timestamp)
+        if follow:
+            self.follow()
+        return seq
+
+    def update_message(self, seq, text):
+        follow = self.at_bottom()
+        self.transcript.set_text(seq, text)
+        if follow:
+            self.follow()
+
+    def scrolled(self, value):
+        if value == self.verticalScrollBar().minimum() and self.transcript.can_load_older():
+            added = self.transcript.load_older()
+            # Keep the message that was at the top in place
+            self.scrollTo(self.transcript.index(added), QAbstractItemView.ScrollHint.PositionAtTop)
@@ -0,0 +1,202 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+
+# Common English words; a question made mostly of these doesn't need translating
+ENGLISH_WORDS = {
+    "a", "about", "after", "all", "am", "an", "and", "any", "are", "as", "at", "be", "been",
+    "before", "biggest", "but", "by", "can", "capital", "city", "could", "country", "day", "did",
+    "do", "does", "for", "from", "get", "give", "had", "has", "have", "he", "her", "him", "his",
+    "how", "i", "if", "in", "into", "is", "it", "its", "just", "largest", "list", "many", "me",
+    "more", "most", "much", "music", "my", "name", "new", "no", "not", "now", "of", "on", "one",
+    "or", "our", "people", "play", "please", "population", "set", "she", "should", "show", "size",
+    "so", "some", "tell", "than", "thank", "thanks", "that", "the", "their", "them", "then",
+    "there", "these", "they", "this", "time", "timer", "to", "today", "top", "up", "us", "was",
+    "we", "weather", "were", "what", "when", "where", "which", "who", "why", "will", "with",
+    "world", "would", "you", "your",
+}
+
+# Frequent words of other languages that would otherwise pass as English
+FOREIGN_WORDS = {
+    "como", "cual", "cuál", "cuanto", "de", "del", "der", "die", "das", "und", "ist", "nicht",
+    "wie", "wer", "wo", "el", "la", "los", "las", "es", "est", "et", "le", "les", "une", "un",
+    "que", "qui", "quoi", "pour", "por", "para", "y", "qual", "quem", "onde", "il", "di", "che",
+    "chi", "dove", "hai", "kya", "hain", "mujhe", "welche", "quelle", "quel",
+}
+
+def looks_english(text):
+    """Cheap language-ID heuristic: ASCII-only and dominated by common English words"""
+    letters = [c for c in text if c.isalpha()]
+    if any(ord(c) > 127 for c in letters):
+        return False
+    words = re.findall(r"[a-z']+", text.lower())
+    if not words:
+        return True
+    english = sum(word in ENGLISH_WORDS for word in words)
+    foreign = sum(word in FOREIGN_WORDS for word in words)
+    return english > foreign and english / len(words) >= 0.3
+
+class TranslationStore:
+    """On-disk translation memory with least-recently-used eviction"""
+
+    def __init__(self, path, max_entries=10000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT PRIMARY KEY,
+                translated TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS translations_lru ON translations (last_used)")
+        self.db.commit()
+        self.count = self.db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def get(self, source):
+        with self.lock:
+            row = self.db.execute("SELECT translated FROM translations WHERE source = ?", (source,)).fetchone()
+            if row is not None:
+                self.db.execute("UPDATE translations SET last_used = ? WHERE source = ?", (time.time(), source))
+                self.db.commit()
+        return row[0] if row else None
+
+    def put_many(self, pairs):
+        now = time.time()
+        with self.lock:
+            for source, translated in pairs:
+                exists = self.db.execute("SELECT 1 FROM translations WHERE source = ?", (source,)).fetchone()
+                self.db.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?)", (source, translated, now))
+                if not exists:
+                    self.count += 1
+            if self.count > self.max_entries:
+                excess = self.count - int(self.max_entries * 0.9)
+                self.count -= self.db.execute(
+                    "DELETE FROM translations WHERE source IN "
+                    "(SELECT source FROM translations ORDER BY last_used LIMIT ?)", (excess,)
+                ).rowcount
+            self.db.commit()
+
+class PendingTranslation:
+    def __init__(self, text):
+        self.text = text
+        self.result = None
+        self.done = False
+
+class Translator:
+    """Translates to English over one keep-alive HTTP session.
+
+    Text that already looks English is returned as is, earlier translations come from disk,
+    and questions that arrive while a request is in flight are sent together in the next one.
+    """
+
+    ENDPOINT = "https://translate.googleapis.com/translate_a/single"
+
+    def __init__(self, store, endpoint=None, timeout=5):
+        self.store = store
+        self.endpoint = endpoint or self.ENDPOINT
+        self.timeout = timeout
+        import requests  # Deferred until a translator is built, since requests is slow to import
+        self.session = requests.Session()
+        self.fallback = None
+        self.cond = threading.Condition()
+        self.waiting = []
+        self.in_flight = False
+
+        self.requests = 0
+        self.translated = 0
+        self.skipped_english = 0
+        self.cache_hits = 0
+
+    def resolve_locally(self, text):
+        if not text.strip() or looks_english(text):
+            self.skipped_english += 1
+            return text
+        cached = self.store.get(text)
+        if cached is not None:
+            self.cache_hits += 1
+        return cached
+
+    def translate(self, text):
+        resolved = self.resolve_locally(text)
+        if resolved is not None:
+            return resolved
+
+        pending = PendingTranslation(text)
+        with self.cond:
+            self.waiting.append(pending)
+            while not pending.done:
+                if self.in_flight:
+                    self.cond.wait()
+                    continue
+                # Nobody is talking to the server: take everything that is waiting in one request
+                self.in_flight = True
+                batch, self.waiting = self.waiting, []
+                self.cond.release()
+                try:
+                    self.fill(batch)
+                finally:
+                    self.cond.acquire()
+                    self.in_flight = False
+                    self.cond.notify_all()
+        return pending.result
+
+    def fill(self, batch):
+        sources = list(dict.fromkeys(pending.text for pending in batch))
+        try:
+            translations = self.request(sources)
+            self.store.put_many(zip(sources, translations))
+        except Exception as e:
+            print(f"Translation error: {e}")
+            translations = [self.translate_fallback(source) for source in sources]
+        by_source = dict(zip(sources, translations))
+        for pending in batch:
+            pending.result = by_source[pending.text]
+            pending.done = True
+
+    def request(self, sources):
+        # Line breaks separate the texts of a batch, so they can't appear inside one
+        lines = [" ".join(source.split()) for source in sources]
+        self.requests += 1
+        self.translated += len(lines)
+        response = self.session.get(
+            self.endpoint,
+            params={"client": "gtx", "sl": "auto", "tl": "en", "dt": "t", "q": "\n".join(lines)},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        text = "".join(segment[0] for segment in response.json()[0] if segment[0])
+        parts = [part.strip() for part in text.split("\n")]
+        if len(parts) != len(lines):
+            raise ValueError(f"Expected {len(lines)} translations, got {len(parts)}")
+        return parts
+
+    def translate_fallback(self, text):
+        try:
+            if self.fallback is None:
+                from deep_translator import GoogleTranslator
+                self.fallback = GoogleTranslator(source='auto', target='en')
+            self.requests += 1
+            return self.fallback.translate(text)
+        except Exception:
+            return text
+
+    def stats(self):
+        # Without this layer every question would have cost one round trip
+        questions = self.skipped_english + self.cache_hits + self.translated
+        return {
+            "questions": questions,
+            "round_trips": self.requests,
+            "round_trips_saved": questions - self.requests,
+            "skipped_english": self.skipped_english,
+            "cache_hits": self.cache_hits,
+            "batched": self.translated,
+        }
@@ -0,0 +1,204 @@
+import os
+import re
+import time
+import queue
+import itertools
+import threading
+from collections import OrderedDict
+
+# Utterance priorities, lower is spoken first
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n+')
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_BREAK.split(text) if sentence.strip()]
+
+def clean_for_speech(text):
+    # Remove URLs and technical symbols for better speech
+    return re.sub(r'http\S+|www.\S+|\n|Source:', '', text)
+
+def voice_key(engine):
+    return "|".join(str(engine.getProperty(name)) for name in ("voice", "rate", "volume"))
+
+def initialize_com():
+    """Call on the thread that will own the speech engine before creating it"""
+    if os.name == 'nt':
+        # SAPI5 is a COM object and needs COM initialized on the thread that owns it
+        import comtypes
+        comtypes.CoInitialize()
+
+class Utterance:
+    def __init__(self, text, generation, max_age, trace=None):
+        self.text = text
+        self.generation = generation
+        self.created = time.time()
+        self.max_age = max_age
+        self.trace = trace
+
+class TTSWorker(threading.Thread):
+    """Owns the pyttsx3 engine and speaks queued utterances one sentence at a time.
+
+    barge_in() drops everything queued and stops the current sentence; utterances that
+    waited longer than their max_age are skipped as stale. With an audio cache, sentences
+    that were rendered before are played from disk, `prerender` phrases are rendered at
+    startup and other sentences are rendered whenever the worker is idle. When the engine
+    can't be created (pyttsx3 without eSpeak, say) the worker becomes unavailable: queued
+    sentences are dropped and say() returns without queuing anything.
+    """
+
+    def __init__(self, engine_factory, max_age=30.0, audio_cache=None, player=None, prerender=(),
+                 max_cached_chars=300):
+        super().__init__(name="jarvis-tts", daemon=True)
+        self.engine_factory = engine_factory
+        self.max_age = max_age
+        self.audio_cache = audio_cache if player is not None and player.available else None
+        self.player = player
+        self.max_cached_chars = max_cached_chars
+        self.renders = OrderedDict()
+        if self.audio_cache:
+            for phrase in prerender:
+                for sentence in split_sentences(clean_for_speech(phrase)):
+                    self.renders[sentence] = True
+        self.engine = None
+        self.available = True
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.outstanding = 0
+        self.started_once = False
+
+        self.spoken = 0
+        self.dropped = 0
+        self.total_latency = 0.0
+        self.last_latency = 0.0
+        self.max_depth = 0
+
+    def ensure_started(self):
+        with self.lock:
+            if self.started_once:
+                return
+            self.started_once = True
+        self.start()
+
+    def say(self, text, priority=NORMAL, max_age=None, trace=None):
+        """Queue `text` sentence by sentence; a trace is held until its sentences are spoken or dropped"""
+        self.ensure_started()
+        if not self.available:
+            return
+        sentences = split_sentences(clean_for_speech(text))
+        with self.lock:
+            generation = self.generation
+            self.outstanding += len(sentences)
+        for sentence in sentences:
+            if trace is not None:
+                trace.hold()
+            utterance = Utterance(sentence, generation, max_age or self.max_age, trace)
+            self.queue.put((priority, next(self.sequence), utterance))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def barge_in(self):
+        """Cancel the sentence being spoken and everything still queued"""
+        with self.lock:
+            self.generation += 1
+        engine = self.engine
+        if engine is not None:
+            try:
+                engine.stop()
+            except Exception as e:
+                print(f"Could not interrupt speech: {e}")
+        if self.player is not None:
+            self.player.stop()
+
+    def wait_until_idle(self, timeout=None):
+        with self.idle:
+            return self.idle.wait_for(lambda: self.outstanding == 0, timeout)
+
+    def run(self):
+        initialize_com()
+        self.engine = self.open_engine()
+        if self.engine is not None and self.audio_cache:
+            self.audio_cache.voice_key = voice_key(self.engine)
+
+        while True:
+            try:
+                # Render cached audio while there is nothing to say
+                _, _, utterance = self.queue.get(timeout=0.2 if self.renders else None)
+            except queue.Empty:
+                self.render_next()
+                continue
+            trace = utterance.trace
+            try:
+                if (self.engine is None or utterance.generation < self.generation
+                        or time.time() - utterance.created > utterance.max_age):
+                    self.dropped += 1
+                    continue
+                self.last_latency = time.time() - utterance.created
+                self.total_latency += self.last_latency
+                self.spoken += 1
+                if trace is None:
+                    self.speak_now(utterance.text)
+                else:
+                    trace.add("speech_wait", self.last_latency * 1000)
+                    with trace.span("speak"):
+                        self.speak_now(utterance.text)
+            finally:
+                if trace is not None:
+                    trace.release()
+                with self.idle:
+                    self.outstanding -= 1
+                    if self.outstanding == 0:
+                        self.idle.notify_all()
+
+    def open_engine(self):
+        """A new engine, or None (and the worker unavailable) when the factory fails"""
+        try:
+            return self.engine_factory()
+        except Exception as e:
+            print(f"Speech output unavailable: {e}")
+            self.available = False
+            self.renders.clear()
+            return None
+
+    def speak_now(self, text):
+        if self.audio_cache:
+            path = self.audio_cache.get(text)
+            if path:
+                try:
+                    self.player.play(path)
+                    return
+                except Exception as e:
+                    print(f"Audio playback error: {e}")
+            elif len(text) <= self.max_cached_chars:
+                self.renders[text] = True
+
+        try:
+            self.engine.say(text)
+            self.engine.runAndWait()
+        except Exception as e:
+            print(f"Speech synthesis error: {e}")
+            self.engine = self.open_engine()
+
+    def render_next(self):
+        text, _ = self.renders.popitem(last=False)
+        if os.path.exists(self.audio_cache.path_for(text)):
+            return
+        try:
+            self.audio_cache.render(self.engine, text)
+        except Exception as e:
+            print(f"Could not render speech to the audio cache: {e}")
+
+    def metrics(self):
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "spoken": self.spoken,
+            "dropped": self.dropped,
+            "mean_latency_ms": self.total_latency / self.spoken * 1000 if self.spoken else 0.0,
+            "last_latency_ms": self.last_latency * 1000,
+            "audio_cache": self.audio_cache.stats() if self.audio_cache else None,
+        }
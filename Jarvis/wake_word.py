@@ -0,0 +1,218 @@
+import os
+import glob
+import wave
+import numpy as np
+
+class WakeWordDetector:
+    """Consumes raw 16-bit mono microphone frames and reports when the wake word was heard"""
+
+    def process(self, frame):
+        raise NotImplementedError
+
+    def reset(self):
+        pass
+
+def read_wav(path):
+    with wave.open(path, 'rb') as wav:
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+def trim_silence(samples, block, ratio=0.1):
+    """Drop leading and trailing blocks much quieter than the loudest one"""
+    usable = len(samples) - len(samples) % block
+    if usable == 0:
+        return samples
+    rms = np.sqrt(np.mean(samples[:usable].astype(np.float64).reshape(-1, block) ** 2, axis=1))
+    voiced = np.nonzero(rms >= rms.max() * ratio)[0]
+    return samples[voiced[0] * block:(voiced[-1] + 1) * block]
+
+def hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+def mel_to_hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+class MFCC:
+    """Minimal MFCC front end (25 ms windows, 10 ms hop, cepstral mean normalization)"""
+
+    def __init__(self, sample_rate, n_mels=26, n_coeffs=13, max_hz=8000):
+        self.sample_rate = sample_rate
+        self.frame_length = int(0.025 * sample_rate)
+        self.hop = int(0.010 * sample_rate)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hamming(self.frame_length)
+
+        # Triangular mel filterbank
+        top = min(max_hz, sample_rate / 2)
+        mel_points = np.linspace(hz_to_mel(0), hz_to_mel(top), n_mels + 2)
+        bins = np.floor((self.n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+        self.filters = np.zeros((n_mels, self.n_fft // 2 + 1))
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                self.filters[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                self.filters[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+
+        # DCT-II basis, skipping c0 (overall loudness)
+        n = np.arange(n_mels)
+        k = np.arange(1, n_coeffs)[:, None]
+        self.dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+
+    def __call__(self, samples):
+        samples = samples.astype(np.float64)
+        samples = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+        if len(samples) < self.frame_length:
+            samples = np.pad(samples, (0, self.frame_length - len(samples)))
+        count = 1 + (len(samples) - self.frame_length) // self.hop
+        index = np.arange(self.frame_length)[None, :] + self.hop * np.arange(count)[:, None]
+        frames = samples[index] * self.window
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2 / self.n_fft
+        energies = np.log(np.maximum(power @ self.filters.T, 1e-10))
+        features = energies @ self.dct.T
+        return features - features.mean(axis=0)
+
+def dtw_distance(template, segment):
+    """Subsequence-start DTW: template aligned against a prefix of the segment, normalized by path length"""
+    cost = np.sqrt(((template[:, None, :] - segment[None, :, :]) ** 2).sum(axis=2))
+    rows, cols = cost.shape
+    previous = np.cumsum(cost[0])
+    for i in range(1, rows):
+        row_cost = cost[i]
+        # best of diagonal and vertical predecessors
+        from_above = np.minimum(previous, np.concatenate(([np.inf], previous[:-1])))
+        total = np.cumsum(row_cost)
+        # horizontal moves within the row, solved with a running minimum
+        previous = total + np.minimum.accumulate(from_above - total + row_cost)
+    # The wake word may be followed by more speech, so any end point from half to 1.5x the template counts
+    lengths = np.arange(1, cols + 1)
+    lo, hi = max(1, rows // 2), min(cols, int(rows * 1.5))
+    if hi < lo:
+        return np.inf
+    return float(np.min(previous[lo - 1:hi] / (rows + lengths[lo - 1:hi])))
+
+class TemplateWakeWordDetector(WakeWordDetector):
+    """Energy-gated keyword spotter matching MFCCs of speech segments against recorded templates with DTW"""
+
+    def __init__(self, templates, sample_rate, threshold=None, noise_ratio=3.0, min_rms=150.0,
+                 hangover=0.25, pre_roll=0.15):
+        self.sample_rate = sample_rate
+        self.mfcc = MFCC(sample_rate)
+        self.block = self.mfcc.hop
+        self.templates = [self.mfcc(trim_silence(samples, self.block)) for samples in templates]
+        self.threshold = threshold or self.calibrate()
+        self.noise_ratio = noise_ratio
+        self.min_rms = min_rms
+        self.hangover_blocks = int(hangover * sample_rate / self.block)
+        self.pre_roll_blocks = int(pre_roll * sample_rate / self.block)
+        # Decide early once the segment is comfortably longer than any template
+        self.decide_blocks = int(max(len(t) for t in self.templates) * 1.5)
+        self.last_distance = None
+        self.reset()
+
+    def calibrate(self, margin=1.25, default=25.0):
+        # Templates of the same word should be close to each other; accept anything about as close
+        distances = [
+            dtw_distance(a, b)
+            for i, a in enumerate(self.templates)
+            for j, b in enumerate(self.templates) if i != j
+        ]
+        distances = [d for d in distances if np.isfinite(d)]
+        return max(distances) * margin if distances else default
+
+    def reset(self):
+        self.pending = np.zeros(0, dtype=np.int16)
+        self.history = []
+        self.segment = []
+        self.silent_blocks = 0
+        self.decided = False
+        self.noise_floor = None
+
+    def process(self, frame):
+        samples = np.frombuffer(frame, dtype=np.int16)
+        if len(self.pending):
+            samples = np.concatenate((self.pending, samples))
+        usable = len(samples) - len(samples) % self.block
+        self.pending = samples[usable:]
+        detected = False
+        for block in samples[:usable].reshape(-1, self.block):
+            detected = self.process_block(block) or detected
+        return detected
+
+    def process_block(self, block):
+        rms = float(np.sqrt(np.mean(block.astype(np.float64) ** 2)))
+        if self.noise_floor is None:
+            self.noise_floor = rms
+        loud = rms > max(self.noise_floor * self.noise_ratio, self.min_rms)
+
+        if not self.segment:
+            if not loud:
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+                self.history = (self.history + [block])[-self.pre_roll_blocks:] if self.pre_roll_blocks else []
+                return False
+            self.segment = self.history + [block]
+            self.history = []
+            self.silent_blocks = 0
+            self.decided = False
+            return False
+
+        self.segment.append(block)
+        self.silent_blocks = 0 if loud else self.silent_blocks + 1
+        ended = self.silent_blocks >= self.hangover_blocks
+        detected = False
+        if not self.decided and (ended or len(self.segment) >= self.decide_blocks):
+            self.decided = True
+            detected = self.matches(np.concatenate(self.segment))
+        if ended:
+            self.segment = []
+        return detected
+
+    def matches(self, samples):
+        features = self.mfcc(trim_silence(samples, self.block))
+        self.last_distance = min(dtw_distance(template, features) for template in self.templates)
+        return self.last_distance <= self.threshold
+
+def load_templates(directory, sample_rate):
+    templates = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.wav'))):
+        samples, rate = read_wav(path)
+        if rate != sample_rate:
+            # Linear resampling is plenty for MFCC matching
+            positions = np.arange(0, len(samples), rate / sample_rate)
+            samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+        templates.append(samples)
+    return templates
+
+def create_detector(directory, sample_rate, threshold=None):
+    """Template detector for the recordings in `directory`, or None when there are none"""
+    if not directory or not os.path.isdir(directory):
+        return None
+    templates = load_templates(directory, sample_rate)
+    if not templates:
+        return None
+    return TemplateWakeWordDetector(templates, sample_rate, threshold=threshold)
+
+def record_templates(directory, count=5):
+    """Record a few examples of the wake word from the default microphone"""
+    import speech_recognition as sr
+    os.makedirs(directory, exist_ok=True)
+    recognizer = sr.Recognizer()
+    with sr.Microphone(sample_rate=16000) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        for i in range(count):
+            input(f"Press Enter and say 'Jarvis' ({i + 1}/{count})...")
+            audio = recognizer.listen(source, phrase_time_limit=2)
+            path = os.path.join(directory, f"jarvis_{i + 1}.wav")
+            with open(path, 'wb') as f:
+                f.write(audio.get_wav_data(convert_rate=16000, convert_width=2))
+            print(f"Saved {path}")
+
+if __name__ == "__main__":
+    import sys
+    record_templates(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.expanduser('~'), '.jarvis', 'wake_word'))
@@ -0,0 +1,236 @@
+import os
+import re
+import csv
+import mmap
+import struct
+import difflib
+import threading
+import unicodedata
+
+# Compiled table layout (little-endian):
+#   header   magic, country count, alias count, offsets of the three sections
+#   records  one fixed-size record per country: name and capital as (offset, length) into the
+#            string pool, area in km², population
+#   aliases  (key offset, key length, country) sorted by key bytes, so lookups are a binary search
+#   strings  UTF-8 text
+MAGIC = b"JWFACTS1"
+HEADER = struct.Struct("<8sIIIII")
+RECORD = struct.Struct("<IHIHdQ")
+ALIAS = struct.Struct("<IHH")
+
+# Words that can follow a place name without being part of it ("germany in square kilometers",
+# but not "mexico city")
+TRAILING_WORDS = {"in", "as", "at", "by", "on", "per", "for", "according", "compared", "right", "today", "now", "currently"}
+
+BUNDLED_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "world_facts.csv")
+
+def name_key(name):
+    """Lowercase ASCII words: "the Côte d'Ivoire" and "cote divoire" share a key"""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).lower()
+    name = name.replace("'", "").replace("ʻ", "").replace("&", " and ")
+    words = re.findall(r"\w+", name)
+    if words and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(line for line in f if not line.startswith("#"))
+        return [
+            (row["name"], row["capital"], float(row["area_km2"]), int(row["population"]),
+             [alias for alias in row["aliases"].split("|") if alias])
+            for row in rows
+        ]
+
+def compile_facts(csv_path, bin_path):
+    """Pack the CSV fact table into the binary format WorldFacts maps"""
+    strings = bytearray()
+    offsets = {}
+
+    def intern(text):
+        data = text.encode("utf-8")
+        if data not in offsets:
+            offsets[data] = len(strings)
+            strings.extend(data)
+        return offsets[data], len(data)
+
+    records = []
+    aliases = {}
+    for index, (name, capital, area, population, names) in enumerate(read_csv(csv_path)):
+        records.append(RECORD.pack(*intern(name), *intern(capital), area, population))
+        for alias in [name] + names:
+            key = name_key(alias).encode("utf-8")
+            if key and key not in aliases:
+                aliases[key] = index
+
+    alias_entries = [ALIAS.pack(*intern(key.decode("utf-8")), aliases[key]) for key in sorted(aliases)]
+    records_at = HEADER.size
+    aliases_at = records_at + RECORD.size * len(records)
+    strings_at = aliases_at + ALIAS.size * len(alias_entries)
+    header = HEADER.pack(MAGIC, len(records), len(alias_entries), records_at, aliases_at, strings_at)
+
+    directory = os.path.dirname(bin_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = bin_path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header + b"".join(records) + b"".join(alias_entries) + bytes(strings))
+    os.replace(temporary, bin_path)
+
+class Country:
+    __slots__ = ("name", "capital", "area", "population")
+
+    def __init__(self, name, capital, area, population):
+        self.name = name
+        self.capital = capital
+        self.area = area
+        self.population = population
+
+def format_population(population):
+    if population >= 1_000_000_000:
+        return f"{population / 1_000_000_000:.2f}".rstrip("0").rstrip(".") + " billion"
+    if population >= 1_000_000:
+        return f"{population / 1_000_000:.1f}".rstrip("0").rstrip(".") + " million"
+    return f"{population:,}"
+
+def format_area(area):
+    return f"{area:,.0f}" if area >= 10 else f"{area:g}"
+
+class WorldFacts:
+    """Country capitals, areas and populations from a memory-mapped table.
+
+    Places are found by exact key, then without trailing words ("germany in square
+    kilometers"), then by close spelling ("philipines"). Nothing is loaded up front except the
+    mapping itself; only the fuzzy fallback reads every alias, once.
+    """
+
+    CATEGORIES = ("capital", "area", "population")
+
+    def __init__(self, bin_path, fuzzy_cutoff=0.85):
+        with open(bin_path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.alias_count, self.records_at, self.aliases_at, self.strings_at = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{bin_path} is not a compiled fact table")
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.keys = None
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.fuzzy_hits = 0
+
+    @classmethod
+    def open(cls, csv_path=BUNDLED_CSV, bin_path=None, **kwargs):
+        """Map the compiled table, compiling it first when it is missing or older than the CSV"""
+        bin_path = bin_path or os.path.splitext(csv_path)[0] + ".bin"
+        if not os.path.exists(bin_path) or os.path.getmtime(bin_path) < os.path.getmtime(csv_path):
+            compile_facts(csv_path, bin_path)
+        return cls(bin_path, **kwargs)
+
+    def string(self, offset, length):
+        start = self.strings_at + offset
+        return self.map[start:start + length].decode("utf-8")
+
+    def alias(self, position):
+        offset, length, country = ALIAS.unpack_from(self.map, self.aliases_at + position * ALIAS.size)
+        start = self.strings_at + offset
+        return self.map[start:start + length], country
+
+    def country(self, index):
+        name_at, name_length, capital_at, capital_length, area, population = \
+            RECORD.unpack_from(self.map, self.records_at + index * RECORD.size)
+        return Country(self.string(name_at, name_length), self.string(capital_at, capital_length), area, population)
+
+    def find_key(self, key):
+        data = key.encode("utf-8")
+        lo, hi = 0, self.alias_count
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.alias(middle)[0] < data:
+                lo = middle + 1
+            else:
+                hi = middle
+        if lo < self.alias_count:
+            found, country = self.alias(lo)
+            if found == data:
+                return country
+        return None
+
+    def find(self, place):
+        """The Country a place name refers to, or None"""
+        key = name_key(place)
+        if not key:
+            return None
+        words = key.split()
+        candidates = [" ".join(words[:end]) for end in range(len(words), 0, -1)
+                      if end == len(words) or words[end] in TRAILING_WORDS]
+        for candidate in candidates:
+            index = self.find_key(candidate)
+            if index is not None:
+                return self.country(index)
+        with self.lock:
+            if self.keys is None:
+                self.keys = [self.alias(i)[0].decode("utf-8") for i in range(self.alias_count)]
+        for candidate in candidates:
+            close = difflib.get_close_matches(candidate, self.keys, n=1, cutoff=self.fuzzy_cutoff)
+            if close:
+                self.fuzzy_hits += 1
+                return self.country(self.find_key(close[0]))
+        return None
+
+    def answer(self, category, place):
+        """A spoken answer for a capital/area/population question about `place`, or None"""
+        if category not in self.CATEGORIES:
+            return None
+        self.lookups += 1
+        country = self.find(place) if place else None
+        if country is None:
+            return None
+        self.hits += 1
+        if category == "capital":
+            return f"The capital of {country.name} is {country.capital.rstrip('.')}."
+        if category == "area":
+            return f"The area of {country.name} is {format_area(country.area)} square kilometers."
+        return f"The population of {country.name} is about {format_population(country.population)}."
+
+    def stats(self):
+        return {
+            "countries": self.count,
+            "aliases": self.alias_count,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+        }
+
+def fetch_csv(path, url="https://restcountries.com/v3.1/all?fields=name,capital,area,population,altSpellings,translations,unMember"):
+    """Rewrite the fact table from the REST Countries API (UN members only)"""
+    import requests
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    rows = []
+    for country in response.json():
+        if not country.get("unMember") or not country.get("capital"):
+            continue
+        name = country["name"]["common"]
+        aliases = [country["name"]["official"]] + country.get("altSpellings", [])
+        aliases += [translation["common"] for translation in country.get("translations", {}).values()]
+        aliases = [alias for alias in dict.fromkeys(aliases) if alias != name and "|" not in alias and len(alias) > 2]
+        rows.append([name, country["capital"][0], country["area"], country["population"], "|".join(aliases)])
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("# Country facts from restcountries.com. Areas are total km².\n")
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["name", "capital", "area_km2", "population", "aliases"])
+        writer.writerows(sorted(rows))
+    return len(rows)
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "fetch":
+        print(f"Saved {fetch_csv(BUNDLED_CSV)} countries to {BUNDLED_CSV}")
+    else:
+        target = sys.argv[1] if len(sys.argv) > 1 else os.path.splitext(BUNDLED_CSV)[0] + ".bin"
+        compile_facts(BUNDLED_CSV, target)
+        print(f"Compiled {BUNDLED_CSV} to {target} ({os.path.getsize(target)} bytes)")